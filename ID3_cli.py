@@ -0,0 +1,245 @@
+"""
+Gemeinsamer Teil von ID3.py und ID3_nxtree.py: Terminal-Ausgabe, Schritt-für-Schritt-Aufbau
+des Baums, Batch-Modus (Argumente und Ablauf) und der interaktive Ablauf. Die Skripte
+liefern nur noch ihre Grafik dazu.
+
+pandas und numpy (über data_loader, walkthrough, ID3_core, ID3_model und ID3_parallel)
+werden erst in den Funktionen importiert, die sie brauchen.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from dm_common import (
+    input_lightblue, print_green, print_red, select_file, select_target_variable, wait_for_enter,
+)
+from ID3_render import RENDER_FORMATS
+from ID3_trace import BuildTrace
+
+def calculate_entropy_verbose(series, all_possible_values=None):
+    """
+    Berechnet die Entropie einer pandas Series und liefert die Erklärung mit zwei Zeilen:
+      - Zeile 1: Häufigkeiten, z. B.: "Häufigkeiten: Klasse 'No' 0/4, Klasse 'Yes' 4/4"
+      - Zeile 2: Formel, z. B.: "-(0/4) * log2 (0/4) - (4/4) * log2 (4/4) = 0.0000"
+    Die Zeilen werden erst bei der Ausgabe formatiert.
+    Werden all_possible_values (Liste aller möglicher Klassen) übergeben, so werden auch
+    Klassen mit 0 Vorkommen berücksichtigt.
+    """
+    from ID3_core import entropy_details
+
+    counts = series.value_counts()
+    if all_possible_values is None:
+        all_possible_values = sorted(series.unique())
+    class_counts = [int(counts.get(value, 0)) for value in all_possible_values]
+    details = entropy_details(class_counts, all_possible_values)
+    return details.entropy, details
+
+def print_steps(steps, pause=True):
+    """
+    Gibt die Rechenschritte (siehe walkthrough.py) im Terminal aus und wartet nach
+    erklärenden Schritten auf Enter. Liefert den Baum aus dem letzten Schritt.
+    """
+    from walkthrough import PAUSE_STEPS, step_lines
+
+    tree = None
+    for step in steps:
+        for highlight, text in step_lines(step):
+            if highlight:
+                print_green(text)
+            else:
+                print(text)
+        if step.kind in PAUSE_STEPS:
+            wait_for_enter(pause)
+        elif step.kind == "tree":
+            tree = step.data["tree"]
+    return tree
+
+def build_id3_tree(data, attributes, target_var, print_entropy=True, verbosity=2, pause=True,
+                   numeric_attributes=(), max_bins=None, bin_method="frequency", max_gain_loss=None):
+    """
+    Baut den ID3-Baum auf und gibt die Rechenschritte aus (walkthrough.id3_steps).
+    verbosity: 0 = keine Ausgabe, 1 = nur gewählte Attribute und Blätter,
+               2 = vollständige Schritt-für-Schritt-Erklärung.
+    pause: nach jedem Schritt auf Enter warten (nur im interaktiven Modus sinnvoll).
+    numeric_attributes: Attribute, die binär an einer Schwelle geteilt werden
+                        ("<= s" / "> s") statt mit einem Zweig je Wert.
+    max_bins, bin_method, max_gain_loss: Attribute mit mehr als max_bins Werten werden
+                        vorab zu Gruppen zusammengefasst (siehe ID3_core.bin_attributes).
+    Ist eine ID3_trace.BuildTrace aktiv, werden je Knoten Messwerte erfasst.
+    """
+    from walkthrough import id3_steps
+
+    steps = id3_steps(data, attributes, target_var, verbosity=verbosity,
+                      print_entropy=print_entropy, numeric_attributes=numeric_attributes,
+                      max_bins=max_bins, bin_method=bin_method, max_gain_loss=max_gain_loss)
+    return print_steps(steps, pause)
+
+def image_output(output, image_format="png"):
+    """
+    Dateiname und Format der Baumgrafik: eine passende Endung in output hat Vorrang vor
+    image_format, sonst wird die Endung ergänzt. Liefert (Dateiname, Format).
+    """
+    extension = os.path.splitext(output)[1].lstrip(".").lower()
+    if extension in RENDER_FORMATS:
+        return output, extension
+    return f"{output}.{image_format}", image_format
+
+def run_id3_batch(filename, target_var, render=None, json_path=None, verbosity=0, jobs=1,
+                  min_parallel_rows=10000, use_cache=True, model_path=None,
+                  numeric_attributes=(), max_bins=None, bin_method="frequency",
+                  max_gain_loss=None, profile_path=None, profile_format="json"):
+    """
+    Nicht-interaktiver Durchlauf (ohne Eingaben und Pausen) für ID3.py und ID3_nxtree.py:
+    Datei laden, Baum aufbauen, optional als JSON und als Modell speichern; render(tree)
+    erzeugt die Grafik des jeweiligen Skripts.
+    jobs > 1 baut den Baum ohne Rechenschritte parallel in mehreren Prozessen
+    (Teilbäume ab min_parallel_rows Zeilen).
+    use_cache: kodierten Datensatz im Cache ablegen bzw. von dort laden (dataset_cache).
+    model_path: kompilierten Baum für Vorhersagen speichern (siehe ID3_model.py).
+    numeric_attributes: Attribute mit binären Schwellenwert-Splits.
+    max_bins: Attribute mit mehr Werten vorab zu Gruppen zusammenfassen (bin_method
+              "frequency" oder "target", höchstens max_gain_loss Bit Gewinnverlust).
+    profile_path: Messwerte je Knoten speichern (profile_format "json" oder "chrome",
+                  siehe ID3_trace.py).
+    Liefert das Baum-Dictionary.
+    """
+    from data_loader import load_file
+    df = load_file(filename, verbose=verbosity >= 1, use_cache=use_cache)
+    if target_var not in df.columns:
+        raise ValueError(f"Zielvariable '{target_var}' nicht gefunden. Vorhanden: {list(df.columns)}")
+
+    missing = [col for col in numeric_attributes if col not in df.columns]
+    if missing:
+        raise ValueError(f"Numerische Attribute nicht gefunden: {missing}")
+
+    attributes = [col for col in df.columns if col != target_var]
+    profile = BuildTrace() if profile_path else None
+    with profile or contextlib.nullcontext():
+        if jobs > 1:
+            from ID3_parallel import build_id3_tree_parallel
+            tree = build_id3_tree_parallel(df, attributes, target_var, processes=jobs,
+                                           min_parallel_rows=min_parallel_rows,
+                                           numeric_attributes=numeric_attributes,
+                                           max_bins=max_bins, bin_method=bin_method,
+                                           max_gain_loss=max_gain_loss)
+        else:
+            tree = build_id3_tree(df, attributes, target_var, verbosity=verbosity, pause=False,
+                                  numeric_attributes=numeric_attributes, max_bins=max_bins,
+                                  bin_method=bin_method, max_gain_loss=max_gain_loss)
+    if profile is not None:
+        profile.save(profile_path, profile_format)
+        if verbosity >= 1:
+            print(profile.format_summary())
+
+    if model_path:
+        from ID3_model import compile_tree, save_model
+        save_model(compile_tree(tree), model_path)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(tree, f, ensure_ascii=False, indent=2, default=str)
+    if render is not None:
+        render(tree)
+    return tree
+
+def id3_argument_parser():
+    """
+    Argumente des Batch-Modus, gemeinsam für ID3.py und ID3_nxtree.py; die Skripte
+    ergänzen ihre eigenen Grafik-Optionen (siehe run_batch_mode).
+    """
+    parser = argparse.ArgumentParser(
+        description="ID3 - Entscheidungsbaum Schritt für Schritt. "
+                    "Ohne Quell-Datei startet der interaktive Modus."
+    )
+    parser.add_argument("datei", nargs="?", help="Quell-Datei (CSV oder Excel)")
+    parser.add_argument("-t", "--target", help="Name der Zielvariable (Pflicht im Batch-Modus)")
+    parser.add_argument("-o", "--output", default="ID3_Baum",
+                        help="Ausgabedatei für die Baumgrafik (Standard: ID3_Baum.<format>)")
+    parser.add_argument("--format", dest="image_format", choices=RENDER_FORMATS, default="png",
+                        help="Format der Baumgrafik, falls --output keine passende Endung hat "
+                             "(Standard: png)")
+    parser.add_argument("--json", dest="json_path", help="Baum zusätzlich als JSON speichern")
+    parser.add_argument("--model", dest="model_path",
+                        help="Baum als Modell für Vorhersagen speichern (siehe ID3_model.py)")
+    parser.add_argument("--numeric", action="append", default=[], metavar="SPALTE",
+                        help="Numerisches Attribut mit Schwellenwert-Splits (mehrfach möglich)")
+    parser.add_argument("--max-bins", type=int,
+                        help="Attribute mit mehr Werten vorab zu höchstens so vielen Gruppen zusammenfassen")
+    parser.add_argument("--bin-method", choices=["frequency", "target"], default="frequency",
+                        help="Gruppierung: häufigste Werte einzeln (frequency) oder nach "
+                             "Klassenanteil (target)")
+    parser.add_argument("--max-gain-loss", type=float,
+                        help="Erlaubter Verlust an Informationsgewinn durch die Gruppierung, "
+                             "geprüft an der Wurzel (Bit)")
+    parser.add_argument("--profile", dest="profile_path", metavar="DATEI",
+                        help="Messwerte je Knoten (Zeiten, Teilmengen, Bytes) speichern")
+    parser.add_argument("--profile-format", choices=["json", "chrome"], default="json",
+                        help="Format der Messwerte: json oder chrome (chrome://tracing, Perfetto)")
+    parser.add_argument("--no-render", action="store_true", help="Keine Baumgrafik erzeugen")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Anzahl paralleler Prozesse für den Baumaufbau (ohne Rechenschritte)")
+    parser.add_argument("--min-parallel-rows", type=int, default=10000,
+                        help="Teilbäume mit weniger Zeilen werden seriell gebaut (Standard: 10000)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Datei immer neu einlesen, ohne Cache (siehe dataset_cache.py)")
+    parser.add_argument("-v", "--verbosity", type=int, choices=[0, 1, 2], default=1,
+                        help="0 = still, 1 = Zusammenfassung, 2 = alle Rechenschritte (Standard: 1)")
+    return parser
+
+def _batch_options(args):
+    """Argumente für run_id3_batch aus den Optionen von id3_argument_parser."""
+    return {"json_path": args.json_path, "verbosity": args.verbosity, "jobs": args.jobs,
+            "min_parallel_rows": args.min_parallel_rows, "use_cache": not args.no_cache,
+            "model_path": args.model_path, "numeric_attributes": args.numeric,
+            "max_bins": args.max_bins, "bin_method": args.bin_method,
+            "max_gain_loss": args.max_gain_loss, "profile_path": args.profile_path,
+            "profile_format": args.profile_format}
+
+def run_batch_mode(args, run_id3, **render_options):
+    """
+    Batch-Modus der ID3-Skripte: run_id3(datei, ziel, output=..., image_format=...,
+    render=..., **render_options) mit den übrigen Optionen für run_id3_batch. Fehler
+    werden gemeldet und beenden das Programm mit Exit-Code 1 (2 ohne Zielvariable).
+    """
+    if args.target is None:
+        print_red("Im Batch-Modus muss die Zielvariable mit --target angegeben werden.")
+        sys.exit(2)
+    try:
+        run_id3(args.datei, args.target, output=args.output, image_format=args.image_format,
+                render=not args.no_render, **render_options, **_batch_options(args))
+    except (OSError, ValueError) as e:
+        print_red(f"Fehler: {e}")
+        sys.exit(1)
+
+def run_interactive(draw):
+    """
+    Interaktiver Ablauf: Quell-Datei und Zielvariable abfragen, den Baum Schritt für Schritt
+    aufbauen und mit draw(tree, target_var) zeichnen.
+    """
+    try:
+        filename = select_file("ID3 - Eingabedatei laden")
+
+        from data_loader import load_file
+        try:
+            df = load_file(filename, use_cache=True)
+        except ValueError:
+            print_red("Nicht unterstütztes Dateiformat!")
+            return
+
+        target_var = select_target_variable(df, "\nID3 - Zielvariable auswählen")
+        print(f"Zielvariable ausgewählt: '{target_var}'")
+
+        print_green(f"\nID3 - Berechnung der Entropie für '{target_var}'")
+        input_lightblue("Enter zum Fortfahren...")
+        # Hier erfolgt die Entropieberechnung NICHT in main, da sie in build_id3_tree ausgegeben wird.
+
+        # Baum rekursiv aufbauen
+        attributes = [col for col in df.columns if col != target_var]
+        tree = build_id3_tree(df, attributes, target_var)
+
+        # Baum zeichnen
+        print_green("\nID3 - Zeichne Baum...\n")
+        draw(tree, target_var)
+    except KeyboardInterrupt:
+        print_red("\nProgramm abgebrochen.")
+        sys.exit(0)
@@ -0,0 +1,528 @@
+"""
+Gemeinsamer Rechenkern für ID3.py und ID3_nxtree.py.
+
+Attribute und Zielvariable werden einmalig in Integer-Codes übersetzt. Für jedes
+Attribut wird daraus in einem einzigen bincount-Durchlauf eine Zähltabelle
+(Attributwert × Klasse) gebildet, aus der Entropien und Informationsgewinn als
+Arrays berechnet werden - statt pro Attributwert eine gefilterte Kopie des
+DataFrames anzulegen.
+
+Numerische Attribute (numeric_attributes) werden nicht pro Wert verzweigt, sondern binär
+an einer Schwelle ("<= s" / "> s"). Die Zeilen werden dafür einmal an der Wurzel nach
+jedem numerischen Attribut sortiert; die sortierten Listen werden bei jedem Split stabil
+auf die Zweige aufgeteilt und bleiben so sortiert. Die beste Schwelle eines Knotens ergibt
+sich aus einem Durchlauf über die kumulierten Klassenzählungen (O(n) statt O(n log n)).
+
+Kategoriale Attribute mit sehr vielen Werten (PLZ, Produktnummern) können mit max_bins
+einmalig an der Wurzel zu Gruppen zusammengefasst werden (bin_attributes). Die
+Zähltabellen der Knoten haben dann höchstens max_bins Zeilen, die Laufzeit hängt kaum
+noch von der Anzahl der Werte ab.
+
+Ist eine ID3_trace.BuildTrace aktiv, werden je Knoten Zeiten, Teilmengen und Bytes
+erfasst; sonst kosten die Messpunkte nur eine Abfrage von active_trace().
+"""
+from collections import namedtuple
+from functools import lru_cache
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from ID3_trace import active_trace
+
+# Einmalig kodierter Datensatz, den alle Knoten des Baums gemeinsam nutzen.
+# attr_codes ist spaltenweise (Fortran-Order) abgelegt, damit ein Attribut eines
+# Knotens mit attr_codes[rows, j] zusammenhängend gelesen wird. numeric enthält für
+# numerische Attribute die Werte als float64-Array (diese fehlen in attr_codes).
+# groups enthält für gruppierte Attribute {Gruppe: [Werte]} (siehe bin_attributes).
+EncodedData = namedtuple("EncodedData",
+                         "attr_codes target_codes categories classes columns numeric groups")
+
+def code_dtype(num_values):
+    """Kleinster Integer-Typ für Codes 0 .. num_values - 1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if num_values <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def _categorical_codes(series):
+    """
+    Übernimmt die Codes einer kategorialen Spalte (z. B. aus data_loader) ohne erneutes
+    Hashing. Liefert None, wenn die Spalte nicht kategorial ist oder Lücken enthält.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    codes = series.cat.codes.to_numpy()
+    if len(codes) and codes.min() < 0:
+        return None
+    return codes, list(series.cat.categories)
+
+def encode_target(series):
+    """
+    Kodiert die Zielvariable. Die Klassen sind sortiert (wie sorted(series.unique())),
+    damit die Spalten der Zähltabellen der bisherigen Ausgabereihenfolge entsprechen.
+    Liefert (codes, classes).
+    """
+    categorical = _categorical_codes(series)
+    if categorical is not None and series.cat.categories.is_monotonic_increasing:
+        codes, classes = categorical
+    else:
+        codes, classes = pd.factorize(series, sort=True, use_na_sentinel=False)
+        classes = list(classes)
+    return codes.astype(np.intp), classes
+
+def encode_attributes(data, attributes):
+    """
+    Kodiert alle Attribute einmalig. Liefert eine (Zeilen × Attribute)-Matrix mit
+    Integer-Codes (kleinster passender Typ) und pro Attribut die Liste der Werte
+    (Code -> Wert).
+    """
+    encoded_columns = []
+    categories = {}
+    for attribute in attributes:
+        categorical = _categorical_codes(data[attribute])
+        if categorical is None:
+            col_codes, uniques = pd.factorize(data[attribute], sort=False, use_na_sentinel=False)
+            categorical = col_codes, list(uniques)
+        encoded_columns.append(categorical[0])
+        categories[attribute] = categorical[1]
+    width = max((len(values) for values in categories.values()), default=1)
+    codes = np.empty((len(data), len(attributes)), dtype=code_dtype(width), order="F")
+    for j, col_codes in enumerate(encoded_columns):
+        codes[:, j] = col_codes
+    return codes, categories
+
+def numeric_values(series):
+    """
+    Werte eines numerischen Attributs als float64-Array.
+    Löst ValueError aus, wenn die Spalte nicht numerisch ist oder Lücken enthält.
+    """
+    values = pd.to_numeric(pd.Series(np.asarray(series, dtype=object)), errors="coerce")
+    values = values.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError(f"Attribut '{series.name}' ist nicht numerisch oder enthält fehlende Werte")
+    return values
+
+def encode_dataset(data, attributes, target_var, numeric_attributes=(), max_bins=None,
+                   bin_method="frequency", max_gain_loss=None):
+    """
+    Kodiert Attribute und Zielvariable eines DataFrames einmalig als EncodedData.
+    numeric_attributes: Attribute, die an Schwellenwerten binär geteilt werden.
+    max_bins, bin_method, max_gain_loss: Gruppierung vieler Werte (siehe bin_attributes).
+    """
+    target_codes, classes = encode_target(data[target_var])
+    numeric = {a: numeric_values(data[a]) for a in attributes if a in numeric_attributes}
+    categorical = [a for a in attributes if a not in numeric]
+    attr_codes, categories = encode_attributes(data, categorical)
+    columns = {attribute: j for j, attribute in enumerate(categorical)}
+    encoded = EncodedData(attr_codes, target_codes, categories, classes, columns, numeric, {})
+    if max_bins:
+        encoded = bin_attributes(encoded, max_bins, bin_method, max_gain_loss)
+    return encoded
+
+BIN_METHODS = ("frequency", "target")
+
+def _bin_lookup(matrix, bins, method, majority):
+    """Gruppe je Wert-Code (0 .. Anzahl Gruppen - 1) aus der Zähltabelle an der Wurzel."""
+    totals = matrix.sum(axis=1)
+    if method == "frequency":
+        order = np.argsort(-totals, kind="stable")
+        lookup = np.full(len(totals), bins - 1, dtype=np.intp)
+        lookup[order[:bins - 1]] = np.arange(bins - 1)
+        return lookup
+    # Nach Anteil der häufigsten Klasse sortieren, dann in Gruppen mit etwa gleich
+    # vielen Zeilen schneiden
+    rate = matrix[:, majority] / np.maximum(totals, 1)
+    order = np.argsort(rate, kind="stable")
+    before = np.cumsum(totals[order]) - totals[order]
+    lookup = np.empty(len(totals), dtype=np.intp)
+    lookup[order] = np.minimum(before * bins // max(int(totals.sum()), 1), bins - 1)
+    # Leere Gruppen entfernen
+    return np.unique(lookup, return_inverse=True)[1]
+
+def _bin_labels(values, lookup, method):
+    """Bezeichnung je Gruppe und {Bezeichnung: Werte} für Gruppen mit mehreren Werten."""
+    members = [[] for _ in range(int(lookup.max()) + 1)]
+    for value, group in zip(values, lookup):
+        members[group].append(value)
+    labels = []
+    groups = {}
+    for k, group in enumerate(members):
+        if len(group) == 1:
+            labels.append(group[0])
+            continue
+        if method == "frequency":
+            label = f"Sonstige ({len(group)} Werte)"
+        else:
+            label = f"Gruppe {k + 1} ({len(group)} Werte)"
+        labels.append(label)
+        groups[label] = group
+    return labels, groups
+
+def bin_attributes(encoded, max_bins, method="frequency", max_gain_loss=None):
+    """
+    Fasst die Werte jedes kategorialen Attributs mit mehr als max_bins Werten einmalig
+    zu höchstens max_bins Gruppen zusammen; die Knoten zählen danach nur noch Gruppen.
+      - "frequency": die max_bins - 1 häufigsten Werte bleiben einzeln, alle übrigen
+        bilden die Gruppe "Sonstige".
+      - "target": die Werte werden nach dem Anteil der häufigsten Klasse sortiert und in
+        Gruppen mit etwa gleich vielen Zeilen geteilt; Werte mit ähnlicher
+        Klassenverteilung landen so in derselben Gruppe.
+    max_gain_loss: erlaubter Verlust an Informationsgewinn an der Wurzel (in Bit). Wird er
+    überschritten, wird die Anzahl der Gruppen verdoppelt - notfalls bleibt das Attribut
+    ungruppiert. Geprüft wird nur die Wurzel: die Gruppen gelten für den ganzen Baum, in
+    tieferen Knoten kann der Verlust also größer sein.
+    Liefert ein neues EncodedData.
+    """
+    if method not in BIN_METHODS:
+        raise ValueError(f"Unbekannte Gruppierung '{method}', erlaubt: {', '.join(BIN_METHODS)}")
+    if max_bins < 2:
+        raise ValueError("max_bins muss mindestens 2 sein")
+    num_classes = len(encoded.classes)
+    class_counts = np.bincount(encoded.target_codes, minlength=num_classes)
+    parent_entropy = entropy_of_counts(class_counts)
+    majority = int(np.argmax(class_counts))
+    attr_codes = encoded.attr_codes
+    categories = dict(encoded.categories)
+    groups = dict(encoded.groups)
+    for attribute, j in encoded.columns.items():
+        values = categories[attribute]
+        if len(values) <= max_bins:
+            continue
+        col = attr_codes[:, j]
+        matrix = count_matrix(col, encoded.target_codes, len(values), num_classes)
+        exact_gain = score_split(matrix, parent_entropy)[0]
+        bins = max_bins
+        while bins < len(values):
+            lookup = _bin_lookup(matrix, bins, method, majority)
+            binned = np.zeros((int(lookup.max()) + 1, num_classes), dtype=matrix.dtype)
+            np.add.at(binned, lookup, matrix)
+            if max_gain_loss is None or exact_gain - score_split(binned, parent_entropy)[0] <= max_gain_loss:
+                break
+            bins *= 2
+        else:
+            continue
+        if attr_codes is encoded.attr_codes:
+            attr_codes = attr_codes.copy(order="F")
+        attr_codes[:, j] = lookup[col]
+        categories[attribute], groups[attribute] = _bin_labels(values, lookup, method)
+    return encoded._replace(attr_codes=attr_codes, categories=categories, groups=groups)
+
+def presort(encoded, rows):
+    """
+    Zeilen eines Knotens je numerischem Attribut nach dem Attributwert sortiert.
+    Wird nur an der Wurzel aufgerufen; danach werden die Listen mit split_sorted vererbt.
+    """
+    result = {a: rows[np.argsort(values[rows], kind="stable")] for a, values in encoded.numeric.items()}
+    trace = active_trace()
+    if trace is not None:
+        for sorted_rows in result.values():
+            trace.materialised(sorted_rows.nbytes)
+    return result
+
+def partition_rows(rows, node_codes, order):
+    """
+    Teilt die Zeilenindizes eines Knotens nach Attributwert auf (stabiles Counting-Sort).
+    Liefert für jeden Code aus order ein Teilarray (View) der sortierten Zeilenindizes;
+    die ursprüngliche Zeilenreihenfolge bleibt innerhalb jedes Zweigs erhalten.
+    """
+    sorted_rows = rows[np.argsort(node_codes, kind="stable")]
+    trace = active_trace()
+    if trace is not None:
+        trace.materialised(sorted_rows.nbytes)
+    sizes = np.bincount(node_codes, minlength=int(max(order)) + 1)
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    return [sorted_rows[starts[code]:starts[code + 1]] for code in order]
+
+def count_matrix(attr_codes, target_codes, num_values, num_classes):
+    """
+    Zähltabelle (Attributwert × Klasse) in einem bincount-Durchlauf.
+    """
+    flat = attr_codes.astype(np.intp) * num_classes + target_codes
+    counts = np.bincount(flat, minlength=num_values * num_classes)
+    return counts.reshape(num_values, num_classes)
+
+def entropy_from_counts(counts):
+    """
+    Entropie für einen Zählvektor oder zeilenweise für eine Zähltabelle.
+    Klassen mit 0 Vorkommen tragen 0 bei.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probs = np.where(totals > 0, counts / totals, 0.0)
+        contrib = np.where(probs > 0, -probs * np.log2(probs), 0.0)
+    return contrib.sum(axis=-1)
+
+@lru_cache(maxsize=4096)
+def _cached_entropy(counts):
+    return float(entropy_from_counts(counts))
+
+def entropy_of_counts(counts):
+    """
+    Entropie eines einzelnen Zählvektors. Die Ergebnisse werden über das Zähl-Tupel
+    zwischengespeichert, da dieselben Verteilungen (reine Knoten, 50/50-Aufteilungen)
+    tief im Baum immer wieder vorkommen.
+    """
+    return _cached_entropy(tuple(int(count) for count in counts))
+
+def score_split(matrix, parent_entropy):
+    """
+    Bewertet eine Aufteilung anhand ihrer Zähltabelle (Zweige × Klassen).
+    Liefert (gain, branch_entropies, weights, weighted_components).
+    """
+    branch_totals = matrix.sum(axis=1)
+    total = branch_totals.sum()
+    branch_entropies = entropy_from_counts(matrix)
+    weights = branch_totals / total
+    weighted_components = weights * branch_entropies
+    gain = parent_entropy - weighted_components.sum()
+    return gain, branch_entropies, weights, weighted_components
+
+class EntropyExplanation:
+    """
+    Erklärung zu einer Entropieberechnung. Die beiden Zeilen werden erst formatiert,
+    wenn sie ausgegeben werden, z. B.:
+      "Häufigkeiten: Klasse 'No' 0/4, Klasse 'Yes' 4/4"
+      "-(0/4) * log2 (0/4) - (4/4) * log2 (4/4) = 0.0000"
+    Wie bisher ist explanation[0] bzw. explanation[1] die erste bzw. zweite Zeile.
+    """
+    __slots__ = ("counts", "classes", "entropy", "_lines")
+
+    def __init__(self, counts, classes, entropy=None):
+        self.counts = counts
+        self.classes = classes
+        self.entropy = entropy_of_counts(counts) if entropy is None else entropy
+        self._lines = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            total = int(np.sum(self.counts))
+            fractions = []
+            terms = []
+            for value, count in zip(self.classes, self.counts):
+                fractions.append(f"Klasse '{value}' {int(count)}/{total}")
+                terms.append(f"({int(count)}/{total}) * log2 ({int(count)}/{total})")
+            line1 = "Häufigkeiten: " + ", ".join(fractions)
+            line2 = "-" + " - ".join(terms) + f" = {self.entropy:.4f}"
+            self._lines = [line1, line2]
+        return self._lines
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __len__(self):
+        return 2
+
+    def __str__(self):
+        return "\n".join(self.lines)
+
+def entropy_details(counts, classes):
+    """
+    Liefert die (erst bei Ausgabe formatierte) Erklärung zu einem Zählvektor.
+    """
+    return EntropyExplanation(counts, classes)
+
+def values_in_order(attr_codes):
+    """
+    Codes der vorkommenden Attributwerte in Reihenfolge ihres ersten Auftretens
+    (entspricht der Reihenfolge von data[attribute].unique()).
+    """
+    return pd.unique(attr_codes)
+
+# Bewertung eines Attributs in einem Knoten (Zeilen der Zähltabelle in der Reihenfolge order)
+# threshold ist nur bei numerischen Attributen gesetzt; order ist dann [0, 1] für die
+# Zweige "<= threshold" und "> threshold".
+AttributeScore = namedtuple(
+    "AttributeScore",
+    "attribute order matrix gain branch_entropies weights weighted_components threshold",
+    defaults=(None,)
+)
+
+THRESHOLD_ORDER = np.array([0, 1])
+
+def best_threshold(values, target_codes, num_classes):
+    """
+    Beste Schwelle für einen binären Split in einem Durchlauf über die kumulierten
+    Klassenzählungen. values und target_codes müssen nach values sortiert sein.
+    Kandidaten liegen in der Mitte zwischen zwei aufeinanderfolgenden verschiedenen
+    Werten; bei Gleichstand gewinnt die kleinste Schwelle.
+    Liefert (Schwelle, Zähltabelle 2 × Klassen) oder None, wenn alle Werte gleich sind.
+    """
+    cuts = np.flatnonzero(values[:-1] < values[1:])
+    if not cuts.size:
+        return None
+    n = len(values)
+    # Kumulierte Zählung je Klasse, ausgewertet nur an den Kandidaten
+    left = np.empty((len(cuts), num_classes), dtype=np.intp)
+    for cls in range(num_classes):
+        left[:, cls] = np.cumsum(target_codes == cls)[cuts]
+    right = np.bincount(target_codes, minlength=num_classes) - left
+    left_size = cuts + 1
+    weighted = left_size * entropy_from_counts(left) + (n - left_size) * entropy_from_counts(right)
+    best = int(np.argmin(weighted))
+    cut = cuts[best]
+    threshold = (values[cut] + values[cut + 1]) / 2
+    if not threshold < values[cut + 1]:
+        # Rundung bei direkt benachbarten float-Werten
+        threshold = values[cut]
+    return float(threshold), np.vstack([left[best], right[best]])
+
+def format_threshold(threshold):
+    return np.format_float_positional(threshold, trim="-")
+
+def branch_values(encoded, score):
+    """Zweigbezeichnungen eines Splits in Zweigreihenfolge."""
+    if score.threshold is not None:
+        threshold = format_threshold(score.threshold)
+        return [f"<= {threshold}", f"> {threshold}"]
+    return [encoded.categories[score.attribute][code] for code in score.order]
+
+def branch_codes(encoded, rows, score):
+    """Codes des Split-Attributs für rows (bei Schwellen: 0 = "<=", 1 = ">")."""
+    if score.threshold is not None:
+        return (encoded.numeric[score.attribute][rows] > score.threshold).astype(np.int8)
+    return encoded.attr_codes[rows, encoded.columns[score.attribute]]
+
+def split_sorted(encoded, sorted_rows, score):
+    """
+    Teilt die vorsortierten Zeilenlisten eines Knotens auf die Zweige auf.
+    Die Aufteilung ist stabil, jede Liste bleibt also nach ihrem Attribut sortiert.
+    Liefert je Zweig ein Dictionary {Attribut: sortierte Zeilen}.
+    """
+    branches = [{} for _ in score.order]
+    for attribute, rows in sorted_rows.items():
+        for branch, sub_rows in zip(branches, partition_rows(rows, branch_codes(encoded, rows, score),
+                                                             score.order)):
+            branch[attribute] = sub_rows
+    return branches
+
+def _score_attribute(encoded, rows, target_codes, attribute, parent_entropy, sorted_rows):
+    """AttributeScore eines Attributs oder None (numerisch ohne mögliche Schwelle)."""
+    num_classes = len(encoded.classes)
+    if attribute in encoded.numeric:
+        ordered = sorted_rows[attribute]
+        split = best_threshold(encoded.numeric[attribute][ordered],
+                               encoded.target_codes[ordered], num_classes)
+        if split is None:
+            return None
+        threshold, matrix = split
+        gain, branch_entropies, weights, weighted_components = score_split(matrix, parent_entropy)
+        return AttributeScore(attribute, THRESHOLD_ORDER, matrix, gain, branch_entropies,
+                              weights, weighted_components, threshold)
+    col = encoded.attr_codes[rows, encoded.columns[attribute]]
+    order = values_in_order(col)
+    matrix = count_matrix(col, target_codes, len(encoded.categories[attribute]), num_classes)[order]
+    gain, branch_entropies, weights, weighted_components = score_split(matrix, parent_entropy)
+    return AttributeScore(attribute, order, matrix, gain, branch_entropies,
+                          weights, weighted_components)
+
+def score_attributes(encoded, rows, target_codes, attributes, parent_entropy, sorted_rows=None):
+    """
+    Berechnet für jedes Attribut die Zähltabelle des Knotens und den Informationsgewinn.
+    Liefert eine Liste von AttributeScore in der Reihenfolge von attributes. Numerische
+    Attribute ohne mögliche Schwelle (nur ein Wert im Knoten) fehlen in der Liste.
+    sorted_rows: nach den numerischen Attributen sortierte Zeilen des Knotens (presort).
+    """
+    if sorted_rows is None and any(attribute in encoded.numeric for attribute in attributes):
+        sorted_rows = presort(encoded, rows)
+    trace = active_trace()
+    scores = []
+    for attribute in attributes:
+        if trace is None:
+            score = _score_attribute(encoded, rows, target_codes, attribute, parent_entropy,
+                                     sorted_rows)
+        else:
+            start = perf_counter()
+            score = _score_attribute(encoded, rows, target_codes, attribute, parent_entropy,
+                                     sorted_rows)
+            nbytes = score.matrix.nbytes if score is not None else 0
+            trace.scored(attribute, start, perf_counter() - start, nbytes)
+        if score is not None:
+            scores.append(score)
+    return scores
+
+def choose_best(scores):
+    """
+    Wählt das Attribut mit dem höchsten Gewinn; bei Gleichstand gewinnt das zuerst
+    bewertete Attribut (wie bisher mit "gain > best_gain").
+    """
+    best = None
+    for score in scores:
+        if best is None or score.gain > best.gain:
+            best = score
+    return best
+
+def remaining_attributes(attributes, best):
+    """Attribute für die Unterbäume; numerische Attribute können erneut geteilt werden."""
+    if best.threshold is not None:
+        return attributes
+    return [a for a in attributes if a != best.attribute]
+
+def inner_node(best, values, num_samples, groups=None):
+    node = {"leaf": False, "attribute": best.attribute}
+    if best.threshold is not None:
+        node["threshold"] = best.threshold
+    node["num_samples"] = num_samples
+    # Werte der Gruppen, damit der Baum auch ohne EncodedData auswertbar bleibt
+    members = {value: groups[value] for value in values if value in groups} if groups else {}
+    if members:
+        node["groups"] = members
+    node["branch_info"] = {value: float(h) for value, h in zip(values, best.branch_entropies)}
+    node["branches"] = {}
+    return node
+
+def split_node(encoded, rows, attributes, sorted_rows=None):
+    """
+    Führt einen ID3-Schritt ohne Ausgabe aus. Liefert (node, children):
+      - Blatt: node ist das fertige Blatt-Dictionary, children ist None.
+      - Innerer Knoten: node mit leerem "branches"-Dictionary und children als Liste
+        von (Wert, Zeilenindizes, verbleibende Attribute, sortierte Zeilen) je Zweig.
+    sorted_rows: vorsortierte Zeilen des Knotens; fehlt es, wird an diesem Knoten sortiert.
+    """
+    classes = encoded.classes
+    target_codes = encoded.target_codes[rows]
+    class_counts = np.bincount(target_codes, minlength=len(classes))
+    current_entropy = entropy_of_counts(class_counts)
+
+    # Blatt: wenn Knoten rein ist
+    if abs(current_entropy) < 1e-6:
+        return {"leaf": True, "class": classes[target_codes[0]], "num_samples": len(rows)}, None
+    # Blatt: wenn keine Attribute mehr vorhanden sind
+    if not attributes:
+        majority = classes[int(np.argmax(class_counts))]
+        return {"leaf": True, "class": majority, "num_samples": len(rows)}, None
+
+    if sorted_rows is None:
+        sorted_rows = presort(encoded, rows)
+    best = choose_best(score_attributes(encoded, rows, target_codes, attributes, current_entropy,
+                                        sorted_rows))
+    # Blatt: nur noch numerische Attribute mit einem einzigen Wert
+    if best is None:
+        majority = classes[int(np.argmax(class_counts))]
+        return {"leaf": True, "class": majority, "num_samples": len(rows)}, None
+    values = branch_values(encoded, best)
+    branch_rows = partition_rows(rows, branch_codes(encoded, rows, best), best.order)
+    new_attributes = remaining_attributes(attributes, best)
+    node = inner_node(best, values, len(rows), encoded.groups.get(best.attribute))
+    children = list(zip(values, branch_rows, [new_attributes] * len(values),
+                        split_sorted(encoded, sorted_rows, best)))
+    return node, children
+
+def build_tree(encoded, rows, attributes, sorted_rows=None):
+    """
+    Baut den ID3-Baum ohne jede Ausgabe auf (gleiche Struktur wie build_id3_tree).
+    """
+    trace = active_trace()
+    record = trace.begin_node(len(rows)) if trace is not None else None
+    node, children = split_node(encoded, rows, attributes, sorted_rows)
+    if children is not None:
+        for value, sub_rows, sub_attributes, sub_sorted in children:
+            node["branches"][value] = build_tree(encoded, sub_rows, sub_attributes, sub_sorted)
+    if record is not None:
+        trace.end_node(record, node)
+    return node
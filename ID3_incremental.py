@@ -0,0 +1,342 @@
+"""
+Inkrementeller ID3-Baum für Datensätze, die nur durch angehängte Zeilen wachsen
+(in Anlehnung an ID5R).
+
+Jeder innere Knoten speichert für alle verbleibenden Attribute seine Zähltabelle
+(Attributwert × Klasse), die Zeilen in der Reihenfolge des ersten Auftretens der Werte.
+Neue Zeilen werden entlang ihres Pfads in diese Tabellen eingezählt (Aufwand je Knoten
+nach der Zahl der neuen Zeilen und der Werte im Knoten, nicht aller Werte des Attributs);
+danach wird der Gewinn aus den Tabellen neu bewertet. Nur wo sich dadurch das beste Attribut ändert
+(oder ein reines Blatt unrein wird), wird der Teilbaum aus seinen Zeilen neu aufgebaut.
+Blätter merken sich dafür ihre Zeilennummern.
+
+Die Bewertung verwendet dieselben Funktionen wie build_id3_tree (score_split,
+choose_best, entropy_of_counts) auf identischen Zähltabellen. Der Baum ist daher
+gleich dem Baum, den ein vollständiger Neuaufbau über alle Daten liefert.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from data_loader import parse_text_values, read_csv_rows, value_kind
+from ID3_core import AttributeScore, choose_best, entropy_of_counts, score_split, values_in_order
+
+class _Node:
+    __slots__ = ("class_counts", "attributes", "tables", "attribute", "children", "rows", "best")
+
+    def __init__(self):
+        self.class_counts = None  # Zählvektor der Klassen
+        self.attributes = []      # verbleibende Attribute in fester Reihenfolge
+        self.tables = {}          # Attribut -> [Codes in Reihenfolge, {Code: Zeile}, Zähltabelle]
+        self.attribute = None     # Split-Attribut (None bei Blättern)
+        self.children = {}        # Code des Attributwerts -> _Node (in Zweigreihenfolge)
+        self.rows = None          # Zeilennummern (nur Blätter)
+        self.best = None          # AttributeScore des Split-Attributs
+
+class IncrementalID3:
+    """
+    ID3-Baum, der mit update(df) um neue Zeilen erweitert wird.
+    tree() liefert das Baum-Dictionary wie build_id3_tree.
+    """
+    def __init__(self, attributes, target_var):
+        self.attributes = list(attributes)
+        self.target_var = target_var
+        self.categories = {attribute: [] for attribute in self.attributes}
+        self._value_codes = {attribute: {} for attribute in self.attributes}
+        self.classes = []
+        self._columns = {attribute: j for j, attribute in enumerate(self.attributes)}
+        self._codes_buffer = np.zeros((0, len(self.attributes)), dtype=np.int32)
+        self._target_buffer = np.zeros(0, dtype=np.int32)
+        self.num_rows = 0
+        self.root = None
+        self.source_file = None   # CSV-Datei der Zeilen (update_from_csv)
+        self.source_rows = 0      # davon gelesene Datenzeilen
+
+    # --- Kodierung -------------------------------------------------------------
+
+    def _encode_values(self, attribute, series):
+        """Kodiert eine Spalte; neue Werte erhalten fortlaufende Codes."""
+        mapping = self._value_codes[attribute]
+        codes, uniques = pd.factorize(series, sort=False, use_na_sentinel=False)
+        lookup = np.empty(len(uniques), dtype=np.int32)
+        for k, value in enumerate(uniques):
+            if value not in mapping:
+                mapping[value] = len(self.categories[attribute])
+                self.categories[attribute].append(value)
+            lookup[k] = mapping[value]
+        return lookup[codes]
+
+    def _add_classes(self, labels):
+        """
+        Nimmt neue Klassen auf. Die Klassen bleiben sortiert (wie bei build_id3_tree);
+        vorhandene Codes und alle Zähltabellen werden auf die neue Reihenfolge umgestellt.
+        """
+        known = set(self.classes)
+        new = [cls for cls in pd.unique(labels) if cls not in known]
+        if not new:
+            return
+        classes = sorted(self.classes + new)
+        remap = np.array([classes.index(cls) for cls in self.classes], dtype=np.int32)
+        self._target_buffer[:self.num_rows] = remap[self._target]
+        self.classes = classes
+        if self.root is not None:
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                node.class_counts = self._widen(node.class_counts, remap)
+                for table in node.tables.values():
+                    table[2] = self._widen(table[2], remap)
+                stack.extend(node.children.values())
+
+    def _widen(self, counts, remap):
+        widened = np.zeros(counts.shape[:-1] + (len(self.classes),), dtype=counts.dtype)
+        widened[..., remap] = counts
+        return widened
+
+    def _append(self, codes, target):
+        """
+        Hängt kodierte Zeilen an. Die Puffer wachsen mit verdoppelter Kapazität, damit
+        ein Batch nicht jedes Mal den gesamten Datensatz kopiert.
+        """
+        end = self.num_rows + len(codes)
+        if end > len(self._codes_buffer):
+            capacity = max(end, 2 * len(self._codes_buffer))
+            codes_buffer = np.empty((capacity, len(self.attributes)), dtype=np.int32)
+            codes_buffer[:self.num_rows] = self._codes_buffer[:self.num_rows]
+            target_buffer = np.empty(capacity, dtype=np.int32)
+            target_buffer[:self.num_rows] = self._target_buffer[:self.num_rows]
+            self._codes_buffer, self._target_buffer = codes_buffer, target_buffer
+        self._codes_buffer[self.num_rows:end] = codes
+        self._target_buffer[self.num_rows:end] = target
+        self.num_rows = end
+
+    @property
+    def _codes(self):
+        return self._codes_buffer[:self.num_rows]
+
+    @property
+    def _target(self):
+        return self._target_buffer[:self.num_rows]
+
+    # --- Aufbau ----------------------------------------------------------------
+
+    def _count(self, rows, attribute, order, positions):
+        """
+        Zählt die Zeilen rows nach Attributwert × Klasse. Neue Werte werden in
+        Reihenfolge ihres ersten Auftretens an order/positions angehängt; die Zeilen der
+        Zähltabelle entsprechen order. Der Aufwand hängt nur von den Zeilen und den
+        Werten im Knoten ab, nicht von der Gesamtzahl der Werte des Attributs.
+        """
+        col = self._codes[rows, self._columns[attribute]]
+        local, uniques = pd.factorize(col, sort=False)
+        lookup = np.empty(len(uniques), dtype=np.intp)
+        for k, code in enumerate(uniques):
+            code = int(code)
+            if code not in positions:
+                positions[code] = len(order)
+                order.append(code)
+            lookup[k] = positions[code]
+        flat = lookup[local] * len(self.classes) + self._target[rows]
+        counts = np.bincount(flat, minlength=len(order) * len(self.classes))
+        return counts.reshape(len(order), len(self.classes))
+
+    def _table(self, rows, attribute):
+        """Zähltabelle eines Attributs für die Zeilen eines Knotens."""
+        order, positions = [], {}
+        matrix = self._count(rows, attribute, order, positions)
+        return [order, positions, matrix]
+
+    def _grow(self, rows, attributes):
+        """Baut einen Teilbaum aus seinen Zeilen neu auf."""
+        node = _Node()
+        node.attributes = attributes
+        node.class_counts = np.bincount(self._target[rows], minlength=len(self.classes))
+        if abs(entropy_of_counts(node.class_counts)) < 1e-6 or not attributes:
+            node.rows = rows
+            return node
+        node.tables = {attribute: self._table(rows, attribute) for attribute in attributes}
+        self._split(node, rows)
+        return node
+
+    def _scores(self, node):
+        parent_entropy = entropy_of_counts(node.class_counts)
+        scores = []
+        for attribute in node.attributes:
+            order, _, matrix = node.tables[attribute]
+            gain, branch_entropies, weights, weighted = score_split(matrix, parent_entropy)
+            scores.append(AttributeScore(attribute, order, matrix, gain, branch_entropies,
+                                         weights, weighted))
+        return scores
+
+    def _split(self, node, rows):
+        node.best = choose_best(self._scores(node))
+        node.attribute = node.best.attribute
+        node.rows = None
+        order, positions, _ = node.tables[node.attribute]
+        col = self._codes[rows, self._columns[node.attribute]]
+        local, uniques = pd.factorize(col, sort=False)
+        branch = np.array([positions[int(code)] for code in uniques], dtype=np.intp)[local]
+        # Zeilen in einem Durchgang nach Zweigen ordnen (stabil, also aufsteigend je Zweig)
+        grouped = rows[np.argsort(branch, kind="stable")]
+        bounds = np.cumsum(np.bincount(branch, minlength=len(order)))[:-1]
+        sub_attributes = [a for a in node.attributes if a != node.attribute]
+        node.children = {}
+        for code, sub_rows in zip(order, np.split(grouped, bounds)):
+            node.children[code] = self._grow(sub_rows, sub_attributes)
+
+    def _leaf_rows(self, node):
+        """Alle Zeilen eines Teilbaums in ursprünglicher Reihenfolge."""
+        parts = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.rows is not None:
+                parts.append(current.rows)
+            stack.extend(current.children.values())
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def _update(self, node, new_rows):
+        """Zählt neue Zeilen in einen Knoten ein und strukturiert nur bei Bedarf um."""
+        node.class_counts = node.class_counts + np.bincount(
+            self._target[new_rows], minlength=len(self.classes))
+
+        # Blatt
+        if node.attribute is None:
+            rows = np.concatenate([node.rows, new_rows])
+            if abs(entropy_of_counts(node.class_counts)) < 1e-6 or not node.attributes:
+                node.rows = rows
+                return node
+            # Reines Blatt wurde unrein: Teilbaum aus seinen Zeilen aufbauen
+            return self._grow(rows, node.attributes)
+
+        # Innerer Knoten: Zähltabellen aller verbleibenden Attribute fortschreiben
+        for attribute in node.attributes:
+            order, positions, matrix = node.tables[attribute]
+            counts = self._count(new_rows, attribute, order, positions)
+            if len(order) > len(matrix):
+                # Neue Werte im Knoten: Tabelle um Zeilen am Ende erweitern
+                matrix = np.vstack([matrix, np.zeros((len(order) - len(matrix), len(self.classes)),
+                                                     dtype=matrix.dtype)])
+            matrix += counts
+            node.tables[attribute][2] = matrix
+
+        best = choose_best(self._scores(node))
+        if best.attribute != node.attribute:
+            # Bestes Attribut hat sich geändert: nur diesen Teilbaum neu aufbauen
+            rows = np.sort(np.concatenate([self._leaf_rows(node), new_rows]))
+            return self._grow(rows, node.attributes)
+
+        node.best = best
+        col = self._codes[new_rows, self._columns[node.attribute]]
+        sub_attributes = [a for a in node.attributes if a != node.attribute]
+        for code in values_in_order(col):
+            sub_rows = new_rows[col == code]
+            child = node.children.get(code)
+            if child is None:
+                # Neuer Wert: neuer Zweig am Ende (Reihenfolge des ersten Auftretens)
+                node.children[code] = self._grow(sub_rows, sub_attributes)
+            else:
+                node.children[code] = self._update(child, sub_rows)
+        return node
+
+    def update(self, df):
+        """
+        Hängt neue Zeilen an und aktualisiert den Baum. Der Aufwand richtet sich nach
+        der Anzahl neuer Zeilen und den tatsächlich umgebauten Teilbäumen.
+        """
+        if len(df) == 0:
+            return self
+        self._add_classes(df[self.target_var])
+        class_index = {cls: k for k, cls in enumerate(self.classes)}
+        target = np.array([class_index[cls] for cls in df[self.target_var]], dtype=np.int32)
+        codes = np.empty((len(df), len(self.attributes)), dtype=np.int32)
+        for j, attribute in enumerate(self.attributes):
+            codes[:, j] = self._encode_values(attribute, df[attribute])
+
+        start = self.num_rows
+        self._append(codes, target)
+        new_rows = np.arange(start, self.num_rows)
+        if self.root is None:
+            self.root = self._grow(new_rows, self.attributes)
+        else:
+            self.root = self._update(self.root, new_rows)
+        return self
+
+    def update_from_csv(self, filename, skip_rows=None):
+        """
+        Liest nur die seit dem letzten Aufruf angehängten Zeilen einer CSV-Datei ein
+        (wie load_file: Trennzeichen, Kodierung, getrimmte Werte).
+        Die Anzahl der bereits gelesenen Zeilen wird je Datei festgehalten; stammen die
+        bisherigen Zeilen nicht (nur) aus dieser Datei, z. B. nach update(load_file(...)),
+        muss skip_rows angeben, wie viele Datenzeilen der Datei schon enthalten sind.
+        Die Werte werden als Text gelesen und in den Typ der bisherigen Werte umgewandelt,
+        da pandas den Typ sonst nur aus den neuen Zeilen bestimmen würde.
+        """
+        filename = os.path.abspath(filename)
+        if skip_rows is None:
+            if self.num_rows and (getattr(self, "source_file", None) != filename
+                                  or getattr(self, "source_rows", None) != self.num_rows):
+                raise ValueError(f"Die {self.num_rows} Zeilen des Baums stammen nicht aus "
+                                 f"{filename}; bitte skip_rows angeben")
+            skip_rows = self.num_rows
+        df = read_csv_rows(filename, skip_rows, dtype=str)
+        for column in [*self.attributes, self.target_var]:
+            if column in df.columns:
+                df[column] = self._typed(column, df[column])
+        self.update(df)
+        self.source_file = filename
+        self.source_rows = self.num_rows
+        return self
+
+    def _typed(self, column, series):
+        """
+        Als Text gelesene Spalte im Typ der bisherigen Werte; ohne bisherige Werte wie
+        pandas beim Lesen der ganzen Datei (parse_text_values).
+        """
+        known = self.classes if column == self.target_var else self.categories[column]
+        if known and value_kind(known) == "text":
+            return series
+        codes, uniques = pd.factorize(series)
+        values = np.array(parse_text_values(list(uniques)) + [np.nan], dtype=object)
+        return pd.Series(values[codes], index=series.index, name=series.name)
+
+    # --- Ausgabe ---------------------------------------------------------------
+
+    def tree(self):
+        """Baum-Dictionary wie von build_id3_tree."""
+        if self.root is None:
+            raise ValueError("Der Baum enthält noch keine Daten")
+        return self._to_dict(self.root)
+
+    def _to_dict(self, node):
+        samples = int(node.class_counts.sum())
+        if node.attribute is None:
+            counts = node.class_counts
+            if abs(entropy_of_counts(counts)) < 1e-6:
+                cls = self.classes[int(np.flatnonzero(counts)[0])]
+            else:
+                cls = self.classes[int(np.argmax(counts))]
+            return {"leaf": True, "class": cls, "num_samples": samples}
+        values = self.categories[node.attribute]
+        result = {
+            "leaf": False,
+            "attribute": node.attribute,
+            "num_samples": samples,
+            "branch_info": {values[code]: float(h)
+                            for code, h in zip(node.best.order, node.best.branch_entropies)},
+            "branches": {},
+        }
+        for code in node.best.order:
+            result["branches"][values[code]] = self._to_dict(node.children[code])
+        return result
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,385 @@
+"""
+Kompilierter ID3-Baum für schnelle Vorhersagen.
+
+Das Baum-Dictionary aus build_id3_tree wird in flache Arrays übersetzt:
+  - node_attribute: Index des Attributs je Knoten (-1 bei Blättern)
+  - node_class:     Klassen-Code je Knoten (Blatt: Vorhersage, innerer Knoten: Mehrheit)
+  - child_offset:   Beginn des Kindblocks in child_table je innerem Knoten
+  - child_table:    pro innerem Knoten ein Block mit einem Eintrag je Wert-Code des
+                    Attributs (Index des Kindknotens, -1 wenn es keinen Zweig gibt)
+  - node_entropy:   Entropie je Knoten, wie sie im Elternknoten als branch_info steht
+  - node_split:     bei Schwellenwert-Knoten (numerische Attribute) der Index der
+                    Schwelle, sonst -1; der Kindblock hat dann zwei Einträge ("<=", ">")
+
+Für ein numerisches Attribut ist das Wörterbuch die sortierte Liste aller Schwellen im
+Baum. encode kodiert einen Wert als Anzahl der Schwellen unterhalb des Werts; an einem
+Knoten mit Schwelle Nummer j gilt damit "Wert <= Schwelle" genau für Codes <= j.
+Bei gruppierten Attributen (max_bins) ist das Wörterbuch die Liste der Zweige; groups
+ordnet jedem Wert einer Gruppe deren Bezeichnung zu.
+
+predict leitet einen ganzen kodierten Batch Ebene für Ebene mit NumPy-Fancy-Indexing
+durch den Baum. Für Attributwerte, die beim Training an einem Knoten nicht vorkamen,
+bleibt die Zeile an diesem Knoten stehen und erhält dessen Mehrheitsklasse.
+
+Mit save_model / load_model wird ein kompilierter Baum in einer Datei abgelegt:
+Kennung und Versionsnummer, ein JSON-Kopf (Attribute, Wörterbücher, Klassen, Lage der
+Arrays) und danach die Arrays als Rohdaten. Beim Laden werden die Arrays per
+Memory-Mapping eingebunden, ein großer Baum ist damit praktisch sofort einsatzbereit.
+
+Aufruf als Skript: python3 ID3_model.py modell.id3 daten.csv -o vorhersagen.csv
+"""
+import argparse
+import json
+import struct
+import sys
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_file
+from dataset_cache import tag_value, untag_value
+from ID3_core import format_threshold
+
+MODEL_MAGIC = b"ID3MODEL"
+MODEL_VERSION = 2
+ARRAY_ALIGNMENT = 64
+ARRAY_NAMES = ("node_attribute", "node_class", "node_samples", "child_offset",
+               "child_table", "node_entropy", "node_split")
+
+class CompiledTree:
+    """
+    Flache, array-basierte Form eines ID3-Baums (siehe Modulbeschreibung).
+    Erzeugung über compile_tree(tree).
+    """
+    def __init__(self, attributes, categories, classes, node_attribute, node_class,
+                 node_samples, child_offset, child_table, node_entropy=None, node_split=None,
+                 numeric_attributes=(), groups=None):
+        self.attributes = list(attributes)
+        self.numeric_attributes = [a for a in self.attributes if a in numeric_attributes]
+        self.categories = {attribute: list(categories[attribute]) for attribute in self.attributes}
+        self.classes = list(classes)
+        self.node_attribute = node_attribute
+        self.node_class = node_class
+        self.node_samples = node_samples
+        self.child_offset = child_offset
+        self.child_table = child_table
+        if node_entropy is None:
+            node_entropy = np.full(len(node_attribute), np.nan)
+        self.node_entropy = node_entropy
+        if node_split is None:
+            node_split = np.full(len(node_attribute), -1, dtype=np.int64)
+        self.node_split = node_split
+        self._class_labels = np.empty(len(self.classes), dtype=object)
+        self._class_labels[:] = self.classes
+        self._indexers = {attribute: pd.Index(self.categories[attribute]) for attribute in self.attributes}
+        # Gruppierte Attribute (max_bins): {Attribut: {Wert: Gruppe}}
+        groups = groups or {}
+        self.groups = {a: dict(groups[a]) for a in self.attributes if a in groups}
+        self._group_indexers = {}
+        self._group_codes = {}
+        self._group_members = {}
+        for attribute, mapping in self.groups.items():
+            self._group_indexers[attribute] = pd.Index(list(mapping))
+            self._group_codes[attribute] = self._indexers[attribute].get_indexer(list(mapping.values()))
+            members = self._group_members[attribute] = {}
+            for value, label in mapping.items():
+                members.setdefault(label, []).append(value)
+        # Anzahl der Wert-Codes je Knoten (0 bei Blättern), für die Bereichsprüfung
+        widths = np.array([len(self.categories[a]) for a in self.attributes] + [0], dtype=np.int64)
+        self.node_width = np.where(node_split >= 0, 2, widths[node_attribute])
+
+    @property
+    def num_nodes(self):
+        return len(self.node_attribute)
+
+    def encode(self, df):
+        """
+        Kodiert die Attributspalten eines DataFrames mit den Wörterbüchern des Baums.
+        Unbekannte Werte (und fehlende Spalten) erhalten den Code -1.
+        """
+        codes = np.full((len(df), len(self.attributes)), -1, dtype=np.int64, order="F")
+        for j, attribute in enumerate(self.attributes):
+            if attribute not in df.columns:
+                continue
+            if attribute in self.numeric_attributes:
+                values = pd.to_numeric(pd.Series(np.asarray(df[attribute], dtype=object)),
+                                       errors="coerce").to_numpy(dtype=np.float64)
+                thresholds = np.asarray(self.categories[attribute], dtype=np.float64)
+                codes[:, j] = np.where(np.isnan(values), -1,
+                                       np.searchsorted(thresholds, values, side="left"))
+            else:
+                codes[:, j] = self._indexers[attribute].get_indexer(df[attribute])
+            if attribute in self.groups:
+                # Werte einer Gruppe erhalten den Code der Gruppe
+                grouped = self._group_indexers[attribute].get_indexer(df[attribute])
+                codes[:, j] = np.where(grouped >= 0, self._group_codes[attribute][grouped], codes[:, j])
+        return codes
+
+    def predict_codes(self, codes):
+        """
+        Vorhersage für eine kodierte (Zeilen × Attribute)-Matrix; liefert Klassen-Codes.
+        """
+        codes = np.asarray(codes)
+        node = np.zeros(len(codes), dtype=np.int64)
+        active = np.arange(len(codes))
+        while active.size:
+            current = node[active]
+            attribute = self.node_attribute[current]
+            inner = attribute >= 0
+            active, current, attribute = active[inner], current[inner], attribute[inner]
+            if not active.size:
+                break
+            values = codes[active, attribute]
+            # Schwellenwert-Knoten: Zweig 0 für "<=", Zweig 1 für ">"
+            split = self.node_split[current]
+            threshold = (split >= 0) & (values >= 0)
+            values = np.where(threshold, values > split, values)
+            known = (values >= 0) & (values < self.node_width[current])
+            child = np.full(len(active), -1, dtype=np.int64)
+            child[known] = self.child_table[self.child_offset[current[known]] + values[known]]
+            # Kein Zweig für diesen Wert: Zeile bleibt am Knoten (Mehrheitsklasse)
+            moving = child >= 0
+            active = active[moving]
+            node[active] = child[moving]
+        return self.node_class[node]
+
+    def predict(self, df):
+        """
+        Vorhersage für alle Zeilen eines DataFrames; liefert ein Array der Klassenwerte.
+        """
+        return self._class_labels[self.predict_codes(self.encode(df))]
+
+    def to_dict(self):
+        """
+        Baut das Baum-Dictionary (wie von build_id3_tree) wieder auf, z. B. zum Zeichnen.
+        Die Mehrheitsklasse eines Blatts entspricht dem Klassenwert des Knotens.
+        """
+        dicts = [None] * self.num_nodes
+        # Kinder stehen immer hinter ihrem Elternknoten, also rückwärts aufbauen
+        for k in range(self.num_nodes - 1, -1, -1):
+            samples = int(self.node_samples[k])
+            if self.node_attribute[k] < 0:
+                dicts[k] = {"leaf": True, "class": self.classes[self.node_class[k]],
+                            "num_samples": samples}
+                continue
+            attribute = self.attributes[self.node_attribute[k]]
+            start = self.child_offset[k]
+            node = {"leaf": False, "attribute": attribute}
+            if self.node_split[k] >= 0:
+                threshold = float(self.categories[attribute][self.node_split[k]])
+                node["threshold"] = threshold
+                values = [f"<= {format_threshold(threshold)}", f"> {format_threshold(threshold)}"]
+                children = self.child_table[start:start + 2]
+            else:
+                block = self.child_table[start:start + len(self.categories[attribute])]
+                # Zweige in der ursprünglichen Reihenfolge (Kinder wurden in dieser nummeriert)
+                codes = np.argsort(np.where(block >= 0, block, np.iinfo(np.int64).max))
+                codes = codes[:np.count_nonzero(block >= 0)]
+                values = [self.categories[attribute][code] for code in codes]
+                children = block[codes]
+            node["num_samples"] = samples
+            members = self._group_members.get(attribute, {})
+            if any(value in members for value in values):
+                node["groups"] = {value: members[value] for value in values if value in members}
+            node["branch_info"] = {value: float(self.node_entropy[child])
+                                   for value, child in zip(values, children)}
+            node["branches"] = {value: dicts[child] for value, child in zip(values, children)}
+            dicts[k] = node
+        return dicts[0]
+
+def compile_tree(tree, attributes=None, categories=None, classes=None):
+    """
+    Übersetzt ein Baum-Dictionary in einen CompiledTree.
+    attributes, categories und classes dürfen fehlen und werden dann aus dem Baum
+    abgeleitet (Attribute und Werte in der Reihenfolge ihres Auftretens, Klassen sortiert).
+    """
+    # Wörterbücher aus dem Baum sammeln (iterativ, auch für sehr tiefe Bäume)
+    seen_attributes = []
+    seen_values = {}
+    thresholds = {}
+    groups = {}
+    leaf_classes = set()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node["leaf"]:
+            leaf_classes.add(node["class"])
+            continue
+        attribute = node["attribute"]
+        if attribute not in seen_values:
+            seen_attributes.append(attribute)
+            seen_values[attribute] = []
+        if "threshold" in node:
+            thresholds.setdefault(attribute, set()).add(node["threshold"])
+            stack.extend(reversed(list(node["branches"].values())))
+            continue
+        for label, values in node.get("groups", {}).items():
+            groups.setdefault(attribute, {}).update((value, label) for value in values)
+        known = seen_values[attribute]
+        for value in node["branches"]:
+            if value not in known:
+                known.append(value)
+        stack.extend(reversed(list(node["branches"].values())))
+
+    if attributes is None:
+        attributes = seen_attributes
+    if categories is None:
+        categories = seen_values
+    else:
+        categories = {a: list(categories.get(a, seen_values.get(a, []))) for a in attributes}
+        for attribute, values in seen_values.items():
+            categories[attribute] += [v for v in values if v not in categories[attribute]]
+    # Numerische Attribute: Wörterbuch = sortierte Schwellen
+    for attribute, values in thresholds.items():
+        categories[attribute] = sorted(values)
+    if classes is None:
+        classes = sorted(leaf_classes)
+    attribute_index = {attribute: j for j, attribute in enumerate(attributes)}
+    value_index = {a: {v: k for k, v in enumerate(categories[a])} for a in attributes}
+    class_index = {cls: k for k, cls in enumerate(classes)}
+
+    # Knoten in Breitensuche nummerieren
+    nodes = []
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        nodes.append(node)
+        if not node["leaf"]:
+            queue.extend(node["branches"].values())
+    ids = {id(node): k for k, node in enumerate(nodes)}
+
+    num_nodes = len(nodes)
+    node_attribute = np.full(num_nodes, -1, dtype=np.int64)
+    node_class = np.zeros(num_nodes, dtype=np.int64)
+    node_samples = np.zeros(num_nodes, dtype=np.int64)
+    child_offset = np.zeros(num_nodes, dtype=np.int64)
+    node_entropy = np.full(num_nodes, np.nan)
+    node_split = np.full(num_nodes, -1, dtype=np.int64)
+    blocks = []
+    offset = 0
+    for k, node in enumerate(nodes):
+        node_samples[k] = node["num_samples"]
+        if node["leaf"]:
+            node_class[k] = class_index[node["class"]]
+            continue
+        attribute = node["attribute"]
+        node_attribute[k] = attribute_index[attribute]
+        if "threshold" in node:
+            node_split[k] = value_index[attribute][node["threshold"]]
+            block = np.array([ids[id(subtree)] for subtree in node["branches"].values()],
+                             dtype=np.int64)
+            for value, subtree in node["branches"].items():
+                node_entropy[ids[id(subtree)]] = node["branch_info"].get(value, np.nan)
+        else:
+            block = np.full(len(categories[attribute]), -1, dtype=np.int64)
+            for value, subtree in node["branches"].items():
+                block[value_index[attribute][value]] = ids[id(subtree)]
+                node_entropy[ids[id(subtree)]] = node["branch_info"].get(value, np.nan)
+        child_offset[k] = offset
+        offset += len(block)
+        blocks.append(block)
+    child_table = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int64)
+
+    # Mehrheitsklasse innerer Knoten: nach Samples gewichtete Klassen der Blätter im
+    # Teilbaum (Kinder stehen in Breitensuche immer hinter ihrem Elternknoten)
+    class_samples = np.zeros((num_nodes, len(classes)), dtype=np.int64)
+    for k in range(num_nodes - 1, -1, -1):
+        if node_attribute[k] < 0:
+            class_samples[k, node_class[k]] = node_samples[k]
+        else:
+            start = child_offset[k]
+            width = 2 if node_split[k] >= 0 else len(categories[attributes[node_attribute[k]]])
+            children = child_table[start:start + width]
+            class_samples[k] = class_samples[children[children >= 0]].sum(axis=0)
+            node_class[k] = int(np.argmax(class_samples[k]))
+
+    return CompiledTree(attributes, categories, classes, node_attribute, node_class,
+                        node_samples, child_offset, child_table, node_entropy, node_split,
+                        numeric_attributes=thresholds, groups=groups)
+
+def save_model(model, path):
+    """
+    Speichert einen CompiledTree (siehe Modulbeschreibung zum Dateiformat).
+    """
+    arrays = [np.ascontiguousarray(getattr(model, name)) for name in ARRAY_NAMES]
+    header = {
+        "attributes": model.attributes,
+        "numeric_attributes": model.numeric_attributes,
+        "categories": {a: [tag_value(v) for v in model.categories[a]] for a in model.attributes},
+        "classes": [tag_value(cls) for cls in model.classes],
+        "groups": {a: [[tag_value(v), tag_value(label)] for v, label in mapping.items()]
+                   for a, mapping in model.groups.items()},
+        "arrays": [],
+    }
+    # Lage der Arrays relativ zum Beginn des Datenbereichs
+    offset = 0
+    for name, array in zip(ARRAY_NAMES, arrays):
+        header["arrays"].append({"name": name, "dtype": array.dtype.str,
+                                 "shape": list(array.shape), "offset": offset})
+        offset += -(-array.nbytes // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix = MODEL_MAGIC + struct.pack("<IQ", MODEL_VERSION, len(header_bytes))
+    data_start = -(-(len(prefix) + len(header_bytes)) // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(prefix)
+        f.write(header_bytes)
+        for entry, array in zip(header["arrays"], arrays):
+            f.write(b"\0" * (data_start + entry["offset"] - f.tell()))
+            f.write(array.tobytes())
+
+def load_model(path, mmap=True):
+    """
+    Lädt einen mit save_model gespeicherten Baum. Mit mmap=True werden die Arrays
+    per Memory-Mapping eingebunden statt eingelesen.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MODEL_MAGIC))
+        if magic != MODEL_MAGIC:
+            raise ValueError(f"Keine ID3-Modelldatei: {path}")
+        version, header_length = struct.unpack("<IQ", f.read(12))
+        # Version 1 kannte noch keine Schwellenwert-Knoten (node_split fehlt)
+        if version not in (1, MODEL_VERSION):
+            raise ValueError(f"Nicht unterstützte Modellversion {version} in {path}")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        data_start = -(-f.tell() // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+    arrays = {}
+    for entry in header["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        if mmap and int(np.prod(shape)) > 0:
+            arrays[entry["name"]] = np.memmap(path, dtype=dtype, mode="r",
+                                              offset=data_start + entry["offset"], shape=shape)
+        else:
+            with open(path, "rb") as f:
+                f.seek(data_start + entry["offset"])
+                count = int(np.prod(shape))
+                arrays[entry["name"]] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    attributes = header["attributes"]
+    categories = {a: [untag_value(v) for v in header["categories"][a]] for a in attributes}
+    classes = [untag_value(cls) for cls in header["classes"]]
+    groups = {a: {untag_value(v): untag_value(label) for v, label in pairs}
+              for a, pairs in header.get("groups", {}).items()}
+    return CompiledTree(attributes, categories, classes, **arrays,
+                        numeric_attributes=header.get("numeric_attributes", ()), groups=groups)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ID3 - Vorhersagen mit einem gespeicherten Baum")
+    parser.add_argument("modell", help="Modelldatei (gespeichert mit --model in ID3.py)")
+    parser.add_argument("datei", help="Datei mit neuen Fällen (CSV oder Excel)")
+    parser.add_argument("-o", "--output", help="Vorhersagen als CSV speichern (Standard: Ausgabe)")
+    parser.add_argument("--column", default="Vorhersage", help="Name der Vorhersage-Spalte")
+    args = parser.parse_args(argv)
+    try:
+        model = load_model(args.modell)
+        df = load_file(args.datei, verbose=False)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        sys.exit(1)
+    df[args.column] = model.predict(df)
+    df.to_csv(args.output if args.output else sys.stdout, index=False)
+
+if __name__ == "__main__":
+    main()
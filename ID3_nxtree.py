@@ -1,210 +1,83 @@
-import os
-import sys
-import numpy as np
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-
-def print_green(*args, **kwargs):
-    GREEN = "\033[92m"
-    END = "\033[0m"
-    sep = kwargs.pop("sep", " ")
-    end = kwargs.pop("end", "\n")
-    file = kwargs.pop("file", sys.stdout)
-    message = sep.join(str(arg) for arg in args)
-    file.write(GREEN + message + END + end)
-    file.flush()
-
-def print_red(*args, **kwargs):
-    RED = "\033[91m"
-    END = "\033[0m"
-    sep = kwargs.pop("sep", " ")
-    end = kwargs.pop("end", "\n")
-    file = kwargs.pop("file", sys.stdout)
-    message = sep.join(str(arg) for arg in args)
-    file.write(RED + message + END + end)
-    file.flush()
-
-def input_lightblue(prompt):
-    LIGHTBLUE = "\033[94m"
-    END = "\033[0m"
-    return input(LIGHTBLUE + prompt + END)
-
-def calculate_entropy_verbose(series, all_possible_values=None):
-    """
-    Berechnet die Entropie einer pandas Series und liefert zwei Strings:
-      - Zeile 1: Häufigkeiten, z. B.: "Häufigkeiten: Klasse 'No' 0/4, Klasse 'Yes' 4/4"
-      - Zeile 2: Formel, z. B.: "-(0/4) * log2 (0/4) - (4/4) * log2 (4/4) = 0.0000"
-    Werden all_possible_values (Liste aller möglicher Klassen) übergeben, so werden auch
-    Klassen mit 0 Vorkommen berücksichtigt.
-    """
-    counts = series.value_counts()
-    total = counts.sum()
-    if all_possible_values is None:
-        all_possible_values = sorted(series.unique())
-    fractions = []
-    entropy = 0.0
-    terms = []
-    for value in all_possible_values:
-        count = counts.get(value, 0)
-        fractions.append(f"Klasse '{value}' {count}/{total}")
-        prob = count / total if total > 0 else 0
-        if prob > 0:
-            contrib = -prob * np.log2(prob)
-        else:
-            contrib = 0
-        entropy += contrib
-        terms.append(f"({count}/{total}) * log2 ({count}/{total})")
-    line1 = "Häufigkeiten: " + ", ".join(fractions)
-    line2 = "-" + " - ".join(terms) + f" = {entropy:.4f}"
-    return entropy, [line1, line2]
-
-def build_id3_tree(data, attributes, target_var, print_entropy=True):
-    if print_entropy:
-        current_entropy, entropy_details = calculate_entropy_verbose(
-            data[target_var], sorted(data[target_var].unique())
-        )
-        print("Gesamte Entropie der Zielvariable:")
-        print(entropy_details[0])
-        print(entropy_details[1])
-        input_lightblue("Enter zum Fortfahren...")
-    else:
-        current_entropy, _ = calculate_entropy_verbose(
-            data[target_var], sorted(data[target_var].unique())
-        )
-
-    # Blatt: wenn Knoten rein ist
-    if abs(current_entropy) < 1e-6:
-        majority = data[target_var].iloc[0]
-        print("Knoten ist rein (Entropie 0). Eindeutiger Wert:", majority)
-        input_lightblue("Enter zum Fortfahren...")
-        return {"leaf": True, "class": majority, "num_samples": len(data)}
-
-    # Blatt: wenn keine Attribute mehr vorhanden sind
-    if not attributes:
-        majority = data[target_var].mode()[0]
-        print("Keine Attribute mehr vorhanden. Knoten als Blatt mit Mehrheit:", majority)
-        input_lightblue("Enter zum Fortfahren...")
-        return {"leaf": True, "class": majority, "num_samples": len(data)}
-
-    total_samples = len(data)
-    best_gain = -np.inf
-    best_attribute = None
-    best_branch_entropies = {}
-
-    # Berechne Informationsgewinn für jedes verbleibende Attribut:
-    for attribute in attributes:
-        print_green("\nID3 - Berechne Gewinn für Attribut:", attribute)
-        attr_weighted_entropy = 0.0
-        branch_entropies = {}
-        weighted_values = []  # Sammlung der gewichteten Entropieanteile als Endwerte
-        for value in data[attribute].unique():
-            subset = data[data[attribute] == value]
-            sub_entropy, sub_details = calculate_entropy_verbose(
-                subset[target_var], sorted(data[target_var].unique())
-            )
-            weight = len(subset) / total_samples
-            weighted_component = weight * sub_entropy
-            attr_weighted_entropy += weighted_component
-            branch_entropies[value] = sub_entropy
-            print(f"\nAttribut {attribute}, Wert {value}:")
-            print(sub_details[0])
-            print(sub_details[1])
-            print(f"Gewicht: ({len(subset)}/{total_samples}) = {weight:.4f}")
-            print(f"Gewichteter Entropieanteil: ({len(subset)}/{total_samples}) * {sub_entropy:.4f} = {weighted_component:.4f}")
-            weighted_values.append(f"{weighted_component:.4f}")
-        addition = " + ".join(weighted_values)
-        gain = current_entropy - attr_weighted_entropy
-        print(f"\nGewinn für Attribut {attribute}: {current_entropy:.4f} - ({addition}) = {gain:.4f}")
-        input_lightblue("Enter zum Fortfahren...")
-        if gain > best_gain:
-            best_gain = gain
-            best_attribute = attribute
-            best_branch_entropies = branch_entropies
-    print(f"\nBestes Attribut gewählt: {best_attribute} (Gewinn = {best_gain:.4f})")
-    input_lightblue("Enter zum Fortfahren...")
-
-    # Für jeden Zweig des besten Attributs: Ausgabe der resultierenden Tabelle, Berechnung und Ausgabe der Entropie
-    for value in data[best_attribute].unique():
-        subset = data[data[best_attribute] == value]
-        print_green(f"\nResultierende Tabelle für {best_attribute} = {value}:\n")
-        print(subset.to_string(index=False))
-        branch_entropy_overall, branch_entropy_details = calculate_entropy_verbose(
-            subset[target_var], sorted(data[target_var].unique())
-        )
-        print("\nBerechnung der Entropie für diesen Teilbaum:")
-        print(branch_entropy_details[0])
-        print(branch_entropy_details[1])
-        print("Gesamtentropie für diesen Teilbaum: {:.4f}".format(branch_entropy_overall))
-        input_lightblue("Enter zum Fortfahren...")
-
-    # Erstelle internen Knoten:
-    node = {
-        "leaf": False,
-        "attribute": best_attribute,
-        "num_samples": total_samples,
-        "branch_info": best_branch_entropies,
-        "branches": {}
-    }
-
-    # Für jeden Zweig (Wert) des besten Attributs:
-    for value in data[best_attribute].unique():
-        print_green(f"\nID3 - Erstelle Unterbaum für {best_attribute} = {value}\n")
-        subset = data[data[best_attribute] == value]
-        new_attributes = [a for a in attributes if a != best_attribute]
-        subtree = build_id3_tree(subset, new_attributes, target_var, print_entropy=False)
-        node["branches"][value] = subtree
-    return node
+# Terminal-Ausgabe, Baumaufbau und interaktiver Ablauf stehen in ID3_cli.py (gemeinsam mit
+# ID3.py); die Namen bleiben auch als ID3_nxtree.<Name> erreichbar. networkx, matplotlib
+# und numpy werden erst beim Zeichnen importiert.
+from ID3_cli import (
+    build_id3_tree, calculate_entropy_verbose, id3_argument_parser, image_output,
+    input_lightblue, print_green, print_red, run_batch_mode, run_id3_batch, run_interactive,
+    wait_for_enter,
+)
+# Beschriftungen wie in ID3.py; als Modul importiert, weil der Parameter edge_label von
+# build_nx_tree sonst die Funktion verdecken würde
+import ID3_render
+
+FIGURE_DPI = 100
+MAX_LABELLED_PIXELS = 6000
 
 def hierarchy_pos(G, root, width=1.0, vert_gap=0.2, vert_loc=0, xcenter=0.5):
     """
-    Positioniert die Knoten eines Baums G hierarchisch.
-    Quelle: https://stackoverflow.com/a/29597209/3954614
+    Positioniert die Knoten eines Baums G hierarchisch (iterativ, O(n), ohne Rekursion).
+    Jeder Teilbaum erhält eine Breite proportional zur Anzahl seiner Blätter: die Blätter
+    liegen gleichmäßig verteilt, jeder Elternknoten mittig über seinen Blättern.
     """
-    def _hierarchy_pos(G, root, leftmost, width, vert_gap, vert_loc, xcenter, pos, parent=None):
-        pos[root] = (xcenter, vert_loc)
-        neighbors = list(G.successors(root))
-        if neighbors:
-            dx = width / len(neighbors)
-            nextx = xcenter - width/2 - dx/2
-            for neighbor in neighbors:
-                nextx += dx
-                pos = _hierarchy_pos(G, neighbor, leftmost, dx, vert_gap, vert_loc - vert_gap, nextx, pos, root)
-        return pos
-
-    return _hierarchy_pos(G, root, 0, width, vert_gap, vert_loc, xcenter, {})
-
-def build_nx_tree(tree, target_var, G, parent_id=None, edge_label=None, counter=[0]):
+    # Knoten in Vorordnung (Kinder in Zweigreihenfolge)
+    children = {}
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        children[node] = list(G.successors(node))
+        stack.extend(reversed(children[node]))
+
+    # Blätter je Teilbaum, von unten nach oben
+    leaves = {}
+    for node in reversed(order):
+        leaves[node] = sum(leaves[child] for child in children[node]) if children[node] else 1
+
+    # Von oben nach unten: jedes Kind erhält seinen Anteil am Bereich des Elternknotens
+    unit = width / leaves[root]
+    left = {root: xcenter - width / 2}
+    level = {root: 0}
+    pos = {}
+    for node in order:
+        x = left[node]
+        pos[node] = (x + leaves[node] * unit / 2, vert_loc - level[node] * vert_gap)
+        for child in children[node]:
+            left[child] = x
+            level[child] = level[node] + 1
+            x += leaves[child] * unit
+    return pos
+
+def build_nx_tree(tree, target_var, G, parent_id=None, edge_label=None, counter=None):
     """
-    Rekursiver Aufbau eines networkx-DiGraph aus dem Baum-Dictionary.
-    - Jeder Knoten erhält eine eindeutige ID (z. B. node0, node1, ...).
+    Aufbau eines networkx-DiGraph aus dem Baum-Dictionary (iterativ, auch für tiefe Bäume).
+    - Jeder Knoten erhält eine eindeutige ID (z. B. node0, node1, ...). Die Zählung
+      beginnt bei jedem Aufruf bei 0, außer es wird ein eigener counter ([n]) übergeben.
     - Dem Knoten werden Labels zugewiesen, die den Attributnamen (bei inneren Knoten)
       oder den Zielvariablenwert (bei Blattknoten) sowie die Sample-Anzahl enthalten.
     - Kanten werden mit einem Label versehen, das den Klassenwert und den (optional)
       berechneten Entropiewert enthält.
     """
-    current_id = f"node{counter[0]}"
-    counter[0] += 1
-
-    if tree["leaf"]:
-        node_label = f"{target_var}: {tree['class']}\nSamples: {tree['num_samples']}"
-    else:
-        node_label = f"Attribut: {tree['attribute']}\nSamples: {tree['num_samples']}"
-    G.add_node(current_id, label=node_label)
-
-    if parent_id is not None:
-        G.add_edge(parent_id, current_id, label=edge_label)
-
-    if not tree["leaf"]:
-        for branch_val, subtree in tree["branches"].items():
-            branch_entropy = tree["branch_info"].get(branch_val, None)
-            if branch_entropy is not None:
-                child_edge_label = f"Klasse: {branch_val}\nEntropie: {branch_entropy:.4f}"
-            else:
-                child_edge_label = f"Klasse: {branch_val}"
-            build_nx_tree(subtree, target_var, G, parent_id=current_id, edge_label=child_edge_label, counter=counter)
-
-def draw_tree(tree, target_var):
+    if counter is None:
+        counter = [0]
+    stack = [(tree, parent_id, edge_label)]
+    while stack:
+        node, node_parent, node_edge_label = stack.pop()
+        current_id = f"node{counter[0]}"
+        counter[0] += 1
+
+        G.add_node(current_id, label=ID3_render.node_label(node, target_var))
+
+        if node_parent is not None:
+            G.add_edge(node_parent, current_id, label=node_edge_label)
+
+        if not node["leaf"]:
+            children = []
+            for branch_val, subtree in node["branches"].items():
+                children.append((subtree, current_id, ID3_render.edge_label(node, branch_val)))
+            stack.extend(reversed(children))
+
+def draw_tree(tree, target_var, output=None, max_labels=200):
     """
     Erzeugt eine grafische Darstellung des ID3-Baums mithilfe von networkx und matplotlib.
 
@@ -212,101 +85,92 @@ def draw_tree(tree, target_var):
       tree: Das Baum-Dictionary, wie es von build_id3_tree erzeugt wurde.
       target_var: Name der Zielvariablen (wird in den Knoten-Labels genutzt).
 
-    Die Knoten werden um ca. 20% größer dargestellt, und die Kantenbeschriftungen
-    werden horizontal (rotate=False) ausgegeben.
+      output: Optionaler Dateiname; statt eines Fensters wird die Grafik dorthin gespeichert.
+              Dafür wird direkt das Agg-Backend verwendet, ein Display ist nicht nötig.
+      max_labels: Knoten- und Kantenbeschriftungen nur bis zu dieser Knotenzahl und solange
+                  die beschriftete Grafik höchstens MAX_LABELLED_PIXELS breit und hoch ist;
+                  größere Bäume werden nur als Struktur gezeichnet (höchstens 4000 Pixel breit).
+
+    Alle Kanten werden als eine LineCollection und alle Knoten mit einem scatter-Aufruf
+    gezeichnet, auch Bäume mit tausenden Knoten sind damit in Sekunden fertig. Die
+    Kantenbeschriftungen werden horizontal ausgegeben.
     """
+    import networkx as nx
+    import numpy as np
+    from matplotlib.collections import LineCollection
     G = nx.DiGraph()
-    counter = [0]
-    build_nx_tree(tree, target_var, G, counter=counter)
+    build_nx_tree(tree, target_var, G)
 
     # Berechne ein hierarchisches Layout; der Root-Knoten hat hier die ID "node0"
-    pos = hierarchy_pos(G, root="node0")
-
-    # Extrahiere Knoten- und Kanten-Labels
-    node_labels = nx.get_node_attributes(G, 'label')
-    edge_labels = nx.get_edge_attributes(G, 'label')
-
-    plt.figure(figsize=(12, 8))
-    nx.draw(G, pos, with_labels=True, labels=node_labels, node_size=5000, node_color='lightblue', font_size=10)
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_color='black', font_size=10, rotate=True)
-    plt.axis('off')
-    plt.show()
-
-def main():
-    try:
-        print_green("ID3 - Eingabedatei laden")
-        while True:
-            filename = input("Bitte Quell-Datei angeben (CSV oder Excel): ").strip()
-
-            # Prüfe, ob die Datei existiert
-            if not os.path.exists(filename):
-                print_red("Fehler: Datei nicht gefunden.\n")
-                continue
-
-            # Prüfe, ob die Datei lesbar ist
-            if not os.access(filename, os.R_OK):
-                print_red("Fehler: Datei nicht lesbar.\n")
-                continue
-
-            # Wenn Datei existiert und lesbar ist, Schleife verlassen
-            break
-
-        _, ext = os.path.splitext(filename)
-        ext = ext.lower()
-
-        if ext == ".csv":
-            print(f"CSV-Datei erkannt. Lade CSV-Datei...")
-            df = pd.read_csv(filename, sep=None, engine='python')
-            # trim columns
-            df.columns = df.columns.str.strip()
-            # trim values
-            for col in df.select_dtypes(include=['object']).columns:
-                df[col] = df[col].str.strip()
-        elif ext in [".xls", ".xlsx"]:
-            print("Excel-Datei erkannt. Lade Excel-Datei...")
-            df = pd.read_excel(filename)
-            # trim columns
-            df.columns = df.columns.str.strip()
-            # trim values
-            for col in df.select_dtypes(include=['object']).columns:
-                df[col] = df[col].str.strip()
-        else:
-            print_red("Nicht unterstütztes Dateiformat!")
-            return
-        print("Datei wurde erfolgreich geladen!")
-
-        print_green("\nID3 - Zielvariable auswählen")
-        while True:
-            # Prüfen, ob genügend Spalten vorhanden sind
-            if len(df.columns) <= 1:
-                print_red("Nicht genügend Elemente gefunden, bitte Quelldatei oder Separator überprüfen")
-                sys.exit(1)
-
-            print("Gefundene Variablen:")
-            for idx, col in enumerate(df.columns):
-                print(f"  {idx}: {col}")
-            try:
-                target_index = int(input("Bitte Zielvariable auswählen: "))
-                target_var = df.columns[target_index]
-                break  # Gültige Eingabe
-            except (IndexError, ValueError) as e:
-                print_red("Ungültige Zielvariable:")
-        print(f"Zielvariable ausgewählt: '{target_var}'")
-
-        print_green(f"\nID3 - Berechnung der Entropie für '{target_var}'")
-        input_lightblue("Enter zum Fortfahren...")
-        # Hier erfolgt die Entropieberechnung NICHT in main, da sie in build_id3_tree ausgegeben wird.
-
-        # Baum rekursiv aufbauen
-        attributes = [col for col in df.columns if col != target_var]
-        tree = build_id3_tree(df, attributes, target_var)
+    vert_gap = 0.2
+    pos = hierarchy_pos(G, root="node0", vert_gap=vert_gap)
+    nodes = list(G.nodes)
+    xy = np.array([pos[node] for node in nodes])
+    segments = np.array([(pos[u], pos[v]) for u, v in G.edges]).reshape(-1, 2, 2)
+    num_leaves = sum(1 for node in nodes if G.out_degree(node) == 0)
+    num_levels = int(round(-xy[:, 1].min() / vert_gap)) + 1
+    # Beschriftete Blätter brauchen etwa 3 Zoll Platz; wird die Grafik damit größer als
+    # MAX_LABELLED_PIXELS, wird nur die Struktur gezeichnet (mit weniger Platz je Blatt)
+    figsize = (max(12, 3.0 * num_leaves), max(8, 1.8 * num_levels))
+    labelled = len(nodes) <= max_labels and max(figsize) * FIGURE_DPI <= MAX_LABELLED_PIXELS
+    if not labelled:
+        figsize = (min(max(12, 0.5 * num_leaves), 40), min(max(8, 1.2 * num_levels), 25))
+
+    if output:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize, dpi=FIGURE_DPI)
+        FigureCanvasAgg(fig)
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize, dpi=FIGURE_DPI)
+    ax = fig.add_subplot()
+
+    ax.add_collection(LineCollection(segments, colors="gray", linewidths=1.0 if labelled else 0.5,
+                                     zorder=1))
+    ax.scatter(xy[:, 0], xy[:, 1], s=5000 if labelled else 20, c="lightblue", zorder=2)
+    if labelled:
+        for node, (x, y) in zip(nodes, xy):
+            ax.text(x, y, G.nodes[node]["label"], ha="center", va="center", fontsize=10, zorder=3)
+        for (u, v), label in nx.get_edge_attributes(G, "label").items():
+            # etwas näher am Kindknoten, damit sich Beschriftungen von Geschwistern nicht überlappen
+            x = 0.4 * pos[u][0] + 0.6 * pos[v][0]
+            y = 0.4 * pos[u][1] + 0.6 * pos[v][1]
+            ax.text(x, y, label, ha="center", va="center", fontsize=10, zorder=3,
+                    bbox=dict(boxstyle="round", ec="white", fc="white"))
+    ax.margins(0.1)
+    ax.autoscale_view()
+    ax.axis('off')
+    if output:
+        fig.savefig(output, bbox_inches='tight')
+    else:
+        plt.show()
 
-        # Baum zeichnen
-        print_green("\nID3 - Zeichne Baum...\n")
-        draw_tree(tree, target_var)
-    except KeyboardInterrupt:
-        print_red("\nProgramm abgebrochen.")
-        sys.exit(0)
+def run_id3(filename, target_var, output="ID3_Baum", render=True, image_format="png",
+            **options):
+    """
+    Nicht-interaktiver Durchlauf (ID3_cli.run_id3_batch, dort auch die übrigen options);
+    die Grafik wird als Bilddatei gespeichert, ohne Fenster zu öffnen.
+    image_format: "png", "svg" oder "pdf"; eine passende Endung in output hat Vorrang,
+                  sonst wird die Endung ergänzt.
+    Liefert das Baum-Dictionary.
+    """
+    def render_image(tree):
+        draw_tree(tree, target_var, output=image_output(output, image_format)[0])
+
+    return run_id3_batch(filename, target_var, render_image if render and output else None,
+                         **options)
+
+def parse_args(argv=None):
+    return id3_argument_parser().parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.datei is not None:
+        # Batch-Modus: keine Eingaben, keine Pausen
+        run_batch_mode(args, run_id3)
+        return
+    run_interactive(draw_tree)
 
 if __name__ == "__main__":
     main()
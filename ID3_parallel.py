@@ -0,0 +1,152 @@
+"""
+Paralleler Aufbau des ID3-Baums.
+
+Der kodierte Datensatz (Attribut-Codes und Ziel-Codes) wird einmal in Shared Memory
+abgelegt; die Worker-Prozesse lesen direkt daraus, statt die Daten gepickelt zu
+bekommen. Übertragen werden pro Aufgabe nur die Zeilenindizes eines Teilbaums.
+
+Der Elternprozess teilt große Knoten selbst auf, Teilbäume ab min_parallel_rows
+Zeilen laufen als Aufgaben im Prozess-Pool, kleinere Teilbäume werden seriell
+gebaut. Da alle Knoten mit split_node aus ID3_core bewertet werden, ist der Baum
+identisch mit dem seriellen Aufbau (auch bei Gleichstand im Gewinn).
+
+Ist eine ID3_trace.BuildTrace aktiv, messen die Worker ihre Teilbäume selbst und
+liefern die Messwerte mit dem Teilbaum zurück; der Elternprozess hängt sie unter den
+aufteilenden Knoten ein (BuildTrace.merge).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ID3_core import EncodedData, build_tree, encode_dataset, presort, split_node
+from ID3_trace import BuildTrace, active_trace
+
+# Im Worker: an das Shared Memory angebundener Datensatz
+_worker_encoded = None
+_worker_segments = []
+
+def _to_shared(array):
+    """Kopiert ein Array in ein neues Shared-Memory-Segment."""
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf,
+                        order="F" if array.flags.f_contiguous and array.ndim > 1 else "C")
+    shared[...] = array
+    return segment, (segment.name, array.shape, array.dtype.str, shared.flags.f_contiguous)
+
+def _attach(spec):
+    name, shape, dtype, fortran = spec
+    segment = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf,
+                       order="F" if fortran else "C")
+    return segment, array
+
+def _init_worker(attr_spec, target_spec, numeric_specs, categories, classes, columns, groups):
+    global _worker_encoded, _worker_segments
+    attr_segment, attr_codes = _attach(attr_spec)
+    target_segment, target_codes = _attach(target_spec)
+    _worker_segments = [attr_segment, target_segment]
+    numeric = {}
+    for attribute, spec in numeric_specs.items():
+        segment, numeric[attribute] = _attach(spec)
+        _worker_segments.append(segment)
+    _worker_encoded = EncodedData(attr_codes, target_codes, categories, classes, columns, numeric,
+                                  groups)
+
+def _build_task(rows, attributes, sorted_rows, traced=False):
+    if not traced:
+        return build_tree(_worker_encoded, rows, attributes, sorted_rows), None
+    return _traced_build(_worker_encoded, rows, attributes, sorted_rows)
+
+def _traced_build(encoded, rows, attributes, sorted_rows):
+    """Baut einen Teilbaum mit eigener BuildTrace; liefert (Baum, Messwerte, Prozess-ID)."""
+    with BuildTrace() as trace:
+        tree = build_tree(encoded, rows, attributes, sorted_rows)
+    return tree, (trace.export(), os.getpid())
+
+def build_id3_tree_parallel(data, attributes, target_var, processes=None, min_parallel_rows=10000,
+                            numeric_attributes=(), max_bins=None, bin_method="frequency",
+                            max_gain_loss=None):
+    """
+    Baut den ID3-Baum ohne Ausgabe mit einem Prozess-Pool auf.
+    processes: Anzahl der Worker (Standard: Anzahl der CPU-Kerne).
+    min_parallel_rows: Teilbäume mit weniger Zeilen werden seriell gebaut.
+    numeric_attributes: Attribute mit binären Schwellenwert-Splits.
+    max_bins, bin_method, max_gain_loss: Gruppierung vieler Werte (siehe ID3_core).
+    Liefert das gleiche Baum-Dictionary wie build_id3_tree.
+    """
+    encoded = encode_dataset(data, attributes, target_var, numeric_attributes, max_bins,
+                             bin_method, max_gain_loss)
+    rows = np.arange(len(data))
+    sorted_rows = presort(encoded, rows)
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(rows) < min_parallel_rows:
+        return build_tree(encoded, rows, attributes, sorted_rows)
+
+    # Knoten oberhalb dieser Größe teilt der Elternprozess selbst auf, damit genügend
+    # Aufgaben für alle Worker entstehen.
+    split_threshold = max(min_parallel_rows, len(rows) // (4 * processes))
+
+    segments = []
+    try:
+        attr_segment, attr_spec = _to_shared(encoded.attr_codes)
+        segments.append(attr_segment)
+        target_segment, target_spec = _to_shared(encoded.target_codes)
+        segments.append(target_segment)
+        numeric_specs = {}
+        for attribute, values in encoded.numeric.items():
+            segment, numeric_specs[attribute] = _to_shared(values)
+            segments.append(segment)
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(attr_spec, target_spec, numeric_specs, encoded.categories, encoded.classes,
+                      encoded.columns, encoded.groups),
+        ) as pool:
+            trace = active_trace()
+            pending = []  # (Elternknoten, Messwerte des Elternknotens, Zweigwert, Future)
+            local = []    # kleine Teilbäume, die der Elternprozess selbst baut
+
+            def expand(node_rows, node_attributes, node_sorted):
+                record = trace.begin_node(len(node_rows)) if trace is not None else None
+                node, children = split_node(encoded, node_rows, node_attributes, node_sorted)
+                for value, sub_rows, sub_attributes, sub_sorted in children or ():
+                    # Platzhalter hält die Reihenfolge der Zweige stabil
+                    node["branches"][value] = None
+                    if len(sub_rows) > split_threshold:
+                        node["branches"][value] = expand(sub_rows, sub_attributes, sub_sorted)
+                    elif len(sub_rows) >= min_parallel_rows:
+                        future = pool.submit(_build_task, sub_rows, sub_attributes, sub_sorted,
+                                             trace is not None)
+                        pending.append((node, record, value, future))
+                    else:
+                        local.append((node, record, value, sub_rows, sub_attributes, sub_sorted))
+                if record is not None:
+                    trace.end_node(record, node)
+                return node
+
+            def attach(node, record, value, result):
+                node["branches"][value], measured = result
+                if measured is not None:
+                    exported, worker = measured
+                    trace.merge(exported, record, worker if worker != os.getpid() else None)
+
+            tree = expand(rows, attributes, sorted_rows)
+            # Während die Worker rechnen, baut der Elternprozess die kleinen Teilbäume
+            for node, record, value, sub_rows, sub_attributes, sub_sorted in local:
+                if trace is None:
+                    node["branches"][value] = build_tree(encoded, sub_rows, sub_attributes, sub_sorted)
+                else:
+                    attach(node, record, value,
+                           _traced_build(encoded, sub_rows, sub_attributes, sub_sorted))
+            for node, record, value, future in pending:
+                attach(node, record, value, future.result())
+            if trace is not None:
+                trace.extend_totals()
+        return tree
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
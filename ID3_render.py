@@ -0,0 +1,156 @@
+"""
+Graphviz-Ausgabe für große ID3-Bäume.
+
+Der DOT-Quelltext wird iterativ (ohne Rekursion) direkt als Text erzeugt, mit kurzen,
+fortlaufend nummerierten Knoten-IDs (n0, n1, ...). Damit große Bäume lesbar bleiben,
+werden Teilbäume unterhalb von max_depth und Teilbäume mit weniger als min_samples
+Samples zu einem gestrichelten Zusammenfassungsknoten zusammengefasst.
+
+render_tree rendert im Speicher (SVG, PDF oder PNG), ohne einen Viewer zu öffnen. Das
+Ergebnis wird unter dem Hash des DOT-Quelltexts im Cache abgelegt (gleiches Verzeichnis
+und gleiche Größenbegrenzung wie dataset_cache); ein unveränderter Baum wird also nur
+einmal gerendert.
+
+Graphviz und dataset_cache (pandas) werden erst beim Rendern importiert; Beschriftungen
+und DOT-Quelltext kommen ohne sie aus.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+RENDER_FORMATS = ("svg", "pdf", "png")
+RENDER_PREFIX = "render-"
+META_FILE = "meta.json"
+
+def node_label(node, target_var):
+    if node["leaf"]:
+        return f"{target_var}: {node['class']}\nSamples: {node['num_samples']}"
+    return f"Attribut: {node['attribute']}\nSamples: {node['num_samples']}"
+
+def edge_label(node, branch_val):
+    branch_entropy = node["branch_info"].get(branch_val, None)
+    if branch_entropy is not None:
+        return f"Klasse: {branch_val}\nEntropie: {branch_entropy:.4f}"
+    return f"Klasse: {branch_val}"
+
+def _quote(text):
+    return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+def subtree_size(node):
+    """Anzahl der Knoten eines Teilbaums (iterativ)."""
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if not current["leaf"]:
+            stack.extend(current["branches"].values())
+    return count
+
+def tree_to_dot(tree, target_var, max_depth=None, min_samples=0, dpi=None):
+    """
+    Erzeugt den DOT-Quelltext des Baums.
+    max_depth: innere Knoten ab dieser Tiefe (Wurzel = 0) werden zusammengefasst.
+    min_samples: innere Knoten mit weniger Samples werden zusammengefasst.
+    """
+    lines = ["digraph {"]
+    if dpi:
+        lines.append(f"\tdpi={int(dpi)}")
+    # (Knoten, ID des Elternknotens, Kantenlabel, Tiefe)
+    stack = [(tree, None, None, 0)]
+    next_id = 0
+    while stack:
+        node, parent_id, label, depth = stack.pop()
+        node_id = f"n{next_id}"
+        next_id += 1
+        collapse = not node["leaf"] and (
+            (max_depth is not None and depth >= max_depth) or node["num_samples"] < min_samples
+        )
+        if collapse:
+            summary = (f"Attribut: {node['attribute']}\n"
+                       f"+ {subtree_size(node) - 1} Knoten\nSamples: {node['num_samples']}")
+            lines.append(f"\t{node_id} [label={_quote(summary)} style=dashed]")
+        else:
+            lines.append(f"\t{node_id} [label={_quote(node_label(node, target_var))}]")
+        if parent_id is not None:
+            lines.append(f"\t{parent_id} -> {node_id} [label={_quote(label)}]")
+        if not node["leaf"] and not collapse:
+            for value, child in reversed(list(node["branches"].items())):
+                stack.append((child, node_id, edge_label(node, value), depth + 1))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def render_key(source, fmt):
+    """Cache-Schlüssel: Hash des DOT-Quelltexts und des Formats."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fmt.encode("ascii"))
+    digest.update(source.encode("utf-8"))
+    return RENDER_PREFIX + digest.hexdigest()
+
+def _read_render(entry_dir, fmt):
+    try:
+        with open(os.path.join(entry_dir, f"baum.{fmt}"), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # Zugriffszeit für die LRU-Verdrängung festhalten
+    now = time.time()
+    try:
+        os.utime(os.path.join(entry_dir, META_FILE), (now, now))
+    except OSError:
+        pass
+    return data
+
+def _write_render(entry_dir, fmt, data):
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix=".tmp-")
+    try:
+        with open(os.path.join(tmp_dir, f"baum.{fmt}"), "wb") as f:
+            f.write(data)
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"format": fmt, "bytes": len(data)}, f)
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def render_tree(tree, target_var, fmt="svg", max_depth=None, min_samples=0, dpi=None,
+                use_cache=True, cache_dir=None):
+    """
+    Rendert den Baum im Speicher und liefert die Bytes der Grafik.
+    Löst graphviz.ExecutableNotFound aus, wenn Graphviz nicht installiert ist.
+    """
+    import graphviz
+    from dataset_cache import cache_enabled, default_cache_dir, default_max_bytes, evict
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"Nicht unterstütztes Format '{fmt}', erlaubt: {', '.join(RENDER_FORMATS)}")
+    source = tree_to_dot(tree, target_var, max_depth=max_depth, min_samples=min_samples, dpi=dpi)
+    if not use_cache or not cache_enabled():
+        return graphviz.Source(source).pipe(format=fmt)
+
+    cache_dir = cache_dir or default_cache_dir()
+    entry_dir = os.path.join(cache_dir, render_key(source, fmt))
+    data = _read_render(entry_dir, fmt)
+    if data is not None:
+        return data
+    data = graphviz.Source(source).pipe(format=fmt)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_render(entry_dir, fmt, data)
+        evict(cache_dir, default_max_bytes())
+    except OSError:
+        pass
+    return data
+
+def write_tree_image(tree, target_var, filename, fmt=None, **options):
+    """
+    Rendert den Baum und schreibt die Grafik nach filename. Ohne fmt wird das Format
+    aus der Dateiendung bestimmt. Liefert den Dateinamen.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(filename)[1].lstrip(".").lower()
+    data = render_tree(tree, target_var, fmt=fmt, **options)
+    with open(filename, "wb") as f:
+        f.write(data)
+    return filename
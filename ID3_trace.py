@@ -0,0 +1,217 @@
+"""
+Messwerte je Knoten beim Aufbau des ID3-Baums.
+
+    with BuildTrace() as trace:
+        tree = build_id3_tree(df, attributes, target_var, verbosity=0)
+    trace.save_json("trace.json")          # strukturierte Daten je Knoten
+    trace.save_chrome_trace("trace.ctf")   # für chrome://tracing bzw. Perfetto
+
+Je Knoten werden festgehalten: Tiefe, Zeilen, Gesamtzeit des Teilbaums, Zeit im Knoten
+selbst (ohne Unterbäume), Zeit je bewertetem Attribut, Anzahl der angelegten Teilmengen
+(Zeilenindizes bzw. Teiltabellen für die Ausgabe) und deren Größe in Bytes. Die Zeit im
+Knoten abzüglich der Bewertung ist bei build_id3_tree mit Ausgabe im Wesentlichen die
+Zeit für Formatierung und Ausgabe.
+
+Ohne aktive BuildTrace prüfen die Messpunkte in ID3_core nur active_trace() is None.
+Bei parallelem Aufbau (ID3_parallel) misst jeder Worker seine Teilbäume in einer eigenen
+BuildTrace; export() und merge() hängen sie unter den Knoten des Elternprozesses ein
+(worker: Prozess-ID, im Chrome-Trace eine eigene Spur je Worker). perf_counter ist eine
+systemweite monotone Uhr, die Startzeiten der Worker lassen sich daher direkt umrechnen.
+"""
+import json
+from time import perf_counter
+
+_active = None
+
+def active_trace():
+    """Die gerade aktive BuildTrace oder None."""
+    return _active
+
+class BuildTrace:
+    """
+    Sammelt Messwerte je Knoten, solange sie als Kontextmanager aktiv ist.
+    nodes enthält je Knoten ein Dictionary (siehe Modulbeschreibung).
+    """
+    def __init__(self):
+        self.nodes = []
+        self._stack = []
+        self._origin = perf_counter()
+        self._previous = None
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self
+        self._origin = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        global _active
+        _active = self._previous
+        return False
+
+    # --- Messpunkte (aufgerufen aus ID3_core und walkthrough) ----------------
+
+    def begin_node(self, num_rows):
+        parent = self._stack[-1] if self._stack else None
+        record = {
+            "id": len(self.nodes),
+            "parent": parent["id"] if parent else None,
+            "depth": len(self._stack),
+            "rows": int(num_rows),
+            "start_s": perf_counter() - self._origin,
+            "total_s": 0.0,
+            "self_s": 0.0,
+            "children_s": 0.0,
+            "score_s": {},
+            "scores": [],
+            "materialisations": 0,
+            "bytes": 0,
+            "attribute": None,
+            "leaf": None,
+            "worker": None,
+        }
+        self.nodes.append(record)
+        self._stack.append(record)
+        return record
+
+    def end_node(self, record, node):
+        record["total_s"] = perf_counter() - self._origin - record["start_s"]
+        record["self_s"] = record["total_s"] - record.pop("children_s")
+        if node is not None:
+            record["leaf"] = node["leaf"]
+            record["attribute"] = node.get("attribute")
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1]["children_s"] += record["total_s"]
+
+    def scored(self, attribute, start, seconds, nbytes=0):
+        if not self._stack:
+            return
+        record = self._stack[-1]
+        record["score_s"][attribute] = record["score_s"].get(attribute, 0.0) + seconds
+        record["scores"].append((attribute, start - self._origin, seconds))
+        record["bytes"] += int(nbytes)
+
+    def materialised(self, nbytes):
+        if not self._stack:
+            return
+        record = self._stack[-1]
+        record["materialisations"] += 1
+        record["bytes"] += int(nbytes)
+
+    # --- Zusammenführen (paralleler Aufbau) -----------------------------------
+
+    def export(self):
+        """Knoten und Zeitnullpunkt zur Übergabe an merge() (picklebar)."""
+        return {"nodes": self.nodes, "origin": self._origin}
+
+    def merge(self, exported, parent=None, worker=None):
+        """
+        Hängt die Knoten einer anderen BuildTrace (export()) unter den Knoten parent ein;
+        Nummern, Tiefe und Startzeiten werden umgerechnet.
+        """
+        base = len(self.nodes)
+        depth = parent["depth"] + 1 if parent is not None else 0
+        offset = exported["origin"] - self._origin
+        for record in exported["nodes"]:
+            record = dict(record)
+            record["id"] += base
+            if record["parent"] is not None:
+                record["parent"] += base
+            elif parent is not None:
+                record["parent"] = parent["id"]
+            record["depth"] += depth
+            record["start_s"] += offset
+            record["scores"] = [(attribute, start + offset, seconds)
+                                for attribute, start, seconds in record["scores"]]
+            if worker is not None:
+                record["worker"] = worker
+            self.nodes.append(record)
+
+    def extend_totals(self):
+        """
+        Dehnt total_s jedes Knotens bis zum Ende seines letzten Nachfahren aus. Nötig,
+        wenn Teilbäume erst nach dem Ende ihres Elternknotens gebaut wurden (merge).
+        """
+        end = [record["start_s"] + record["total_s"] for record in self.nodes]
+        for record in reversed(self.nodes):
+            if record["parent"] is not None:
+                end[record["parent"]] = max(end[record["parent"]], end[record["id"]])
+        for record in self.nodes:
+            record["total_s"] = end[record["id"]] - record["start_s"]
+
+    # --- Auswertung und Export --------------------------------------------------
+
+    def summary(self):
+        """Kennzahlen über alle Knoten."""
+        score_s = {}
+        for record in self.nodes:
+            for attribute, seconds in record["score_s"].items():
+                score_s[attribute] = score_s.get(attribute, 0.0) + seconds
+        roots = [record for record in self.nodes if record["parent"] is None]
+        return {
+            "nodes": len(self.nodes),
+            "leaves": sum(1 for record in self.nodes if record["leaf"]),
+            "max_depth": max((record["depth"] for record in self.nodes), default=0),
+            "total_s": sum(record["total_s"] for record in roots),
+            "score_s": score_s,
+            "other_s": sum(record["self_s"] - sum(record["score_s"].values()) for record in self.nodes),
+            "materialisations": sum(record["materialisations"] for record in self.nodes),
+            "bytes": sum(record["bytes"] for record in self.nodes),
+        }
+
+    def to_dict(self):
+        nodes = [{key: value for key, value in record.items() if key != "scores"}
+                 for record in self.nodes]
+        return {"summary": self.summary(), "nodes": nodes}
+
+    def save_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1, default=str)
+
+    def chrome_events(self):
+        """Ereignisse im Chrome-Trace-Format (Zeiten in Mikrosekunden)."""
+        events = []
+        for record in self.nodes:
+            name = f"{record['attribute']}" if record["attribute"] is not None else "Blatt"
+            tid = record["worker"] or 1
+            events.append({
+                "name": name, "cat": "knoten", "ph": "X", "pid": 1, "tid": tid,
+                "ts": record["start_s"] * 1e6, "dur": record["total_s"] * 1e6,
+                "args": {"id": record["id"], "depth": record["depth"], "rows": record["rows"],
+                         "self_ms": record["self_s"] * 1e3,
+                         "materialisations": record["materialisations"],
+                         "bytes": record["bytes"]},
+            })
+            for attribute, start, seconds in record["scores"]:
+                events.append({
+                    "name": f"Gewinn {attribute}", "cat": "bewertung", "ph": "X", "pid": 1,
+                    "tid": tid, "ts": start * 1e6, "dur": seconds * 1e6,
+                    "args": {"node": record["id"]},
+                })
+        return events
+
+    def save_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f,
+                      ensure_ascii=False, default=str)
+
+    def save(self, path, fmt="json"):
+        """Speichert als "json" (save_json) oder "chrome" (save_chrome_trace)."""
+        if fmt == "chrome":
+            self.save_chrome_trace(path)
+        elif fmt == "json":
+            self.save_json(path)
+        else:
+            raise ValueError(f"Unbekanntes Format '{fmt}', erlaubt: json, chrome")
+
+    def format_summary(self):
+        summary = self.summary()
+        lines = [f"Profil: {summary['nodes']} Knoten ({summary['leaves']} Blätter), "
+                 f"Tiefe {summary['max_depth']}, {summary['total_s']:.4f} s, "
+                 f"{summary['materialisations']} Teilmengen, {summary['bytes'] / 2**20:.1f} MB"]
+        for attribute, seconds in sorted(summary["score_s"].items(), key=lambda item: -item[1]):
+            lines.append(f"  Bewertung {attribute}: {seconds:.4f} s")
+        lines.append(f"  Übrige Zeit in den Knoten (Aufteilen, Ausgabe): {summary['other_s']:.4f} s")
+        return "\n".join(lines)
@@ -1,89 +1,45 @@
-import os
+import argparse
+import json
 import sys
-import numpy as np
-import pandas as pd
+# pandas und numpy (über data_loader, NaiveBayes_model und walkthrough) werden erst in
+# den Funktionen importiert, die sie brauchen
+from dm_common import print_green, print_red, select_file, select_target_variable
 
-def print_green(*args, **kwargs):
-    GREEN = "\033[92m"
-    END = "\033[0m"
-    sep = kwargs.pop("sep", " ")
-    end = kwargs.pop("end", "\n")
-    message = sep.join(str(arg) for arg in args)
-    sys.stdout.write(GREEN + message + END + end)
-    sys.stdout.flush()
-
-def print_red(*args, **kwargs):
-    RED = "\033[91m"
-    END = "\033[0m"
-    sep = kwargs.pop("sep", " ")
-    end = kwargs.pop("end", "\n")
-    file = kwargs.pop("file", sys.stdout)
-    message = sep.join(str(arg) for arg in args)
-    file.write(RED + message + END + end)
-    file.flush()
-
-def input_lightblue(prompt):
-    LIGHTBLUE = "\033[94m"
-    END = "\033[0m"
-    return input(LIGHTBLUE + prompt + END)
-
-def select_file():
-    while True:
-        print_green("Naive Bayes - Eingabedatei laden\n")
-        filename = input("Bitte Quell-Datei angeben (CSV oder Excel): ").strip()
-        if not os.path.exists(filename):
-            print_red("Fehler: Datei nicht gefunden.\n")
-            continue
-        if not os.access(filename, os.R_OK):
-            print_red("Fehler: Datei nicht lesbar.\n")
-            continue
-        return filename
-
-def select_target_variable(df):
-    print_green("\nNaive Bayes - Zielvariable auswählen\n")
-    while True:
-        # Prüfen, ob genügend Spalten vorhanden sind
-        if len(df.columns) <= 1:
-            print_red("Nicht genügend Elemente gefunden, bitte Quelldatei überprüfen")
-            sys.exit(1)
-        print("Gefundene Variablen:")
-        for idx, col in enumerate(df.columns):
-            print(f"  {idx}: {col}")
-        try:
-            target_index = int(input("Bitte Zielvariable auswählen: "))
-            target_var = df.columns[target_index]
-            return target_var
-        except (IndexError, ValueError) as e:
-            print_red("Ungültige Eingabe für die Zielvariable:")
+def print_steps(steps):
+    """
+    Gibt Rechenschritte (siehe walkthrough.py) im Terminal aus.
+    Liefert die Daten der "result"-Schritte.
+    """
+    from walkthrough import step_lines
+    results = []
+    for step in steps:
+        for highlight, text in step_lines(step):
+            if highlight:
+                print_green(text)
+            else:
+                print(text)
+        if step.kind == "result":
+            results.append(step.data)
+    return results
 
-def print_relative_frequencies(df, target_var):
+def print_relative_frequencies(df, target_var, model=None):
     """
     Gibt für alle Attribute (außer der Zielvariable) eine kompakte Tabelle aus.
-    Der Header zeigt z. B. "Play: yes(3) | no(5)" – also die Gesamtanzahl je Zielklasse.
-    Für jedes Attribut wird für jeden Attributswert eine Zeile ausgegeben, z. B.:
+    Der Header zeigt z. B. "Play: yes(3) | no(5)" – also die Gesamtanzahl je Zielklasse.
+    Für jedes Attribut wird für jeden Attributswert eine Zeile ausgegeben, z. B.:
       Outlook(sunny)    | 0/3 | 3/5
       Outlook(overcast) | 3/3 | 2/5
       Temp(high)        | 1/3 | 1/5
       Temp(medium)      | 1/3 | 2/5
       Temp(cold)        | 1/3 | 2/5
+    model: mit fit_naive_bayes gezählte Tabellen (sonst werden sie aus df gezählt).
     """
-    classes = sorted(df[target_var].unique())
-    total_counts = {cls: df[df[target_var] == cls].shape[0] for cls in classes}
-    header = f"{target_var}: " + " | ".join(f"{cls}({total_counts[cls]})" for cls in classes)
-    print_green("\nRelative Häufigkeiten für alle Attribute:\n")
-    print(header)
-    print("-" * len(header))
-    for attribute in df.columns:
-        if attribute == target_var:
-            continue
-        unique_values = sorted(df[attribute].unique())
-        for val in unique_values:
-            row_label = f"{attribute}({val})"
-            row_values = []
-            for cls in classes:
-                count = df[(df[attribute] == val) & (df[target_var] == cls)].shape[0]
-                row_values.append(f"{count}/{total_counts[cls]}")
-            print(f"{row_label:<20} | " + " | ".join(row_values))
+    from walkthrough import frequency_steps
+    print_steps(frequency_steps(df, target_var, model=model))
+
+def export_frequencies(model, path):
+    """Schreibt die Häufigkeiten aller Attributwerte als CSV (siehe NaiveBayesModel.frequency_table)."""
+    model.frequency_table().to_csv(path, index=False)
 
 def select_new_sample(df, target_var):
     sample = {}
@@ -104,124 +60,212 @@ def select_new_sample(df, target_var):
                 print_red("Ungültige Eingabe...")
     return sample
 
-def compute_likelihoods_and_posteriors(df, target_var, sample):
-    """
-    Berechnet für jede Zielklasse die Likelihood als Produkt der bedingten Wahrscheinlichkeiten.
-    """
-    classes = sorted(df[target_var].unique())
+def _collect_likelihoods(steps, verbose):
     likelihoods = {}
     details = {}
-    total_samples = len(df)
-    print_green("\nBerechnung der Likelihoods:\n")
-    for cls in classes:
-        total_cls = df[df[target_var] == cls].shape[0]
-        likelihood = 1.0
-        cls_details = []
-        for attribute, value in sample.items():
-            count = df[(df[attribute] == value) & (df[target_var] == cls)].shape[0]
-            frac = f"{count}/{total_cls}"
-            cls_details.append(frac)
-            likelihood *= (count / total_cls) if total_cls > 0 else 0
-        # Prior: relative Häufigkeit der Klasse (ohne Laplace)
-        prior_frac = f"{total_cls}/{total_samples}"
-        cls_details.append(prior_frac)
-        likelihood *= (total_cls / total_samples)
-        details[cls] = cls_details
-        detail_str = " * ".join(cls_details)
-        print(f"Likelihood: {target_var}({cls}) = {detail_str} = {likelihood:.4f}")
-        likelihoods[cls] = likelihood
+    for step in steps:
+        if verbose:
+            print_steps([step])
+        if step.kind == "likelihood":
+            likelihoods[step.data["class"]] = step.data["value"]
+            details[step.data["class"]] = step.data["details"]
     return likelihoods, details
 
-def compute_likelihoods_and_posteriors_laplace(df, target_var, sample, smoothing=1):
+def compute_likelihoods_and_posteriors(df, target_var, sample, verbose=True, model=None):
+    """
+    Berechnet für jede Zielklasse die Likelihood als Produkt der bedingten Wahrscheinlichkeiten.
+    model: mit fit_naive_bayes gezählte Tabellen (sonst werden sie aus df gezählt).
+    """
+    from walkthrough import likelihood_steps
+    return _collect_likelihoods(likelihood_steps(df, target_var, sample, model=model), verbose)
+
+def compute_likelihoods_and_posteriors_laplace(df, target_var, sample, smoothing=1, verbose=True,
+                                               model=None):
     """
     Berechnet die Likelihoods mit LaPlace-Korrektur.
     """
-    classes = sorted(df[target_var].unique())
-    likelihoods = {}
-    details = {}
-    total_samples = len(df)
-    num_classes = len(classes)
-    print_green("\nBerechnung der Likelihoods mit LaPlace:\n")
-    # Ausgabe für jedes Attribut im Sample:
-    for attribute in sample.keys():
-        V = df[attribute].nunique()
-        print_green(f"{attribute}: {V} Ausprägungen - addiere 1/{V}")
-    print("\n")
-    for cls in classes:
-        total_cls = df[df[target_var] == cls].shape[0]
-        cls_details = []
-        for attribute, value in sample.items():
-            V = df[attribute].nunique()
-            count = df[(df[attribute] == value) & (df[target_var] == cls)].shape[0]
-            frac_str = f"({count}+1)/({total_cls}+{V})"
-            cls_details.append(frac_str)
-        # Prior
-        prior_frac = f"{total_cls}/{total_samples}"
-        cls_details.append(prior_frac)
-        details[cls] = cls_details
-        # Berechne den tatsächlichen Wert:
-        likelihood = 1.0
-        for attribute, value in sample.items():
-            V = df[attribute].nunique()
-            count = df[(df[attribute] == value) & (df[target_var] == cls)].shape[0]
-            prob = (count + smoothing) / (total_cls + smoothing * V) if total_cls > 0 else 0
-            likelihood *= prob
-        prior = total_cls / total_samples
-        likelihood *= prior
-        likelihoods[cls] = likelihood
-        detail_str = " * ".join(cls_details)
-        print(f"Likelihood: {target_var}({cls}) mit LaPlace: {detail_str} = {likelihood:.4f}")
-    return likelihoods, details
+    from walkthrough import likelihood_steps
+    return _collect_likelihoods(likelihood_steps(df, target_var, sample, laplace=True,
+                                                 smoothing=smoothing, model=model), verbose)
 
-def compute_normalized_posteriors(likelihoods, target_var):
-    total = sum(likelihoods.values())
+def compute_normalized_posteriors(likelihoods, target_var, verbose=True):
+    from walkthrough import posterior_steps
     normalized = {}
-    print_green("\nBerechnung der normalisierten Wahrscheinlichkeiten:\n")
-    parts = " + ".join(f"{likelihoods[cls]:.4f}" for cls in sorted(likelihoods.keys()))
-    for cls in sorted(likelihoods.keys()):
-        norm = likelihoods[cls] / total if total != 0 else 0
-        normalized[cls] = norm
-    for cls in sorted(likelihoods.keys()):
-        if total == 0:
-            print(f"Wahrscheinlichkeit: {target_var}({cls}) = 0 (keine Wahrscheinlichkeit berechenbar)")
-        else:
-            print(f"Wahrscheinlichkeit: {target_var}({cls}) = {likelihoods[cls]:.4f} / ({parts}) = {normalized[cls]:.2f} entspricht {normalized[cls]*100:.0f}%")
+    for step in posterior_steps(likelihoods, target_var):
+        if verbose:
+            print_steps([step])
+        normalized = step.data["normalized"]
     return normalized
 
-def main():
+def parse_sample(df, target_var, assignments):
+    """
+    Wandelt Angaben der Form "Attribut=Wert" in ein Sample-Dictionary um.
+    Die Werte werden gegen die Ausprägungen in den Trainingsdaten geprüft.
+    """
+    sample = {}
+    for assignment in assignments:
+        attribute, sep, value = assignment.partition("=")
+        attribute, value = attribute.strip(), value.strip()
+        if not sep or attribute not in df.columns or attribute == target_var:
+            raise ValueError(f"Ungültige Angabe für ein Attribut: '{assignment}'")
+        # Wert mit dem Datentyp der Spalte abgleichen (z. B. Zahlen)
+        matches = [val for val in df[attribute].unique() if str(val) == value]
+        if not matches:
+            raise ValueError(f"Wert '{value}' kommt im Attribut '{attribute}' nicht vor")
+        sample[attribute] = matches[0]
+    return sample
+
+def run_naive_bayes(filename, target_var, sample, output=None, laplace="auto", verbosity=0,
+                    use_cache=True, frequencies_path=None):
+    """
+    Nicht-interaktiver Durchlauf (ohne Eingaben): Datei laden, Likelihoods und
+    normalisierte Wahrscheinlichkeiten für das Sample berechnen.
+    sample: Dictionary {Attribut: Wert} oder Liste von "Attribut=Wert"-Angaben.
+    laplace: "auto" (nur bei 0% oder 100%), "always" oder "never".
+    use_cache: kodierten Datensatz im Cache ablegen bzw. von dort laden (dataset_cache).
+    frequencies_path: Häufigkeiten aller Attributwerte zusätzlich als CSV speichern.
+    Liefert ein Dictionary mit den Ergebnissen; optional als JSON nach output geschrieben.
+    """
+    from data_loader import load_file
+    from NaiveBayes_model import fit_naive_bayes
+    df = load_file(filename, verbose=verbosity >= 1, use_cache=use_cache)
+    if target_var not in df.columns:
+        raise ValueError(f"Zielvariable '{target_var}' nicht gefunden. Vorhanden: {list(df.columns)}")
+    if not isinstance(sample, dict):
+        sample = parse_sample(df, target_var, sample)
+
+    verbose = verbosity >= 2
+    model = fit_naive_bayes(df, target_var)
+    if frequencies_path:
+        export_frequencies(model, frequencies_path)
+    if verbose:
+        print_relative_frequencies(df, target_var, model=model)
+    likelihoods, _ = compute_likelihoods_and_posteriors(df, target_var, sample, verbose=verbose,
+                                                        model=model)
+    posteriors = compute_normalized_posteriors(likelihoods, target_var, verbose=verbose)
+    result = {"target": target_var, "sample": sample, "posteriors": posteriors}
+
+    if laplace == "always" or (laplace == "auto" and any(p == 0 or p == 1 for p in posteriors.values())):
+        laplace_likelihoods, _ = compute_likelihoods_and_posteriors_laplace(df, target_var, sample, verbose=verbose,
+                                                                            model=model)
+        result["laplace_posteriors"] = compute_normalized_posteriors(laplace_likelihoods, target_var, verbose=verbose)
+
+    if verbosity >= 1:
+        print_green("\nErgebnis:\n")
+        for cls in sorted(posteriors.keys()):
+            print(f"{target_var}({cls}): {posteriors[cls]*100:.0f}%")
+        if "laplace_posteriors" in result:
+            print_green("\nErgebnis mit LaPlace-Korrektur:\n")
+            for cls in sorted(result["laplace_posteriors"].keys()):
+                print(f"{target_var}({cls}): {result['laplace_posteriors'][cls]*100:.0f}%")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+    return result
+
+def run_naive_bayes_predict(filename, target_var, predict_file, output=None, smoothing=1,
+                            chunksize=100000, verbosity=0, use_cache=True, frequencies_path=None,
+                            train_files=(), jobs=1):
+    """
+    Batch-Vorhersage: Modell aus filename zählen und alle Fälle aus predict_file
+    (blockweise, im Logarithmus) bewerten. Die Wahrscheinlichkeiten je Klasse und die
+    Vorhersage werden als CSV nach output geschrieben (Standard: Ausgabe).
+    smoothing: LaPlace-Korrektur (0 = ohne). Liefert die Anzahl der bewerteten Fälle.
+    frequencies_path: Häufigkeiten aller Attributwerte zusätzlich als CSV speichern.
+    train_files: weitere Trainingsdateien; alle Dateien werden dann blockweise gezählt
+                 (bei jobs > 1 parallel) und die Zähltabellen zusammengeführt.
+    """
+    from data_loader import load_file
+    from NaiveBayes_model import fit_naive_bayes, fit_naive_bayes_files, predict_csv
+    if train_files:
+        model = fit_naive_bayes_files([filename, *train_files], target_var, chunksize=chunksize,
+                                      processes=jobs)
+    else:
+        df = load_file(filename, verbose=verbosity >= 1, use_cache=use_cache)
+        model = fit_naive_bayes(df, target_var)
+    if frequencies_path:
+        export_frequencies(model, frequencies_path)
+    rows = predict_csv(model, predict_file, output if output else sys.stdout,
+                       smoothing=smoothing, chunksize=chunksize)
+    if verbosity >= 1 and output:
+        print_green(f"\n{rows} Fälle bewertet, gespeichert in {output}")
+    return rows
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Naive Bayes - Wahrscheinlichkeiten Schritt für Schritt. "
+                    "Ohne Quell-Datei startet der interaktive Modus."
+    )
+    parser.add_argument("datei", nargs="?", help="Quell-Datei (CSV oder Excel)")
+    parser.add_argument("-t", "--target", help="Name der Zielvariable (Pflicht im Batch-Modus)")
+    parser.add_argument("-s", "--sample", action="append", default=[], metavar="ATTRIBUT=WERT",
+                        help="Fallwert für ein Attribut, mehrfach angebbar")
+    parser.add_argument("-o", "--output",
+                        help="Ergebnis als JSON speichern (mit --predict: Vorhersagen als CSV)")
+    parser.add_argument("--frequencies", metavar="DATEI",
+                        help="Häufigkeiten aller Attributwerte je Klasse als CSV speichern")
+    parser.add_argument("--predict", metavar="DATEI",
+                        help="Alle Fälle dieser Datei bewerten (Wahrscheinlichkeiten und Vorhersage)")
+    parser.add_argument("--train", action="append", default=[], metavar="DATEI",
+                        help="Weitere Trainingsdatei für --predict (mehrfach möglich, blockweise gezählt)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Anzahl paralleler Prozesse zum Zählen der Trainingsdateien")
+    parser.add_argument("--smoothing", type=float, default=1,
+                        help="LaPlace-Korrektur für --predict (Standard: 1, 0 = ohne)")
+    parser.add_argument("--chunksize", type=int, default=100000,
+                        help="Zeilen je Block beim Lesen von --predict (Standard: 100000)")
+    parser.add_argument("--laplace", choices=["auto", "always", "never"], default="auto",
+                        help="LaPlace-Korrektur anwenden (Standard: auto, nur bei 0%% oder 100%%)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Datei immer neu einlesen, ohne Cache (siehe dataset_cache.py)")
+    parser.add_argument("-v", "--verbosity", type=int, choices=[0, 1, 2], default=1,
+                        help="0 = still, 1 = Ergebnis, 2 = alle Rechenschritte (Standard: 1)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.datei is not None:
+        # Batch-Modus: keine Eingaben, keine Pausen
+        if args.target is None:
+            print_red("Im Batch-Modus muss die Zielvariable mit --target angegeben werden.")
+            sys.exit(2)
+        try:
+            if args.predict:
+                run_naive_bayes_predict(args.datei, args.target, args.predict, output=args.output,
+                                        smoothing=args.smoothing, chunksize=args.chunksize,
+                                        verbosity=args.verbosity if args.output else 0,
+                                        use_cache=not args.no_cache,
+                                        frequencies_path=args.frequencies,
+                                        train_files=args.train, jobs=args.jobs)
+                return
+            run_naive_bayes(args.datei, args.target, args.sample, output=args.output,
+                            laplace=args.laplace, verbosity=args.verbosity,
+                            use_cache=not args.no_cache, frequencies_path=args.frequencies)
+        except (OSError, TypeError, ValueError) as e:
+            print_red(f"Fehler: {e}")
+            sys.exit(1)
+        return
+
     try:
         # Schritt 1: Quelldatei laden
-        filename = select_file()
-        _, ext = os.path.splitext(filename)
-        ext = ext.lower()
-
-        if ext == ".csv":
-            print(f"CSV-Datei erkannt. Lade CSV-Datei...")
-            df = pd.read_csv(filename, sep=None, engine='python')
-            # trim columns
-            df.columns = df.columns.str.strip()
-            # trim values
-            for col in df.select_dtypes(include=['object']).columns:
-                df[col] = df[col].str.strip()
-        elif ext in [".xls", ".xlsx"]:
-            print("Excel-Datei erkannt. Lade Excel-Datei...")
-            df = pd.read_excel(filename)
-            # trim columns
-            df.columns = df.columns.str.strip()
-            # trim values
-            for col in df.select_dtypes(include=['object']).columns:
-                df[col] = df[col].str.strip()
-        else:
+        filename = select_file("Naive Bayes - Eingabedatei laden\n")
+        from data_loader import load_file
+        from NaiveBayes_model import fit_naive_bayes
+        from walkthrough import naive_bayes_steps
+        try:
+            df = load_file(filename, use_cache=True)
+        except ValueError:
             print_red("Nicht unterstütztes Dateiformat!")
             return
-        print("Datei wurde erfolgreich geladen!")
 
         # Schritt 2: Zielvariable auswählen
-        target_var = select_target_variable(df)
+        target_var = select_target_variable(df, "\nNaive Bayes - Zielvariable auswählen\n")
         print(f"Zielvariable ausgewählt: '{target_var}'")
 
-        # Schritt 3: Tabelle der relativen Häufigkeiten ausgeben
-        print_relative_frequencies(df, target_var)
+        # Schritt 3: Tabelle der relativen Häufigkeiten ausgeben (aus den Zähltabellen)
+        model = fit_naive_bayes(df, target_var)
+        print_relative_frequencies(df, target_var, model=model)
 
         # Schritt 4: Neue Fallwerte eingeben
         sample = select_new_sample(df, target_var)
@@ -229,23 +273,10 @@ def main():
         for attr, val in sample.items():
             print(f"{attr}: {val}")
 
-        # Schritt 5: Likelihoods berechnen
-        likelihoods, details = compute_likelihoods_and_posteriors(df, target_var, sample)
-
-        # Schritt 6: Normalisierte Wahrscheinlichkeiten berechnen
-        posteriors = compute_normalized_posteriors(likelihoods, target_var)
-
-        print_green("\nErgebnis:\n")
-        for cls in sorted(posteriors.keys()):
-            print(f"{target_var}({cls}): {posteriors[cls]*100:.0f}%")
-
-        # Schritt 7: Falls 0% oder 100% auftritt, Laplace-Korrektur anwenden
-        if any(p == 0 or p == 1 for p in posteriors.values()):
-            laplace_likelihoods, laplace_details = compute_likelihoods_and_posteriors_laplace(df, target_var, sample)
-            laplace_posteriors = compute_normalized_posteriors(laplace_likelihoods, target_var)
-            print_green("\nErgebnis mit LaPlace-Korrektur:\n")
-            for cls in sorted(laplace_posteriors.keys()):
-                print(f"{target_var}({cls}): {laplace_posteriors[cls]*100:.0f}%")
+        # Schritt 5-7: Likelihoods, normalisierte Wahrscheinlichkeiten und Ergebnis;
+        # falls 0% oder 100% auftritt, dasselbe mit Laplace-Korrektur
+        results = print_steps(naive_bayes_steps(df, target_var, sample, model=model))
+        if len(results) > 1:
             print("\n")
 
     except KeyboardInterrupt:
@@ -0,0 +1,193 @@
+"""
+k-fache Kreuzvalidierung für Naive Bayes über Zähltabellen.
+
+Statt für jede Faltung ein Modell neu zu zählen und die Testfälle einzeln zu bewerten,
+werden alle Spalten einmal kodiert und in einem bincount-Durchlauf je Attribut die
+Zähltabellen aller Faltungen gezählt (Faltung × Wert × Klasse). Die Tabellen des
+gesamten Datensatzes sind deren Summe; das Trainingsmodell einer Faltung ist die
+Gesamttabelle minus die Tabelle der Faltung. Die Testfälle werden wie bei predict_proba
+im Logarithmus bewertet (log_count_tables, sum_log_likelihoods). Für jede weitere
+LaPlace-Korrektur (smoothing) werden nur die kleinen Log-Tabellen neu berechnet, die
+Daten selbst werden nicht erneut gelesen.
+
+Das Ergebnis ist identisch mit einem Neu-Zählen je Faltung (fit_naive_bayes auf den
+Trainingszeilen): Werte, die in den Trainingszeilen nicht vorkommen, zählen wie
+unbekannte Werte und nicht zu den Ausprägungen (num_values), Klassen ohne Trainingszeilen
+erhalten die Wahrscheinlichkeit 0 und werden nicht vorhergesagt (auch bei smoothing=0).
+Zeilen ohne Zielwert werden nicht verwendet.
+
+    python3 NaiveBayes_eval.py daten.csv -t Play -k 10 --smoothing 0 0.5 1 2 -o cv.json
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from data_loader import load_file
+from NaiveBayes_model import encode_sorted, log_count_tables, normalize_log, sum_log_likelihoods
+
+# Untergrenze für P(wahre Klasse) im Log-Loss, damit eine Wahrscheinlichkeit 0 endlich bleibt
+LOG_LOSS_EPS = 1e-15
+
+def assign_folds(num_rows, folds, seed=0):
+    """Zufällige, möglichst gleich große Faltungen: Faltungsnummer je Zeile."""
+    if not 2 <= folds <= num_rows:
+        raise ValueError(f"Anzahl der Faltungen muss zwischen 2 und {num_rows} liegen, nicht {folds}")
+    fold_of = np.empty(num_rows, dtype=np.intp)
+    fold_of[np.random.default_rng(seed).permutation(num_rows)] = np.arange(num_rows) % folds
+    return fold_of
+
+def fold_count_tables(value_codes, class_codes, fold_of, folds, num_values, num_classes):
+    """Zähltabellen aller Faltungen (Faltung × Wert × Klasse) in einem bincount-Durchlauf."""
+    valid = value_codes >= 0
+    flat = (fold_of[valid] * num_values + value_codes[valid]) * num_classes + class_codes[valid]
+    counts = np.bincount(flat, minlength=folds * num_values * num_classes)
+    return counts.reshape(folds, num_values, num_classes).astype(np.int64)
+
+def evaluate(log_likelihoods, class_codes, num_classes, trained=None):
+    """
+    Kennzahlen für bewertete Fälle: Anzahl richtiger Vorhersagen, Summe des Log-Loss
+    (-log P(wahre Klasse)) und Konfusionsmatrix (Zeilen: wahre, Spalten: vorhergesagte Klasse).
+    trained (Maske je Klasse): nur diese Klassen können vorhergesagt werden, wie bei einem
+    Modell, das die übrigen Klassen nie gesehen hat (auch wenn alle Klassen -inf haben).
+    """
+    candidates = np.arange(num_classes) if trained is None else np.flatnonzero(trained)
+    predicted = candidates[np.argmax(log_likelihoods[:, candidates], axis=1)]
+    p_true = normalize_log(log_likelihoods)[np.arange(len(class_codes)), class_codes]
+    confusion = np.bincount(class_codes * num_classes + predicted,
+                            minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+    return {
+        "correct": int(np.sum(predicted == class_codes)),
+        "log_loss_sum": float(-np.sum(np.log(np.clip(p_true, LOG_LOSS_EPS, 1.0)))),
+        "confusion": confusion,
+    }
+
+def _scores(metrics, rows):
+    return {
+        "rows": rows,
+        "accuracy": metrics["correct"] / rows if rows else float("nan"),
+        "log_loss": metrics["log_loss_sum"] / rows if rows else float("nan"),
+        "confusion": metrics["confusion"].tolist(),
+    }
+
+def cross_validate(df, target_var, folds=5, smoothings=(1,), seed=0, attributes=None):
+    """
+    k-fache Kreuzvalidierung (siehe Modulbeschreibung) für alle Werte in smoothings.
+    Liefert ein Dictionary mit den Klassen und je smoothing Accuracy, Log-Loss und
+    Konfusionsmatrix über alle Testfälle sowie je Faltung ("folds"); "best_smoothing"
+    ist der Wert mit dem kleinsten Log-Loss.
+    """
+    if target_var not in df.columns:
+        raise ValueError(f"Zielvariable '{target_var}' nicht gefunden. Vorhanden: {list(df.columns)}")
+    if attributes is None:
+        attributes = [col for col in df.columns if col != target_var]
+    class_codes, classes = encode_sorted(df[target_var])
+    labelled = class_codes >= 0
+    class_codes = class_codes[labelled]
+    num_rows, num_classes = len(class_codes), len(classes)
+    fold_of = assign_folds(num_rows, folds, seed)
+
+    # Ein Durchlauf über die Daten: Codes und Zähltabellen je Faltung
+    fold_class_counts = np.bincount(fold_of * num_classes + class_codes,
+                                    minlength=folds * num_classes).reshape(folds, num_classes)
+    codes = np.empty((num_rows, len(attributes)), dtype=np.intp)
+    fold_counts = []
+    for j, attribute in enumerate(attributes):
+        value_codes, values = encode_sorted(df[attribute])
+        value_codes = value_codes[labelled]
+        fold_counts.append(fold_count_tables(value_codes, class_codes, fold_of, folds,
+                                             len(values), num_classes))
+        # Code -1 verweist auf die Zeile für unbekannte Werte (len(values))
+        codes[:, j] = np.where(value_codes >= 0, value_codes, len(values))
+    total_class_counts = fold_class_counts.sum(axis=0)
+    total_counts = [counts.sum(axis=0) for counts in fold_counts]
+
+    # Trainingstabellen je Faltung: Gesamt minus Faltung
+    training = []
+    for f in range(folds):
+        counts = [total - per_fold[f] for total, per_fold in zip(total_counts, fold_counts)]
+        num_values = [int(np.count_nonzero(table.sum(axis=1))) for table in counts]
+        test = np.flatnonzero(fold_of == f)
+        training.append((total_class_counts - fold_class_counts[f], counts, num_values,
+                         num_rows - len(test), test))
+
+    results = []
+    for smoothing in smoothings:
+        per_fold = []
+        total = {"correct": 0, "log_loss_sum": 0.0,
+                 "confusion": np.zeros((num_classes, num_classes), dtype=np.int64)}
+        for class_counts, counts, num_values, num_samples, test in training:
+            log_prior, tables = log_count_tables(class_counts, counts, num_values, num_samples,
+                                                 smoothing)
+            metrics = evaluate(sum_log_likelihoods(log_prior, tables, codes[test]),
+                               class_codes[test], num_classes, trained=class_counts > 0)
+            per_fold.append(_scores(metrics, len(test)))
+            for key in total:
+                total[key] = total[key] + metrics[key]
+        results.append({"smoothing": smoothing, **_scores(total, num_rows), "folds": per_fold})
+
+    best = min(results, key=lambda result: result["log_loss"]) if results else None
+    return {
+        "target": target_var,
+        "classes": list(classes),
+        "folds": folds,
+        "seed": seed,
+        "rows": num_rows,
+        "results": results,
+        "best_smoothing": best["smoothing"] if best else None,
+    }
+
+def format_report(result, per_fold=False):
+    """Text-Zusammenfassung von cross_validate, optional mit Kennzahlen je Faltung."""
+    lines = [f"{result['folds']}-fache Kreuzvalidierung, {result['rows']} Zeilen, "
+             f"Zielvariable '{result['target']}'"]
+    for entry in result["results"]:
+        lines.append(f"  smoothing {entry['smoothing']:g}: Accuracy {entry['accuracy']:.4f}, "
+                     f"Log-Loss {entry['log_loss']:.4f}")
+        if per_fold:
+            for f, fold in enumerate(entry["folds"]):
+                lines.append(f"    Faltung {f + 1}: {fold['rows']} Zeilen, Accuracy "
+                             f"{fold['accuracy']:.4f}, Log-Loss {fold['log_loss']:.4f}")
+    best = next((entry for entry in result["results"]
+                 if entry["smoothing"] == result["best_smoothing"]), None)
+    if best is not None:
+        lines.append(f"Kleinster Log-Loss mit smoothing {best['smoothing']:g}; "
+                     f"Konfusionsmatrix (Zeilen: wahr, Spalten: vorhergesagt):")
+        width = max(len(str(value)) for value in result["classes"] + [
+            count for row in best["confusion"] for count in row])
+        lines.append("  " + " " * width + " " + " ".join(f"{cls!s:>{width}}" for cls in result["classes"]))
+        for cls, row in zip(result["classes"], best["confusion"]):
+            lines.append(f"  {cls!s:>{width}} " + " ".join(f"{count:>{width}}" for count in row))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kreuzvalidierung für Naive Bayes über Zähltabellen")
+    parser.add_argument("datei", help="Quell-Datei (CSV oder Excel)")
+    parser.add_argument("-t", "--target", required=True, help="Name der Zielvariable")
+    parser.add_argument("-k", "--folds", type=int, default=5, help="Anzahl der Faltungen (Standard: 5)")
+    parser.add_argument("--smoothing", type=float, nargs="+", default=[1],
+                        help="Zu vergleichende LaPlace-Korrekturen (Standard: 1, 0 = ohne)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für die Faltungen (Standard: 0)")
+    parser.add_argument("-o", "--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Datei immer neu einlesen, ohne Cache (siehe dataset_cache.py)")
+    parser.add_argument("-v", "--verbosity", type=int, choices=[0, 1, 2], default=1,
+                        help="0 = still, 1 = Zusammenfassung, 2 = auch je Faltung (Standard: 1)")
+    args = parser.parse_args(argv)
+
+    try:
+        df = load_file(args.datei, verbose=False, use_cache=not args.no_cache)
+        result = cross_validate(df, args.target, folds=args.folds, smoothings=args.smoothing,
+                                seed=args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.verbosity >= 1:
+        print(format_report(result, per_fold=args.verbosity >= 2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Naive-Bayes-Modell mit vorab gezählten Tabellen.
+
+fit_naive_bayes zählt einmalig die Klassenhäufigkeiten und je Attribut eine Zähltabelle
+(Attributwert × Klasse): die Spalte wird einmal kodiert (factorize) und in einem
+bincount-Durchlauf gezählt, statt für jede Kombination aus Wert und Klasse eine Maske
+über den ganzen DataFrame zu bilden. Die Likelihood eines Samples ist danach ein
+Nachschlagen in diesen Tabellen, der Aufwand hängt nicht von der Größe der
+Trainingsdaten ab. Die Bruchdarstellungen der Schritt-für-Schritt-Ausgabe
+("3/9", "(3+1)/(9+3)") werden aus denselben Tabellen erzeugt.
+
+Klassen und Werte sind wie in NaiveBayes.py sortiert (sorted(df[...].unique())).
+Die Tabelle der relativen Häufigkeiten (print_relative_frequencies) wird ebenfalls aus
+den Zähltabellen abgelesen; frequency_table liefert sie als DataFrame (z. B. für CSV).
+
+Für viele Fälle auf einmal (predict_proba, predict_csv) wird im Logarithmus gerechnet:
+aus den Zähltabellen entstehen einmal Tabellen log P(Wert | Klasse) mit LaPlace-Korrektur
+(smoothing), die Log-Likelihood aller Zeilen und Klassen ist dann eine Summe über
+nachgeschlagene Tabellenzeilen. Normalisiert wird mit log-sum-exp, so dass auch bei
+sehr vielen Attributen nichts auf 0 unterläuft. predict_csv liest und schreibt dabei
+blockweise, die Eingabedatei muss nicht in den Speicher passen.
+
+Zähltabellen lassen sich addieren: merge vereinigt die (sortierten) Wörterbücher beider
+Modelle und addiert die Tabellen, partial_fit zählt einen weiteren Datenblock hinzu.
+Damit können Dateien blockweise (fit_naive_bayes_csv) und mehrere Dateien parallel in
+eigenen Prozessen (fit_naive_bayes_files) gezählt und danach zusammengeführt werden,
+ohne je alle Daten auf einmal zu laden. Da nur ganze Zahlen addiert werden, ist das
+Ergebnis identisch mit einem Modell aus allen Daten auf einmal. Damit die Wörterbücher
+aller Blöcke denselben Typ haben, werden CSV-Blöcke als Text gelesen und die Typen erst
+für die ganze Datei bestimmt; merge führt Text und Zahlen gemeinsam als Text zusammen.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (
+    as_number, as_text, load_file, parse_text_values, read_csv_chunks, value_kind,
+)
+
+def encode_sorted(series):
+    """
+    Kodiert eine Spalte mit sortierten Werten. Liefert (Codes, Werte); fehlende Werte
+    erhalten den Code -1.
+    """
+    codes, uniques = pd.factorize(series)
+    values = sorted(uniques)
+    position = {value: k for k, value in enumerate(values)}
+    # Der angehängte Eintrag -1 bildet den Code -1 (fehlender Wert) auf sich selbst ab
+    lookup = np.array([position[value] for value in uniques] + [-1], dtype=np.intp)
+    return lookup[codes], values
+
+VALUE_CASTS = {"text": as_text, "number": as_number}
+
+def count_table(value_codes, class_codes, num_values, num_classes):
+    """Zähltabelle (Wert × Klasse) in einem bincount-Durchlauf; Codes -1 werden ignoriert."""
+    valid = (value_codes >= 0) & (class_codes >= 0)
+    flat = value_codes[valid] * num_classes + class_codes[valid]
+    counts = np.bincount(flat, minlength=num_values * num_classes)
+    return counts.reshape(num_values, num_classes).astype(np.int64)
+
+class NaiveBayesModel:
+    """
+    Zähltabellen eines Naive-Bayes-Modells (siehe Modulbeschreibung).
+    Erzeugung über fit_naive_bayes(df, target_var).
+      classes:      sortierte Zielklassen
+      class_counts: Anzahl Zeilen je Klasse
+      values:       {Attribut: sortierte Werte}
+      counts:       {Attribut: Zähltabelle (Wert × Klasse)}
+      num_samples:  Anzahl der Trainingszeilen (Nenner des Priors)
+    """
+    def __init__(self, target_var, classes, class_counts, values, counts, num_samples):
+        self.target_var = target_var
+        self._set_tables(classes, class_counts, values, counts, num_samples)
+
+    def _set_tables(self, classes, class_counts, values, counts, num_samples):
+        self.classes = list(classes)
+        self.class_counts = np.asarray(class_counts, dtype=np.int64)
+        self.attributes = list(values)
+        self.values = {attribute: list(values[attribute]) for attribute in self.attributes}
+        self.counts = counts
+        self.num_samples = int(num_samples)
+        self._value_index = {attribute: {value: k for k, value in enumerate(self.values[attribute])}
+                             for attribute in self.attributes}
+        self._indexers = {attribute: pd.Index(self.values[attribute]) for attribute in self.attributes}
+        self._casts = {attribute: VALUE_CASTS.get(value_kind(self.values[attribute]))
+                       for attribute in self.attributes}
+        self._log_tables = {}
+
+    def merge(self, other):
+        """
+        Neues Modell mit den addierten Zähltabellen beider Modelle. Wörterbücher und
+        Klassen werden vereinigt (und bleiben sortiert); beide Modelle müssen dieselbe
+        Zielvariable und dieselben Attribute haben. Hat pandas eine Spalte in einem Modell
+        als Zahl und im anderen als Text gelesen, werden die Werte beider Modelle als Text
+        zusammengeführt (wie beim Einlesen aller Daten auf einmal).
+        """
+        if other.target_var != self.target_var or set(other.attributes) != set(self.attributes):
+            raise ValueError("Modelle mit unterschiedlicher Zielvariable oder unterschiedlichen "
+                             "Attributen können nicht zusammengeführt werden")
+        models = (self, other)
+        classes, class_labels = _union_labels([model.classes for model in models])
+        class_counts = sum(_realign(model.class_counts, labels, classes)
+                           for model, labels in zip(models, class_labels))
+        values = {}
+        counts = {}
+        for attribute in self.attributes:
+            values[attribute], value_labels = _union_labels(
+                [model.values[attribute] for model in models])
+            counts[attribute] = sum(
+                _realign_table(model.counts[attribute], labels, values[attribute],
+                               own_classes, classes)
+                for model, labels, own_classes in zip(models, value_labels, class_labels)
+            )
+        return NaiveBayesModel(self.target_var, classes, class_counts, values, counts,
+                               self.num_samples + other.num_samples)
+
+    def partial_fit(self, df):
+        """Zählt einen weiteren Datenblock zu den Tabellen hinzu. Liefert das Modell selbst."""
+        merged = self.merge(fit_naive_bayes(df, self.target_var, self.attributes))
+        self._set_tables(merged.classes, merged.class_counts, merged.values, merged.counts,
+                         merged.num_samples)
+        return self
+
+    def num_values(self, attribute):
+        """Anzahl der Ausprägungen eines Attributs (wie nunique)."""
+        return len(self.values[attribute])
+
+    def count(self, attribute, value, class_index):
+        """Anzahl der Zeilen mit attribute == value und Klasse classes[class_index]."""
+        k = self._value_index[attribute].get(value)
+        return 0 if k is None else int(self.counts[attribute][k, class_index])
+
+    def likelihood(self, sample, class_index, laplace=False, smoothing=1):
+        """
+        Likelihood einer Klasse für ein Sample {Attribut: Wert}: Produkt der bedingten
+        Wahrscheinlichkeiten und des Priors. Liefert (Wert, Brüche als Text).
+        """
+        total_cls = int(self.class_counts[class_index])
+        likelihood = 1.0
+        details = []
+        for attribute, value in sample.items():
+            count = self.count(attribute, value, class_index)
+            if laplace:
+                V = self.num_values(attribute)
+                details.append(f"({count}+1)/({total_cls}+{V})")
+                likelihood *= (count + smoothing) / (total_cls + smoothing * V) if total_cls > 0 else 0
+            else:
+                details.append(f"{count}/{total_cls}")
+                likelihood *= (count / total_cls) if total_cls > 0 else 0
+        # Prior: relative Häufigkeit der Klasse (ohne Laplace)
+        details.append(f"{total_cls}/{self.num_samples}")
+        likelihood *= (total_cls / self.num_samples)
+        return likelihood, details
+
+    def encode(self, df):
+        """
+        Kodiert die Attributspalten eines DataFrames mit den Wörterbüchern des Modells.
+        Unbekannte und fehlende Werte erhalten den Code -1. Werte werden dabei in den Typ
+        des Wörterbuchs umgewandelt (Text oder Zahl), da pandas den Typ je Datei bzw. je
+        Block bestimmt: eine Spalte mit Text im Training kann beim Vorhersagen nur Ziffern
+        enthalten und als Zahl gelesen werden.
+        """
+        missing = [attribute for attribute in self.attributes if attribute not in df.columns]
+        if missing:
+            raise ValueError(f"Attribute fehlen in den Daten: {missing}")
+        codes = np.empty((len(df), len(self.attributes)), dtype=np.intp)
+        for j, attribute in enumerate(self.attributes):
+            indexer, cast = self._indexers[attribute], self._casts[attribute]
+            if cast is None:
+                codes[:, j] = indexer.get_indexer(df[attribute])
+                continue
+            # Umgewandelt wird einmal je unterschiedlichem Wert
+            value_codes, uniques = pd.factorize(df[attribute])
+            lookup = np.append(indexer.get_indexer([cast(value) for value in uniques]), -1)
+            codes[:, j] = lookup[value_codes]
+        return codes
+
+    def log_tables(self, smoothing=1):
+        """
+        (log Prior, {Attribut: log P(Wert | Klasse)}) mit LaPlace-Korrektur smoothing.
+        Jede Tabelle hat eine zusätzliche letzte Zeile für unbekannte Werte (Code -1),
+        wie ein Wert, der beim Training nicht vorkam. Bei smoothing=0 wird aus einer
+        Anzahl 0 -inf. Das Ergebnis wird je smoothing zwischengespeichert.
+        """
+        if smoothing not in self._log_tables:
+            log_prior, tables = log_count_tables(
+                self.class_counts, [self.counts[attribute] for attribute in self.attributes],
+                [self.num_values(attribute) for attribute in self.attributes],
+                self.num_samples, smoothing)
+            self._log_tables[smoothing] = (log_prior, dict(zip(self.attributes, tables)))
+        return self._log_tables[smoothing]
+
+    def log_likelihoods(self, codes, smoothing=1):
+        """Log-Likelihood (Zeilen × Klassen) für eine mit encode kodierte Matrix."""
+        log_prior, tables = self.log_tables(smoothing)
+        return sum_log_likelihoods(log_prior, [tables[attribute] for attribute in self.attributes],
+                                   codes)
+
+    def predict_proba(self, df, smoothing=1):
+        """Normalisierte Wahrscheinlichkeiten (Zeilen × Klassen in der Reihenfolge von classes)."""
+        return normalize_log(self.log_likelihoods(self.encode(df), smoothing))
+
+    def predict(self, df, smoothing=1):
+        """Wahrscheinlichste Klasse je Zeile (bei Gleichstand die erste in classes)."""
+        labels = np.array(self.classes, dtype=object)
+        return labels[np.argmax(self.log_likelihoods(self.encode(df), smoothing), axis=1)]
+
+    def frequency_table(self):
+        """
+        Häufigkeiten aller Attributwerte als DataFrame: Spalten Attribut, Wert und je
+        Klasse die Anzahl ("Anzahl(Klasse)") und der Anteil an der Klasse ("Anteil(Klasse)").
+        """
+        sizes = [self.num_values(attribute) for attribute in self.attributes]
+        counts = (np.vstack([self.counts[attribute] for attribute in self.attributes])
+                  if self.attributes else np.zeros((0, len(self.classes)), dtype=np.int64))
+        table = pd.DataFrame({
+            "Attribut": np.repeat(np.array(self.attributes, dtype=object), sizes),
+            "Wert": [value for attribute in self.attributes for value in self.values[attribute]],
+        })
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = counts / self.class_counts
+        for k, cls in enumerate(self.classes):
+            table[f"Anzahl({cls})"] = counts[:, k]
+            table[f"Anteil({cls})"] = shares[:, k]
+        return table
+
+def log_count_tables(class_counts, counts, num_values, num_samples, smoothing=1):
+    """
+    log Prior und je Attribut log P(Wert | Klasse) aus Zähltabellen (Liste in der
+    Reihenfolge der Attribute), mit einer zusätzlichen Zeile für unbekannte Werte.
+    Klassen ohne Trainingszeilen erhalten den log Prior -inf und in den Tabellen 0, so
+    dass ihre Log-Likelihood -inf ist (bei smoothing=0 sonst log(0/0) = NaN).
+    """
+    present = np.asarray(class_counts) > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_prior = np.where(present, np.log(class_counts / num_samples), -np.inf)
+        tables = []
+        for table, V in zip(counts, num_values):
+            table = np.vstack([table, np.zeros((1, table.shape[1]))])
+            log_table = np.log((table + smoothing) / (class_counts + smoothing * V))
+            tables.append(np.where(present, log_table, 0.0))
+    return log_prior, tables
+
+def sum_log_likelihoods(log_prior, tables, codes):
+    """Log-Likelihood (Zeilen × Klassen): Prior plus die nachgeschlagenen Tabellenzeilen."""
+    result = np.tile(log_prior, (len(codes), 1))
+    for j, table in enumerate(tables):
+        result += table[codes[:, j]]
+    return result
+
+def normalize_log(log_likelihoods):
+    """
+    Normalisiert Log-Likelihoods zeilenweise mit log-sum-exp. Zeilen, in denen keine
+    Klasse eine Likelihood über 0 hat, erhalten überall 0 (wie compute_normalized_posteriors).
+    """
+    top = np.max(log_likelihoods, axis=1, keepdims=True)
+    finite = np.isfinite(top)
+    with np.errstate(invalid="ignore"):
+        shifted = np.exp(log_likelihoods - np.where(finite, top, 0))
+        posteriors = shifted / shifted.sum(axis=1, keepdims=True)
+    return np.where(finite, posteriors, 0.0)
+
+def predict_csv(model, filename, output, smoothing=1, chunksize=100000, column="Vorhersage"):
+    """
+    Berechnet für alle Zeilen einer Datei die Wahrscheinlichkeiten je Klasse (Spalten
+    "P(Klasse)") und die Vorhersage (Spalte column) und schreibt sie mit den
+    Eingabespalten als CSV nach output (Dateiname oder offene Datei). CSV-Dateien werden
+    blockweise mit chunksize Zeilen verarbeitet. Liefert die Anzahl der Zeilen.
+    """
+    if os.path.splitext(filename)[1].lower() == ".csv":
+        # Als Text lesen: encode wandelt in den Typ der Wörterbücher um, ohne dass
+        # Ziffernfolgen wie "007" als Zahl ihre Schreibweise verlieren
+        chunks = read_csv_chunks(filename, chunksize, dtype=str)
+    else:
+        chunks = [load_file(filename, verbose=False)]
+    labels = np.array(model.classes, dtype=object)
+    own_file = isinstance(output, (str, os.PathLike))
+    out = open(output, "w", encoding="utf-8", newline="") if own_file else output
+    rows = 0
+    try:
+        for chunk in chunks:
+            log_likelihoods = model.log_likelihoods(model.encode(chunk), smoothing)
+            posteriors = normalize_log(log_likelihoods)
+            result = chunk.copy(deep=False)
+            for k, cls in enumerate(model.classes):
+                result[f"P({cls})"] = posteriors[:, k]
+            result[column] = labels[np.argmax(log_likelihoods, axis=1)]
+            result.to_csv(out, index=False, header=rows == 0)
+            rows += len(chunk)
+    finally:
+        if own_file:
+            out.close()
+    return rows
+
+def fit_naive_bayes(df, target_var, attributes=None):
+    """
+    Zählt Klassenhäufigkeiten und die Zähltabellen aller Attribute (Standard: alle
+    Spalten außer der Zielvariable) in je einem Durchlauf.
+    """
+    if target_var not in df.columns:
+        raise ValueError(f"Zielvariable '{target_var}' nicht gefunden. Vorhanden: {list(df.columns)}")
+    if attributes is None:
+        attributes = [col for col in df.columns if col != target_var]
+    class_codes, classes = encode_sorted(df[target_var])
+    class_counts = np.bincount(class_codes[class_codes >= 0], minlength=len(classes))
+    values = {}
+    counts = {}
+    for attribute in attributes:
+        value_codes, values[attribute] = encode_sorted(df[attribute])
+        counts[attribute] = count_table(value_codes, class_codes, len(values[attribute]),
+                                        len(classes))
+    return NaiveBayesModel(target_var, classes, class_counts, values, counts, len(df))
+
+def _realign(table, labels, new_labels):
+    """
+    Ordnet die Zeilen einer Tabelle von labels auf new_labels um (neue Zeilen mit 0,
+    Zeilen mit gleichem Label werden addiert).
+    """
+    result = np.zeros((len(new_labels),) + table.shape[1:], dtype=np.int64)
+    np.add.at(result, pd.Index(new_labels).get_indexer(labels), table)
+    return result
+
+def _realign_table(table, values, new_values, classes, new_classes):
+    """Zähltabelle (Wert × Klasse) auf neue Werte und Klassen umordnen."""
+    return _realign(_realign(table, values, new_values).T, classes, new_classes).T
+
+def _union_labels(label_lists):
+    """
+    Sortierte Vereinigung mehrerer Wörterbücher. Liefert (Vereinigung, Wörterbücher); sind
+    Texte und Zahlen gemischt, werden alle Wörterbücher als Text (as_text) geliefert.
+    """
+    try:
+        return sorted(set().union(*label_lists)), label_lists
+    except TypeError:
+        label_lists = [[as_text(value) for value in labels] for labels in label_lists]
+        return sorted(set().union(*label_lists)), label_lists
+
+def _parse_model_values(model):
+    """Modell mit Klassen und Wörterbüchern in den Typen aus parse_text_values."""
+    own_classes = parse_text_values(model.classes)
+    classes = sorted(set(own_classes))
+    values = {}
+    counts = {}
+    for attribute in model.attributes:
+        own_values = parse_text_values(model.values[attribute])
+        values[attribute] = sorted(set(own_values))
+        counts[attribute] = _realign_table(model.counts[attribute], own_values, values[attribute],
+                                           own_classes, classes)
+    class_counts = _realign(model.class_counts, own_classes, classes)
+    return NaiveBayesModel(model.target_var, classes, class_counts, values, counts,
+                           model.num_samples)
+
+def merge_models(models):
+    """Führt mehrere Modelle (z. B. je Datei oder Block) durch Addition zusammen."""
+    return reduce(NaiveBayesModel.merge, models)
+
+def fit_naive_bayes_chunks(chunks, target_var, attributes=None):
+    """Zählt ein Modell über eine Folge von Datenblöcken (partial_fit je Block)."""
+    model = None
+    for chunk in chunks:
+        if model is None:
+            model = fit_naive_bayes(chunk, target_var, attributes)
+        else:
+            model.partial_fit(chunk)
+    if model is None:
+        raise ValueError("Keine Daten zum Zählen vorhanden")
+    return model
+
+def fit_naive_bayes_csv(filename, target_var, chunksize=100000, attributes=None):
+    """
+    Zählt ein Modell aus einer Datei; CSV-Dateien werden blockweise gelesen, die Datei
+    muss also nicht in den Speicher passen. Die Blöcke werden als Text gelesen (pandas
+    würde den Typ je Block bestimmen) und die Typen danach einmal für die ganze Datei
+    festgelegt (parse_text_values), wie bei load_file.
+    """
+    if os.path.splitext(filename)[1].lower() == ".csv":
+        chunks = read_csv_chunks(filename, chunksize, dtype=str)
+        return _parse_model_values(fit_naive_bayes_chunks(chunks, target_var, attributes))
+    return fit_naive_bayes_chunks([load_file(filename, verbose=False)], target_var, attributes)
+
+def fit_naive_bayes_files(filenames, target_var, chunksize=100000, processes=None):
+    """
+    Zählt jede Datei (blockweise) für sich, bei processes > 1 parallel in einem
+    Prozess-Pool, und führt die Modelle zusammen. Das Ergebnis ist identisch mit
+    fit_naive_bayes über alle Dateien aneinandergehängt.
+    """
+    filenames = list(filenames)
+    if not filenames:
+        raise ValueError("Keine Dateien angegeben")
+    if processes is None or processes <= 1 or len(filenames) == 1:
+        models = [fit_naive_bayes_csv(name, target_var, chunksize) for name in filenames]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(filenames))) as pool:
+            models = list(pool.map(fit_naive_bayes_csv, filenames, [target_var] * len(filenames),
+                                   [chunksize] * len(filenames)))
+    return merge_models(models)
@@ -0,0 +1,326 @@
+"""
+Benchmarks für ID3 und Naive Bayes mit synthetischen Datensätzen.
+
+generate_dataset erzeugt reproduzierbar (Seed) einen kategorialen Datensatz. Die
+Zielklasse folgt einer festen Regel auf den ersten Attributen, ein Anteil noise der
+Zeilen erhält eine zufällige Klasse.
+
+Ausgehend von einer Basiskonfiguration je Größenstufe (--scale) wird immer nur eine
+Größe variiert: Zeilen, Attribute, Ausprägungen je Attribut, Klassen und Rauschen.
+Für jeden Datensatz werden gemessen:
+  - id3_build:      build_id3_tree ohne Ausgabe
+  - id3_predict:    Vorhersage mit dem kompilierten Baum (ID3_model) für alle Zeilen
+  - nb_frequencies: print_relative_frequencies (Ausgabe verworfen)
+  - nb_score:       Likelihoods mit und ohne LaPlace für ein Sample
+Gemessen wird die beste und die mittlere Zeit aus --repeat Läufen sowie in einem
+eigenen Lauf der Spitzenwert des Speichers (tracemalloc).
+
+Unabhängig von den Datensätzen misst startup die Startzeit der Skripte in je einem
+neuen Interpreter (STARTUP_COMMANDS: Import, --help und ein kurzer Batch-Lauf mit
+ID3_play_tennis.csv), also die Zeit, die kurzlebige Prozesse vor allem für Importe
+brauchen. Mit --baseline-rev REV werden dieselben Befehle zusätzlich in einem temporären
+git worktree der Revision REV gemessen und verglichen (gleicher Rechner, gleicher Lauf).
+
+Die Ergebnisse werden als JSON geschrieben; mit --compare werden sie mit einer
+früheren Datei verglichen, Verschlechterungen über --threshold führen zu Exit-Code 1.
+
+Aufruf: python3 benchmark.py --scale small -o ergebnis.json [--compare alt.json]
+        python3 benchmark.py --only startup --baseline-rev HEAD~1
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_loader import to_categorical
+from ID3 import build_id3_tree
+from ID3_model import compile_tree
+from NaiveBayes import (
+    compute_likelihoods_and_posteriors, compute_likelihoods_and_posteriors_laplace,
+    print_relative_frequencies,
+)
+
+RESULT_VERSION = 1
+TARGET = "Klasse"
+
+# Basiskonfiguration je Größenstufe und die Werte, die jeweils einzeln variiert werden
+SCALES = {
+    "small": {"rows": 2000, "vary_rows": [500, 2000, 8000]},
+    "medium": {"rows": 20000, "vary_rows": [5000, 20000, 80000]},
+    "large": {"rows": 200000, "vary_rows": [50000, 200000, 800000]},
+}
+BASE = {"attributes": 8, "cardinality": 5, "classes": 3, "noise": 0.05}
+VARY = {
+    "attributes": [4, 8, 16],
+    "cardinality": [2, 5, 20],
+    "classes": [2, 3, 6],
+    "noise": [0.0, 0.05, 0.2],
+}
+BENCHMARKS = ("id3_build", "id3_predict", "nb_frequencies", "nb_score", "startup")
+# Argumente für einen neuen Interpreter, ausgeführt im Verzeichnis der Skripte
+STARTUP_COMMANDS = {
+    "import ID3": ["-c", "import ID3"],
+    "import ID3_nxtree": ["-c", "import ID3_nxtree"],
+    "import NaiveBayes": ["-c", "import NaiveBayes"],
+    "ID3.py --help": ["ID3.py", "--help"],
+    "ID3_nxtree.py --help": ["ID3_nxtree.py", "--help"],
+    "NaiveBayes.py --help": ["NaiveBayes.py", "--help"],
+    "ID3_nxtree.py batch": ["ID3_nxtree.py", "ID3_play_tennis.csv", "-t", "Play", "--no-render",
+                            "--no-cache", "-v", "0"],
+    "NaiveBayes.py batch": ["NaiveBayes.py", "ID3_play_tennis.csv", "-t", "Play",
+                            "-s", "Outlook=Sunny", "--no-cache", "-v", "0"],
+}
+
+def generate_dataset(rows, attributes, cardinality, classes, noise, seed=0):
+    """
+    Erzeugt einen kategorialen Datensatz mit den Attributen A0, A1, ... (Werte v0, v1, ...)
+    und der Zielvariable "Klasse" (Werte k0, k1, ...).
+    """
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, cardinality, size=(rows, attributes))
+    # Regel: gewichtete Summe der ersten (höchstens drei) Attribute
+    informative = min(3, attributes)
+    weights = np.arange(1, informative + 1)
+    target = (codes[:, :informative] @ weights) % classes
+    flip = rng.random(rows) < noise
+    target[flip] = rng.integers(0, classes, size=int(flip.sum()))
+
+    values = np.array([f"v{k}" for k in range(cardinality)], dtype=object)
+    labels = np.array([f"k{k}" for k in range(classes)], dtype=object)
+    data = {f"A{j}": values[codes[:, j]] for j in range(attributes)}
+    data[TARGET] = labels[target]
+    return to_categorical(pd.DataFrame(data))
+
+def configurations(scale):
+    """Basiskonfiguration plus je eine Variation pro Größe (ohne Doppelte)."""
+    base = dict(BASE, rows=SCALES[scale]["rows"])
+    vary = dict(VARY, rows=SCALES[scale]["vary_rows"])
+    configs = [base]
+    for key, values in vary.items():
+        for value in values:
+            config = dict(base, **{key: value})
+            if config not in configs:
+                configs.append(config)
+    return configs
+
+def _steps(df, only):
+    """Die gemessenen Schritte als {Name: Funktion ohne Argumente}."""
+    attributes = [col for col in df.columns if col != TARGET]
+    sample = {attribute: df[attribute].iloc[0] for attribute in attributes}
+    # Der Baum für die Vorhersage wird vorab (ohne Messung) gebaut
+    model = None
+    if "id3_predict" in only:
+        model = compile_tree(build_id3_tree(df, attributes, TARGET, verbosity=0))
+
+    def id3_build():
+        build_id3_tree(df, attributes, TARGET, verbosity=0)
+
+    def id3_predict():
+        model.predict(df)
+
+    def nb_frequencies():
+        with contextlib.redirect_stdout(io.StringIO()):
+            print_relative_frequencies(df, TARGET)
+
+    def nb_score():
+        compute_likelihoods_and_posteriors(df, TARGET, sample, verbose=False)
+        compute_likelihoods_and_posteriors_laplace(df, TARGET, sample, verbose=False)
+
+    return {"id3_build": id3_build, "id3_predict": id3_predict,
+            "nb_frequencies": nb_frequencies, "nb_score": nb_score}
+
+def measure(func, repeat):
+    """Liefert (Zeiten in Sekunden, Spitzenwert des Speichers in Bytes)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    # Speicher in einem eigenen Lauf, tracemalloc verfälscht sonst die Zeiten
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+def measure_startup(repeat, directory=None, check=True):
+    """
+    Startzeiten je Eintrag in STARTUP_COMMANDS: {Name: Zeiten in Sekunden}.
+    directory: Verzeichnis der Skripte (Standard: das dieser Datei).
+    check=False überspringt Befehle, die dort fehlschlagen (z. B. Optionen, die es in
+    einer älteren Revision noch nicht gibt).
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, args in STARTUP_COMMANDS.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, *args], cwd=directory, check=check,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if completed.returncode != 0:
+                break
+            times.append(time.perf_counter() - start)
+        else:
+            results[name] = times
+    return results
+
+@contextlib.contextmanager
+def git_worktree(revision):
+    """Temporärer git worktree (detached) der Revision; liefert dessen Verzeichnis."""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as parent:
+        path = os.path.join(parent, "worktree")
+        subprocess.run(["git", "worktree", "add", "--detach", "--quiet", path, revision],
+                       cwd=repo, check=True)
+        try:
+            yield path
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", path], cwd=repo, check=False)
+
+def compare_startup_with_revision(revision, repeat, threshold=1.25, verbose=True):
+    """
+    Misst STARTUP_COMMANDS im aktuellen Stand und in einem worktree der Revision.
+    Liefert die Verschlechterungen wie compare (Befehle, die es dort nicht gibt, fehlen).
+    """
+    with git_worktree(revision) as path:
+        before = measure_startup(repeat, path, check=False)
+    after = measure_startup(repeat)
+    regressions = []
+    for name, times in after.items():
+        if name not in before:
+            if verbose:
+                print(f"{name:<22} in {revision} nicht ausführbar")
+            continue
+        old, new = min(before[name]), min(times)
+        if verbose:
+            print(f"{name:<22} {old:7.3f} s -> {new:7.3f} s ({new / old:.2f}x)")
+        if new / old > threshold:
+            regressions.append(("startup", {"command": name}, old, new, new / old))
+    return regressions
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(scale="small", repeat=3, seed=0, only=BENCHMARKS, verbose=True):
+    """Führt alle Benchmarks aus und liefert das Ergebnis-Dictionary (siehe Modulbeschreibung)."""
+    results = []
+    if "startup" in only:
+        for command, times in measure_startup(repeat).items():
+            entry = {"benchmark": "startup", "params": {"command": command}, "min_s": min(times),
+                     "median_s": statistics.median(times), "peak_bytes": None}
+            results.append(entry)
+            if verbose:
+                print(f"{'startup':<15} {command:<60} {entry['min_s']:9.4f} s")
+    only = [name for name in only if name != "startup"]
+    for config in (configurations(scale) if only else ()):
+        df = generate_dataset(seed=seed, **config)
+        steps = _steps(df, only)
+        for name in only:
+            times, peak = measure(steps[name], repeat)
+            entry = {"benchmark": name, "params": config, "min_s": min(times),
+                     "median_s": statistics.median(times), "peak_bytes": peak}
+            results.append(entry)
+            if verbose:
+                params = " ".join(f"{key}={value}" for key, value in config.items())
+                print(f"{name:<15} {params:<60} {entry['min_s']:9.4f} s {peak / 2**20:9.1f} MB")
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "scale": scale,
+        "repeat": repeat,
+        "seed": seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def _key(entry):
+    return entry["benchmark"], json.dumps(entry["params"], sort_keys=True)
+
+def compare(old, new, threshold=1.25):
+    """
+    Vergleicht zwei Ergebnisse (min_s je Benchmark und Konfiguration).
+    Liefert die Liste der Verschlechterungen (benchmark, params, alt, neu, Faktor).
+    """
+    previous = {_key(entry): entry for entry in old["results"]}
+    regressions = []
+    for entry in new["results"]:
+        before = previous.get(_key(entry))
+        if before is None or before["min_s"] <= 0:
+            continue
+        ratio = entry["min_s"] / before["min_s"]
+        if ratio > threshold:
+            regressions.append((entry["benchmark"], entry["params"], before["min_s"],
+                                entry["min_s"], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für ID3 und Naive Bayes")
+    parser.add_argument("--scale", choices=list(SCALES), default="small",
+                        help="Größenstufe der Datensätze (Standard: small)")
+    parser.add_argument("--repeat", type=int, default=3, help="Läufe je Messung (Standard: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed des Generators (Standard: 0)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help=f"Kommagetrennte Auswahl aus: {', '.join(BENCHMARKS)}")
+    parser.add_argument("-o", "--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="Mit einer früheren Ergebnisdatei vergleichen")
+    parser.add_argument("--baseline-rev", metavar="REV",
+                        help="Startzeiten mit einer git-Revision vergleichen (nur startup)")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Faktor, ab dem eine Messung als Verschlechterung gilt (Standard: 1.25)")
+    args = parser.parse_args(argv)
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in only if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unbekannte Benchmarks: {', '.join(unknown)}")
+
+    if args.baseline_rev:
+        if only != ["startup"]:
+            parser.error("--baseline-rev vergleicht nur die Startzeiten, bitte mit --only startup")
+        regressions = compare_startup_with_revision(args.baseline_rev, args.repeat, args.threshold)
+        for name, params, before, after, ratio in regressions:
+            print(f"Verschlechterung {name} {params}: {before:.4f} s -> {after:.4f} s ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"Keine Verschlechterung über {args.threshold:.2f}x gegenüber {args.baseline_rev}")
+        return
+
+    result = run_benchmarks(args.scale, repeat=args.repeat, seed=args.seed, only=only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        regressions = compare(old, result, args.threshold)
+        for name, params, before, after, ratio in regressions:
+            print(f"Verschlechterung {name} {params}: {before:.4f} s -> {after:.4f} s ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"Keine Verschlechterung über {args.threshold:.2f}x gegenüber {args.compare}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Gemeinsamer Datei-Loader für ID3.py, ID3_nxtree.py und NaiveBayes.py.
+
+- Das Trennzeichen wird nur aus einem kleinen Anfangsstück der Datei bestimmt.
+- Geparst wird mit der C-Engine von pandas statt mit der langsamen Python-Engine, von
+  allen Lesefunktionen mit denselben Optionen (_csv_options). pyarrow wird nicht
+  verwendet: es kennt skipinitialspace nicht und liest damit z. B. " NA" oder ein
+  Anführungszeichen nach einem Leerzeichen anders.
+- Alle Spalten werden als Kategorien geladen: kompakte Integer-Codes (int8/int16/...)
+  plus ein Wörterbuch der Werte. CSV-Spalten liest read_csv direkt als Kategorien
+  (dtype="category"), ohne Zwischenschritt über eine Spalte mit einem Objekt je Zeile.
+  Leerzeichen entfernen und den Typ der Werte bestimmen (Zahl, Wahrheitswert, Text)
+  geschieht danach nur im Wörterbuch, also einmal je unterschiedlichem Wert statt
+  einmal je Zeile.
+"""
+import csv
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+SNIFF_BYTES = 64 * 1024
+DELIMITERS = ",;\t|"
+
+def sniff_delimiter(filename, encoding="utf-8-sig"):
+    """
+    Bestimmt das Trennzeichen aus den ersten SNIFF_BYTES Bytes der Datei.
+    """
+    with open(filename, "r", encoding=encoding, errors="replace", newline="") as f:
+        sample = f.read(SNIFF_BYTES)
+    # Nur vollständige Zeilen auswerten
+    if len(sample) == SNIFF_BYTES and "\n" in sample:
+        sample = sample[:sample.rindex("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+def _csv_options(filename):
+    """Gemeinsame Optionen von read_csv für alle Lesefunktionen dieses Moduls."""
+    return {"sep": sniff_delimiter(filename), "engine": "c", "skipinitialspace": True,
+            "encoding": "utf-8-sig"}
+
+def _strip_categorical(series):
+    """
+    Wandelt eine Spalte in eine Kategorie um und entfernt Leerzeichen in den Werten.
+    Werte, die erst nach dem Trimmen gleich sind, werden zusammengelegt.
+    """
+    series = series.astype("category")
+    categories = series.cat.categories
+    if not (pd.api.types.is_string_dtype(categories) or categories.dtype == object):
+        return series
+    stripped = pd.Index([v.strip() if isinstance(v, str) else v for v in categories])
+    if stripped.equals(categories):
+        return series
+    merged = stripped.unique().sort_values()
+    mapping = merged.get_indexer(stripped)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, mapping[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=merged),
+                     index=series.index, name=series.name)
+
+def _text_categorical(series):
+    """
+    Nachbearbeitung einer mit dtype="category" gelesenen CSV-Spalte, nur im Wörterbuch:
+    Leerzeichen entfernen, Typ der Werte wie pandas beim Lesen ohne dtype bestimmen
+    (parse_text_values) und Werte zusammenlegen, die danach gleich sind.
+    """
+    categories = series.cat.categories
+    values = parse_text_values([(v if isinstance(v, str) else str(v)).strip() for v in categories])
+    codes = series.cat.codes.to_numpy()
+    if (values and isinstance(values[0], int) and not isinstance(values[0], bool)
+            and (codes < 0).any()):
+        # Ganze Zahlen mit Lücken liest pandas als float
+        values = [float(v) for v in values]
+    # Spalten nur mit Lücken liest pandas ebenfalls als float (ohne Zeilen als object)
+    values = pd.Index(values, dtype=None if values or not len(codes) else np.float64)
+    merged = values.unique().sort_values()
+    if merged.equals(categories) and merged.dtype == categories.dtype:
+        return series
+    new_codes = np.full(len(codes), -1, dtype=codes.dtype)
+    known = codes >= 0
+    new_codes[known] = merged.get_indexer(values)[codes[known]]
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=merged),
+                     index=series.index, name=series.name)
+
+def to_categorical(df):
+    """
+    Wandelt alle Spalten in (getrimmte) Kategorien um; Spaltennamen werden ebenfalls getrimmt.
+    """
+    df = df.copy(deep=False)
+    df.columns = [str(col).strip() for col in df.columns]
+    for col in df.columns:
+        df[col] = _strip_categorical(df[col])
+    return df
+
+def read_csv_fast(filename):
+    """
+    Liest eine CSV-Datei direkt mit kategorialen Spalten (siehe Modulbeschreibung);
+    Spaltennamen und Werte sind getrimmt.
+    """
+    df = pd.read_csv(filename, dtype="category", **_csv_options(filename))
+    df.columns = [str(col).strip() for col in df.columns]
+    for col in df.columns:
+        df[col] = _text_categorical(df[col])
+    return df
+
+def read_csv_chunks(filename, chunksize=100000, dtype=None):
+    """
+    Liest eine CSV-Datei in Blöcken von chunksize Zeilen, ohne sie ganz in den Speicher
+    zu laden. Jeder Block wird wie bei load_file in (getrimmte) Kategorien umgewandelt.
+    pandas bestimmt die Datentypen je Block; mit dtype=str bleiben alle Werte Text.
+    """
+    with pd.read_csv(filename, chunksize=chunksize, dtype=dtype,
+                     **_csv_options(filename)) as reader:
+        for chunk in reader:
+            yield to_categorical(chunk)
+
+def read_csv_rows(filename, skip_rows=0, dtype=None):
+    """
+    Liest eine CSV-Datei ab der Datenzeile skip_rows (die ersten skip_rows Zeilen nach
+    der Kopfzeile werden übersprungen), mit denselben Optionen wie load_file.
+    """
+    df = pd.read_csv(filename, skiprows=range(1, skip_rows + 1), dtype=dtype,
+                     **_csv_options(filename))
+    return to_categorical(df)
+
+def value_kind(values):
+    """"text", wenn alle Werte Texte sind, "number" bei lauter Zahlen, sonst None."""
+    if values and all(isinstance(value, str) for value in values):
+        return "text"
+    if values and all(isinstance(value, (int, float, np.integer, np.floating))
+                      and not isinstance(value, (bool, np.bool_)) for value in values):
+        return "number"
+    return None
+
+def as_text(value):
+    """Wert als Text, ganze Zahlen ohne Nachkommastellen (5.0 -> "5")."""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return value if isinstance(value, str) else str(value)
+
+def as_number(value):
+    """Wert als Zahl; Texte, die keine Zahl sind, werden zu NaN (unbekannter Wert)."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return np.nan
+    return value
+
+_INTEGER = re.compile(r"[+-]?\d+")
+_FLOAT = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|[+-]?(inf|Inf|INF)")
+
+def parse_text_values(values):
+    """
+    Bestimmt den Typ eines als Text gelesenen Wörterbuchs wie pandas beim Lesen der
+    ganzen Datei: lauter ganze Zahlen -> int, lauter Zahlen -> float, lauter
+    True/False -> bool, sonst Text. Liefert die Werte in derselben Reihenfolge.
+    """
+    if not values or not all(isinstance(value, str) for value in values):
+        return list(values)
+    if all(_INTEGER.fullmatch(value) for value in values):
+        return [int(value) for value in values]
+    if all(_FLOAT.fullmatch(value) for value in values):
+        return [float(value) for value in values]
+    if all(value in ("True", "TRUE", "true", "False", "FALSE", "false") for value in values):
+        return [value.lower() == "true" for value in values]
+    return list(values)
+
+def load_file(filename, verbose=True, use_cache=False):
+    """
+    Lädt eine CSV- oder Excel-Datei als DataFrame mit kategorialen Spalten.
+    Mit use_cache=True wird der kodierte Datensatz im Cache (dataset_cache) abgelegt
+    bzw. von dort per Memory-Mapping geladen.
+    Löst ValueError bei nicht unterstütztem Dateiformat aus.
+    """
+    _, ext = os.path.splitext(filename)
+    ext = ext.lower()
+    if use_cache and ext in [".csv", ".xls", ".xlsx"]:
+        import dataset_cache
+        return dataset_cache.load_cached(
+            filename, lambda name: load_file(name, verbose=verbose), verbose=verbose
+        )
+
+    if ext == ".csv":
+        if verbose:
+            print(f"CSV-Datei erkannt. Lade CSV-Datei...")
+        df = read_csv_fast(filename)
+    elif ext in [".xls", ".xlsx"]:
+        if verbose:
+            print("Excel-Datei erkannt. Lade Excel-Datei...")
+        df = to_categorical(pd.read_excel(filename))
+    else:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {filename}")
+    if verbose:
+        print("Datei wurde erfolgreich geladen!")
+    return df
+
+def table_codes(df):
+    """
+    Liefert die kompakten Codes und Wörterbücher einer kategorialen Tabelle:
+    ({Spalte: Code-Array}, {Spalte: Liste der Werte}). Fehlende Werte haben Code -1.
+    """
+    codes = {col: df[col].cat.codes.to_numpy() for col in df.columns}
+    categories = {col: list(df[col].cat.categories) for col in df.columns}
+    return codes, categories
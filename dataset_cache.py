@@ -0,0 +1,248 @@
+"""
+Cache für geladene Datensätze auf der Festplatte.
+
+Ein kodierter Datensatz (Wörterbücher der Kategorien plus ein .npy-Array mit den
+Codes je Spalte) wird unter dem Inhalts-Hash der Quelldatei abgelegt. Spätere Läufe
+lesen die Codes per Memory-Mapping, statt CSV oder Excel erneut zu parsen.
+
+- Ein Index merkt sich je Quelldatei Größe, Änderungszeit (mtime) und Hash; ändert
+  sich die mtime, wird der Hash neu berechnet. Ein geänderter Inhalt führt damit
+  automatisch zu einem neuen Eintrag. Jede Quelldatei hat eine eigene kleine
+  Index-Datei (index/), parallele Läufe mit verschiedenen Dateien überschreiben sich
+  also nicht gegenseitig.
+- Die Gesamtgröße ist begrenzt (Standard 2 GB); bei Überschreitung werden die am
+  längsten nicht benutzten Einträge gelöscht. Index-Dateien, deren Eintrag oder
+  Quelldatei nicht mehr existiert, werden dabei ebenfalls entfernt.
+
+Umgebungsvariablen: DM_CACHE_DIR (Verzeichnis), DM_CACHE_MAX_BYTES (Größe),
+DM_CACHE=0 (Cache für alle Skripte abschalten, wie --no-cache).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+INDEX_DIR = "index"
+META_FILE = "meta.json"
+
+def default_cache_dir():
+    return os.environ.get("DM_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "learn-datamining"
+    )
+
+def default_max_bytes():
+    return int(os.environ.get("DM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+def cache_enabled():
+    """False, wenn der Cache über DM_CACHE=0 (bzw. off, no, false) abgeschaltet ist."""
+    return os.environ.get("DM_CACHE", "1").strip().lower() not in ("0", "off", "no", "false")
+
+def file_hash(filename, chunk_size=1024 * 1024):
+    """Inhalts-Hash (BLAKE2b) der Datei, blockweise gelesen."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _write_json(path, data):
+    # Atomar schreiben, damit parallele Läufe keine halben Dateien sehen
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _index_path(cache_dir, path):
+    """Index-Datei einer Quelldatei (benannt nach dem Hash ihres Pfads)."""
+    name = hashlib.blake2b(path.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, INDEX_DIR, f"{name}.json")
+
+def source_key(filename, cache_dir):
+    """
+    Schlüssel des Cache-Eintrags für eine Quelldatei. Der Hash wird nur neu berechnet,
+    wenn sich Größe oder mtime seit dem letzten Lauf geändert haben.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    index_path = _index_path(cache_dir, path)
+    known = _read_json(index_path)
+    if (known and known.get("path") == path and known["size"] == stat.st_size
+            and known["mtime_ns"] == stat.st_mtime_ns):
+        content_hash = known["hash"]
+    else:
+        content_hash = file_hash(path)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        _write_json(index_path, {"path": path, "size": stat.st_size,
+                                 "mtime_ns": stat.st_mtime_ns, "hash": content_hash})
+    return f"v{CACHE_VERSION}-{content_hash}"
+
+def _encode_categories(categories):
+    """Wörterbuch einer Spalte JSON-tauglich ablegen (mit Datentyp)."""
+    dtype = categories.dtype
+    if dtype.kind == "M":
+        values = [value.isoformat() for value in categories]
+    elif dtype.kind in "iub":
+        values = [int(value) for value in categories]
+    elif dtype.kind == "f":
+        values = [float(value) for value in categories]
+    elif dtype == object and not all(isinstance(value, str) for value in categories):
+        # Gemischte Spalten (z. B. aus Excel): Typ je Wert mitschreiben
+        return {"dtype": "mixed", "values": [tag_value(value) for value in categories]}
+    else:
+        values = [str(value) for value in categories]
+    return {"dtype": str(dtype), "values": values}
+
+def tag_value(value):
+    """Einzelwert mit Typkennung für JSON ablegen, z. B. ["i", 5] oder ["s", "Sunny"]."""
+    if isinstance(value, (bool, np.bool_)):
+        return ["b", bool(value)]
+    if isinstance(value, (int, np.integer)):
+        return ["i", int(value)]
+    if isinstance(value, (float, np.floating)):
+        return ["f", float(value)]
+    if isinstance(value, pd.Timestamp):
+        return ["t", value.isoformat()]
+    return ["s", str(value)]
+
+def untag_value(tagged):
+    kind, value = tagged
+    if kind == "t":
+        return pd.Timestamp(value)
+    return value
+
+def _decode_categories(data):
+    dtype = data["dtype"]
+    if dtype == "mixed":
+        return pd.Index([untag_value(value) for value in data["values"]], dtype=object)
+    if dtype.startswith("datetime64"):
+        return pd.DatetimeIndex(pd.to_datetime(data["values"]))
+    if dtype in ("object", "str", "string"):
+        return pd.Index(data["values"], dtype=object if dtype == "object" else None)
+    return pd.Index(data["values"], dtype=dtype)
+
+def write_entry(entry_dir, df):
+    """Legt einen kategorialen DataFrame als Cache-Eintrag ab."""
+    parent = os.path.dirname(entry_dir)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        columns = []
+        for j, col in enumerate(df.columns):
+            np.save(os.path.join(tmp_dir, f"{j}.npy"), df[col].cat.codes.to_numpy())
+            columns.append({"name": col, "categories": _encode_categories(df[col].cat.categories)})
+        _write_json(os.path.join(tmp_dir, META_FILE),
+                    {"version": CACHE_VERSION, "rows": len(df), "columns": columns})
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(entry_dir):
+            raise
+
+def read_entry(entry_dir):
+    """
+    Liest einen Cache-Eintrag; die Code-Arrays werden per Memory-Mapping eingebunden.
+    Liefert None, wenn der Eintrag fehlt oder unvollständig ist.
+    """
+    meta = _read_json(os.path.join(entry_dir, META_FILE))
+    if not meta or meta.get("version") != CACHE_VERSION:
+        return None
+    data = {}
+    try:
+        for j, column in enumerate(meta["columns"]):
+            codes = np.load(os.path.join(entry_dir, f"{j}.npy"), mmap_mode="r")
+            categories = _decode_categories(column["categories"])
+            # Ohne Validierung und Kopie, damit die Codes im Memory-Mapping bleiben
+            dtype = pd.CategoricalDtype(categories)
+            data[column["name"]] = pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+    except (OSError, ValueError):
+        return None
+    # Zugriffszeit für die LRU-Verdrängung festhalten; in einem schreibgeschützten oder
+    # fremden Cache-Verzeichnis bleibt die alte Zeit stehen
+    now = time.time()
+    try:
+        os.utime(os.path.join(entry_dir, META_FILE), (now, now))
+    except OSError:
+        pass
+    return pd.DataFrame(data, columns=[column["name"] for column in meta["columns"]], copy=False)
+
+def _entry_size(entry_dir):
+    return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+
+def prune_index(cache_dir):
+    """Entfernt Index-Dateien, deren Eintrag verdrängt wurde oder deren Quelldatei fehlt."""
+    index_dir = os.path.join(cache_dir, INDEX_DIR)
+    if not os.path.isdir(index_dir):
+        return
+    for entry in os.scandir(index_dir):
+        if not entry.name.endswith(".json"):
+            continue
+        known = _read_json(entry.path) or {}
+        entry_dir = os.path.join(cache_dir, f"v{CACHE_VERSION}-{known.get('hash')}")
+        if not os.path.exists(known.get("path", "")) or not os.path.isdir(entry_dir):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+def evict(cache_dir, max_bytes):
+    """
+    Löscht die am längsten nicht benutzten Einträge, bis max_bytes eingehalten ist, und
+    danach die Index-Dateien ohne Eintrag (prune_index).
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and not entry.name.startswith(".") and entry.name != INDEX_DIR:
+            meta = os.path.join(entry.path, META_FILE)
+            last_used = os.stat(meta).st_mtime if os.path.exists(meta) else 0
+            entries.append((last_used, entry.path, _entry_size(entry.path)))
+    total = sum(size for _, _, size in entries)
+    for _, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+    prune_index(cache_dir)
+
+def load_cached(filename, parse, verbose=True, cache_dir=None, max_bytes=None):
+    """
+    Liefert den Datensatz aus dem Cache oder parst ihn mit parse(filename) und legt
+    ihn anschließend im Cache ab. Fehler beim Schreiben des Caches werden ignoriert.
+    Mit DM_CACHE=0 wird nur geparst.
+    """
+    if not cache_enabled():
+        return parse(filename)
+    cache_dir = cache_dir or default_cache_dir()
+    max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        entry_dir = os.path.join(cache_dir, source_key(filename, cache_dir))
+    except OSError:
+        return parse(filename)
+
+    df = read_entry(entry_dir)
+    if df is not None:
+        if verbose:
+            print("Datei aus dem Cache geladen!")
+        return df
+
+    df = parse(filename)
+    try:
+        write_entry(entry_dir, df)
+        evict(cache_dir, max_bytes)
+    except OSError:
+        pass
+    return df
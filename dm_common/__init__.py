@@ -0,0 +1,34 @@
+"""
+Gemeinsame Terminal-Helfer der Skripte (ID3_cli.py für ID3.py und ID3_nxtree.py sowie
+NaiveBayes.py).
+
+  terminal  farbige Ausgabe, Warten auf Enter, Auswahl von Quell-Datei und Zielvariable
+
+Das Paket hängt nur von der Standardbibliothek ab und importiert keine Skript-Module;
+"python3 ID3.py --help" oder die erste Eingabeaufforderung kommen damit ohne pandas,
+numpy, Graphviz und matplotlib aus. Die Namen werden erst beim ersten Zugriff aus ihrem
+Modul geladen (PEP 562).
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "print_green": "terminal",
+    "print_red": "terminal",
+    "input_lightblue": "terminal",
+    "wait_for_enter": "terminal",
+    "select_file": "terminal",
+    "select_target_variable": "terminal",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
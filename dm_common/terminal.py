@@ -0,0 +1,63 @@
+"""
+Terminal-Helfer der interaktiven Skripte: farbige Ausgabe und Eingaben.
+Nur Standardbibliothek, damit die erste Eingabeaufforderung sofort erscheint.
+"""
+import os
+import sys
+
+GREEN = "\033[92m"
+RED = "\033[91m"
+LIGHTBLUE = "\033[94m"
+END = "\033[0m"
+
+def _print_colored(color, args, kwargs):
+    sep = kwargs.pop("sep", " ")
+    end = kwargs.pop("end", "\n")
+    file = kwargs.pop("file", sys.stdout)
+    message = sep.join(str(arg) for arg in args)
+    file.write(color + message + END + end)
+    file.flush()
+
+def print_green(*args, **kwargs):
+    _print_colored(GREEN, args, kwargs)
+
+def print_red(*args, **kwargs):
+    _print_colored(RED, args, kwargs)
+
+def input_lightblue(prompt):
+    return input(LIGHTBLUE + prompt + END)
+
+def wait_for_enter(pause=True):
+    if pause:
+        input_lightblue("Enter zum Fortfahren...")
+
+def select_file(title):
+    """Gibt title aus und fragt so lange nach einer Quell-Datei, bis sie lesbar ist."""
+    print_green(title)
+    while True:
+        filename = input("Bitte Quell-Datei angeben (CSV oder Excel): ").strip()
+        # Prüfe, ob die Datei existiert und lesbar ist
+        if not os.path.exists(filename):
+            print_red("Fehler: Datei nicht gefunden.\n")
+            continue
+        if not os.access(filename, os.R_OK):
+            print_red("Fehler: Datei nicht lesbar.\n")
+            continue
+        return filename
+
+def select_target_variable(df, title):
+    """Gibt title aus, listet die Spalten von df und fragt nach der Zielvariable."""
+    print_green(title)
+    while True:
+        # Prüfen, ob genügend Spalten vorhanden sind
+        if len(df.columns) <= 1:
+            print_red("Nicht genügend Elemente gefunden, bitte Quelldatei oder Separator überprüfen")
+            sys.exit(1)
+        print("Gefundene Variablen:")
+        for idx, col in enumerate(df.columns):
+            print(f"  {idx}: {col}")
+        try:
+            target_index = int(input("Bitte Zielvariable auswählen: "))
+            return df.columns[target_index]
+        except (IndexError, ValueError):
+            print_red("Ungültige Zielvariable:")
@@ -0,0 +1,567 @@
+"""
+Lokaler Vorhersage-Dienst mit vorab geladenen ID3- und Naive-Bayes-Modellen.
+
+Die Modelle werden beim Start einmal geladen bzw. gezählt (ID3: gespeicherter Baum aus
+ID3.py --model oder Aufbau aus einer Datei, Naive Bayes: Zähltabellen aus einer Datei)
+und danach für alle Anfragen wiederverwendet. Der Dienst läuft mit asyncio und kommt
+ohne weitere Abhängigkeiten aus (einfaches HTTP/1.1 mit JSON, Keep-Alive).
+
+    GET  /health                       {"status": "ok"}
+    GET  /models                       Modelle mit Art, Zielvariable, Klassen, Attributen
+    GET  /stats                        Latenz-Perzentile je Route und Batch-Statistik
+    POST /models/NAME/predict          {"sample": {Attribut: Wert}} -> ein Ergebnis
+    POST /models/NAME/predict_batch    {"rows": [{Attribut: Wert}, ...]} -> {"results": [...]}
+
+Ein Ergebnis enthält die Vorhersage ("prediction"), bei Naive Bayes zusätzlich die
+Wahrscheinlichkeiten je Klasse ("probabilities", im Logarithmus wie predict_proba).
+
+Gleichzeitige Anfragen an dasselbe Modell werden gesammelt (MicroBatcher): was bis zum
+Ende der laufenden Bewertung bzw. innerhalb von max_wait eintrifft, wird als ein
+DataFrame bewertet. Bewertet wird in einem Thread-Pool, die Ereignisschleife bleibt
+frei. Schlägt eine gesammelte Bewertung fehl, wird jede Anfrage einzeln bewertet; nur
+die fehlerhafte erhält dann einen Fehler.
+
+Große Batch-Anfragen (Rumpf über LARGE_PAYLOAD_BYTES) laufen an der Sammlung vorbei:
+ein Prozess-Pool dekodiert, bewertet und kodiert sie vollständig (score_batch_body; die
+Modelle erhalten die Worker einmal beim Start). json und pandas halten dabei den GIL -
+in einem Thread würden Ereignisschleife und Einzelanfragen so lange warten, im eigenen
+Prozess nicht. Mit batch_processes=0 laufen auch große Batches im Thread-Pool (in
+Blöcken, mit (De)Kodierung im Thread); Einzelanfragen können dann warten.
+
+    python3 inference_server.py --id3 tennis=baum.id3 --nb tennis_nb=ID3_play_tennis.csv:Play
+    python3 inference_server.py --nb nb=ID3_play_tennis.csv:Play --self-check ID3_play_tennis.csv
+
+--self-check startet den Dienst auf einem freien lokalen Port, schickt die Zeilen einer
+Datei gleichzeitig als Einzel- und Batch-Anfragen und vergleicht die Antworten mit der
+direkten Bewertung (Exit-Code 1 bei Abweichungen).
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_file
+from ID3_model import compile_tree, load_model
+from ID3_parallel import build_id3_tree_parallel
+from NaiveBayes_model import fit_naive_bayes_csv, normalize_log
+
+MAX_BODY_BYTES = 256 * 2**20
+# Ab dieser Größe werden Batch-Anfragen im Prozess-Pool bearbeitet bzw. ohne ihn im
+# Thread-Pool dekodiert (Antworten ab max_batch Zeilen)
+LARGE_PAYLOAD_BYTES = 256 * 1024
+# Zeilen je Bewertung bei großen Batches
+BATCH_BLOCK_ROWS = 10000
+LATENCY_WINDOW = 10000
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def encode_json(payload):
+    return json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+class ServedModel:
+    """Ein geladenes Modell: kind ist "id3" (CompiledTree) oder "nb" (NaiveBayesModel)."""
+    def __init__(self, name, kind, model, target_var=None, smoothing=1):
+        self.name = name
+        self.kind = kind
+        self.model = model
+        self.target_var = target_var if kind == "id3" else model.target_var
+        self.smoothing = smoothing
+        self._labels = np.array(model.classes, dtype=object)
+
+    def describe(self):
+        return {"name": self.name, "kind": self.kind, "target": self.target_var,
+                "classes": list(self.model.classes), "attributes": list(self.model.attributes)}
+
+    def validate(self, rows):
+        """Prüft die Zeilen einer Anfrage, bevor sie mit anderen gesammelt werden."""
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("Fälle müssen Objekte {Attribut: Wert} sein")
+        for row in rows:
+            nested = [attribute for attribute, value in row.items() if isinstance(value, (list, dict))]
+            if nested:
+                raise ValueError(f"Werte müssen einzelne Zahlen oder Texte sein: {nested}")
+        if self.kind == "nb":
+            for row in rows:
+                missing = [attribute for attribute in self.model.attributes if attribute not in row]
+                if missing:
+                    raise ValueError(f"Attribute fehlen: {missing}")
+
+    def score(self, rows):
+        """Bewertet eine Liste von Fällen; liefert je Fall ein Ergebnis-Dictionary."""
+        df = pd.DataFrame.from_records(rows)
+        if self.kind == "id3":
+            return [{"prediction": prediction} for prediction in self.model.predict(df).tolist()]
+        log_likelihoods = self.model.log_likelihoods(self.model.encode(df), self.smoothing)
+        predictions = self._labels[np.argmax(log_likelihoods, axis=1)].tolist()
+        posteriors = normalize_log(log_likelihoods).tolist()
+        return [{"prediction": prediction, "probabilities": dict(zip(self.model.classes, p))}
+                for prediction, p in zip(predictions, posteriors)]
+
+# Modelle in den Worker-Prozessen großer Batches ({Name: ServedModel})
+_WORKER_MODELS = {}
+
+def _init_batch_worker(models):
+    _WORKER_MODELS.update(models)
+
+def score_batch_body(name, body, block_rows=BATCH_BLOCK_ROWS):
+    """
+    Bearbeitet eine Batch-Anfrage vollständig in einem Worker-Prozess: JSON dekodieren,
+    Zeilen prüfen, in Blöcken bewerten, Antwort kodieren. Liefert den Antwort-Rumpf.
+    """
+    served = _WORKER_MODELS[name]
+    request = json.loads(body)
+    rows = request.get("rows") if isinstance(request, dict) else None
+    served.validate(rows)
+    results = []
+    for start in range(0, len(rows), block_rows):
+        results.extend(served.score(rows[start:start + block_rows]))
+    return encode_json({"results": results})
+
+class LatencyStats:
+    """Laufzeiten der letzten LATENCY_WINDOW Anfragen je Route."""
+    def __init__(self):
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, route, seconds):
+        self._samples.setdefault(route, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+        self._counts[route] = self._counts.get(route, 0) + 1
+
+    def summary(self):
+        result = {}
+        for route, samples in self._samples.items():
+            p50, p90, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), [50, 90, 99])
+            result[route] = {"count": self._counts[route], "p50_ms": p50 * 1e3,
+                             "p90_ms": p90 * 1e3, "p99_ms": p99 * 1e3,
+                             "max_ms": max(samples) * 1e3}
+        return result
+
+class MicroBatcher:
+    """
+    Sammelt gleichzeitige Anfragen an ein Modell und bewertet sie gemeinsam im
+    Thread-Pool: höchstens max_batch Zeilen, nach dem ersten Fall wird bis zu
+    max_wait Sekunden auf weitere gewartet.
+    """
+    def __init__(self, served, executor, max_batch=256, max_wait=0.002):
+        self.served = served
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    def _drain(self, items, size):
+        while size < self.max_batch and not self._queue.empty():
+            item = self._queue.get_nowait()
+            items.append(item)
+            size += len(item[0])
+        return size
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            size = self._drain(items, len(items[0][0]))
+            if size < self.max_batch and self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)
+                size = self._drain(items, size)
+            rows = [row for request_rows, _ in items for row in request_rows]
+            try:
+                results = await loop.run_in_executor(self.executor, self.served.score, rows)
+            except Exception as e:
+                if len(items) == 1:
+                    _resolve(items[0][1], exception=e)
+                else:
+                    # Jede Anfrage einzeln bewerten, damit nur die fehlerhafte scheitert
+                    await self._score_each(items)
+                continue
+            self.batches += 1
+            self.rows += size
+            start = 0
+            for request_rows, future in items:
+                _resolve(future, results[start:start + len(request_rows)])
+                start += len(request_rows)
+
+    async def _score_each(self, items):
+        loop = asyncio.get_running_loop()
+        for request_rows, future in items:
+            try:
+                results = await loop.run_in_executor(self.executor, self.served.score, request_rows)
+            except Exception as e:
+                _resolve(future, exception=e)
+                continue
+            self.batches += 1
+            self.rows += len(request_rows)
+            _resolve(future, results)
+
+def _resolve(future, result=None, exception=None):
+    """Setzt Ergebnis bzw. Fehler, sofern die Anfrage nicht schon abgebrochen wurde."""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+class InferenceServer:
+    """
+    HTTP-Dienst für die Modelle in models ({Name: ServedModel}), siehe Modulbeschreibung.
+    workers: Threads für die Bewertung; max_batch, max_wait: siehe MicroBatcher.
+    batch_processes: Prozesse für große Batch-Anfragen (0 = im Thread-Pool).
+    """
+    def __init__(self, models, workers=None, max_batch=256, max_wait=0.002, batch_processes=1):
+        self.models = models
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.batch_processes = batch_processes
+        self.latency = LatencyStats()
+        self.executor = None
+        self.batch_pool = None
+        self.batchers = {}
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Startet den Dienst; liefert den tatsächlich verwendeten Port (bei port=0)."""
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        if self.batch_processes > 0:
+            # spawn statt fork: der Dienst hat zu diesem Zeitpunkt schon Threads
+            self.batch_pool = ProcessPoolExecutor(
+                max_workers=self.batch_processes, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker, initargs=(self.models,))
+            # Ersten Worker schon jetzt starten, nicht erst mit der ersten großen Anfrage
+            self.batch_pool.submit(os.getpid)
+        self.batchers = {name: MicroBatcher(served, self.executor, self.max_batch, self.max_wait)
+                         for name, served in self.models.items()}
+        for batcher in self.batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        if self.batch_pool is not None:
+            self.batch_pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "latency": self.latency.summary(),
+            "batching": {name: {"batches": batcher.batches, "rows": batcher.rows,
+                                "mean_rows": batcher.rows / batcher.batches if batcher.batches else 0.0}
+                         for name, batcher in self.batchers.items()},
+        }
+
+    # --- HTTP -----------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path = request_line.decode("latin-1").split()[:2]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Anfrage zu groß"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                start = perf_counter()
+                route, status, payload = await self._dispatch(method, path.split("?")[0], body)
+                close = headers.get("connection", "").lower() == "close"
+                await self._respond(writer, status, payload, close)
+                self.latency.record(route, perf_counter() - start)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, close=False):
+        """payload ist ein Dictionary oder ein bereits kodierter Rumpf (bytes)."""
+        if isinstance(payload, bytes):
+            body = payload
+        elif len(payload.get("results", ())) > self.max_batch:
+            body = await asyncio.get_running_loop().run_in_executor(self.executor, encode_json, payload)
+        else:
+            body = encode_json(payload)
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        """Liefert (Route für die Statistik, Status, Antwort)."""
+        parts = [part for part in path.split("/") if part]
+        if parts in (["health"], ["models"], ["stats"]):
+            route = f"GET /{parts[0]}"
+            if method != "GET":
+                return route, 405, {"error": "Nur GET erlaubt"}
+            if parts == ["health"]:
+                return route, 200, {"status": "ok"}
+            if parts == ["models"]:
+                return route, 200, {"models": [served.describe() for served in self.models.values()]}
+            return route, 200, self.stats()
+        if len(parts) == 3 and parts[0] == "models" and parts[2] in ("predict", "predict_batch"):
+            route = f"POST /models/*/{parts[2]}"
+            if method != "POST":
+                return route, 405, {"error": "Nur POST erlaubt"}
+            served = self.models.get(parts[1])
+            if served is None:
+                return route, 404, {"error": f"Unbekanntes Modell '{parts[1]}'"}
+            try:
+                if parts[2] == "predict":
+                    request = await self._decode(body)
+                    rows = [request.get("sample")] if isinstance(request, dict) else None
+                    served.validate(rows)
+                    return route, 200, (await self.batchers[served.name].submit(rows))[0]
+                if self.batch_pool is not None and len(body) > LARGE_PAYLOAD_BYTES:
+                    return route, 200, await asyncio.get_running_loop().run_in_executor(
+                        self.batch_pool, score_batch_body, served.name, body)
+                request = await self._decode(body)
+                rows = request.get("rows") if isinstance(request, dict) else None
+                served.validate(rows)
+                return route, 200, {"results": await self._score_batch(served, rows)}
+            except ValueError as e:
+                return route, 400, {"error": str(e)}
+            except Exception as e:
+                return route, 500, {"error": f"{type(e).__name__}: {e}"}
+        return "andere", 404, {"error": f"Unbekannte Route {method} {path}"}
+
+    async def _decode(self, body):
+        if len(body) > LARGE_PAYLOAD_BYTES:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, json.loads, body)
+        return json.loads(body)
+
+    async def _score_batch(self, served, rows):
+        """Kleine Batches laufen über die Sammlung, große in Blöcken direkt im Thread-Pool."""
+        if len(rows) <= self.max_batch:
+            return await self.batchers[served.name].submit(rows)
+        loop = asyncio.get_running_loop()
+        block = max(self.max_batch, BATCH_BLOCK_ROWS)
+        results = []
+        for start in range(0, len(rows), block):
+            results.extend(await loop.run_in_executor(self.executor, served.score,
+                                                      rows[start:start + block]))
+        return results
+
+# --- Laden der Modelle ------------------------------------------------------------
+
+def _split_spec(spec):
+    """NAME=DATEI[:ZIEL] -> (Name, Datei, Ziel oder None)."""
+    name, sep, rest = spec.partition("=")
+    if not sep or not name or not rest:
+        raise ValueError(f"Erwartet NAME=DATEI[:ZIEL], nicht '{spec}'")
+    filename, sep, target_var = rest.rpartition(":")
+    if not sep or not filename or os.sep in target_var or "/" in target_var:
+        return name, rest, None
+    return name, filename, target_var
+
+def load_id3(spec, use_cache=True):
+    """Gespeicherter Baum (NAME=baum.id3) oder Aufbau ohne Ausgabe (NAME=daten.csv:ZIEL)."""
+    name, filename, target_var = _split_spec(spec)
+    if target_var is None:
+        return ServedModel(name, "id3", load_model(filename))
+    df = load_file(filename, verbose=False, use_cache=use_cache)
+    if target_var not in df.columns:
+        raise ValueError(f"Zielvariable '{target_var}' nicht gefunden. Vorhanden: {list(df.columns)}")
+    attributes = [col for col in df.columns if col != target_var]
+    tree = build_id3_tree_parallel(df, attributes, target_var, processes=1)
+    return ServedModel(name, "id3", compile_tree(tree), target_var)
+
+def load_nb(spec, smoothing=1, chunksize=100000):
+    """Naive Bayes aus einer Datei zählen (NAME=daten.csv:ZIEL, blockweise gelesen)."""
+    name, filename, target_var = _split_spec(spec)
+    if target_var is None:
+        raise ValueError(f"Für Naive Bayes wird NAME=DATEI:ZIEL erwartet, nicht '{spec}'")
+    return ServedModel(name, "nb", fit_naive_bayes_csv(filename, target_var, chunksize),
+                       smoothing=smoothing)
+
+# --- Selbsttest -------------------------------------------------------------------
+
+async def _request(host, port, method, path, payload=None, connection=None):
+    """Eine HTTP-Anfrage; connection ist ein offenes (reader, writer)-Paar oder None."""
+    reader, writer = connection or await asyncio.open_connection(host, port)
+    body = encode_json(payload) if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if connection is None:
+        writer.close()
+    return status, response
+
+def _same(expected, actual):
+    if expected["prediction"] != actual["prediction"]:
+        return False
+    for cls, p in expected.get("probabilities", {}).items():
+        q = actual["probabilities"].get(str(cls))
+        if q is None or not math.isclose(p, q, rel_tol=1e-12, abs_tol=1e-15):
+            return False
+    return True
+
+async def self_check(server, filename, clients=16, batch_rows=20000):
+    """
+    Selbsttest gegen eine lokale Instanz (siehe Modulbeschreibung). Liefert die Anzahl
+    abweichender Antworten.
+    """
+    df = load_file(filename, verbose=False)
+    df = df.astype(object).where(df.notna(), None)
+    # JSON-Rundreise, damit die direkte Bewertung dieselben Werte sieht wie der Dienst
+    rows = json.loads(encode_json(df.to_dict("records")))
+    host = "127.0.0.1"
+    port = await server.start(host, 0)
+    failures = 0
+    try:
+        for served in server.models.values():
+            rows_for_model = [{k: v for k, v in row.items() if k != served.target_var} for row in rows]
+            expected = served.score(rows_for_model)
+            large = (rows_for_model * (batch_rows // len(rows_for_model) + 1))[:batch_rows]
+
+            async def client(offset):
+                connection = await asyncio.open_connection(host, port)
+                mismatches = 0
+                for i in range(offset, len(rows_for_model), clients):
+                    status, result = await _request(host, port, "POST",
+                                                    f"/models/{served.name}/predict",
+                                                    {"sample": rows_for_model[i]}, connection)
+                    mismatches += status != 200 or not _same(expected[i], result)
+                connection[1].close()
+                return mismatches
+
+            async def large_batch():
+                status, result = await _request(host, port, "POST",
+                                                f"/models/{served.name}/predict_batch",
+                                                {"rows": large})
+                if status != 200 or len(result["results"]) != len(large):
+                    return 1
+                return sum(not _same(expected[i % len(expected)], actual)
+                           for i, actual in enumerate(result["results"]))
+
+            start = perf_counter()
+            counts = await asyncio.gather(large_batch(), *(client(k) for k in range(clients)))
+            failures += sum(counts)
+            print(f"{served.name} ({served.kind}): {len(rows_for_model)} Einzelanfragen in "
+                  f"{clients} Verbindungen und ein Batch mit {len(large)} Zeilen in "
+                  f"{perf_counter() - start:.3f} s, {sum(counts)} Abweichungen")
+        status, stats = await _request(host, port, "GET", "/stats")
+        for route, entry in sorted(stats["latency"].items()):
+            print(f"  {route}: {entry['count']} Anfragen, p50 {entry['p50_ms']:.2f} ms, "
+                  f"p90 {entry['p90_ms']:.2f} ms, p99 {entry['p99_ms']:.2f} ms")
+        for name, entry in stats["batching"].items():
+            print(f"  Sammlung {name}: {entry['batches']} Bewertungen, "
+                  f"im Mittel {entry['mean_rows']:.1f} Zeilen")
+    finally:
+        await server.stop()
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vorhersage-Dienst für ID3 und Naive Bayes")
+    parser.add_argument("--id3", action="append", default=[], metavar="NAME=DATEI[:ZIEL]",
+                        help="ID3-Modell: gespeicherter Baum (.id3) oder Datei mit Zielvariable")
+    parser.add_argument("--nb", action="append", default=[], metavar="NAME=DATEI:ZIEL",
+                        help="Naive-Bayes-Modell aus einer Datei mit Zielvariable")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port (Standard: 8080)")
+    parser.add_argument("--smoothing", type=float, default=1,
+                        help="LaPlace-Korrektur für Naive Bayes (Standard: 1, 0 = ohne)")
+    parser.add_argument("--workers", type=int, help="Threads für die Bewertung")
+    parser.add_argument("--batch-processes", type=int, default=1,
+                        help="Prozesse für große Batch-Anfragen (Standard: 1, 0 = im Thread-Pool)")
+    parser.add_argument("--max-batch", type=int, default=256,
+                        help="Höchstens so viele Zeilen je gesammelter Bewertung (Standard: 256)")
+    parser.add_argument("--max-wait-ms", type=float, default=2,
+                        help="Wartezeit auf weitere Anfragen je Sammlung (Standard: 2 ms)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Dateien immer neu einlesen, ohne Cache (siehe dataset_cache.py)")
+    parser.add_argument("--self-check", metavar="DATEI",
+                        help="Lokale Instanz starten, mit den Zeilen der Datei prüfen und beenden")
+    args = parser.parse_args(argv)
+    if not args.id3 and not args.nb:
+        parser.error("Mindestens ein Modell mit --id3 oder --nb angeben")
+
+    try:
+        models = [load_id3(spec, use_cache=not args.no_cache) for spec in args.id3]
+        models += [load_nb(spec, args.smoothing) for spec in args.nb]
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        sys.exit(1)
+    server = InferenceServer({served.name: served for served in models}, workers=args.workers,
+                             max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+                             batch_processes=args.batch_processes)
+
+    if args.self_check:
+        failures = asyncio.run(self_check(server, args.self_check))
+        sys.exit(1 if failures else 0)
+
+    async def serve():
+        port = await server.start(args.host, args.port)
+        print(f"Dienst läuft auf http://{args.host}:{port} mit {', '.join(server.models)}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from data_loader import load_file, read_csv_chunks, read_csv_rows
+
+def write(tmp_path, text, encoding="utf-8"):
+    path = tmp_path / "daten.csv"
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+def test_load_file_reads_categories_with_pandas_value_types(tmp_path):
+    path = write(tmp_path, "Zahl;Text ;Komma;Wahr;Lücke;Leer\n"
+                           "10; x ;1.5;True;1;\n"
+                           "9;y;2;False;;\n"
+                           "10; x;3e2;True;3;\n")
+    df = load_file(path, verbose=False)
+    assert list(df.columns) == ["Zahl", "Text", "Komma", "Wahr", "Lücke", "Leer"]
+    assert all(isinstance(df[col].dtype, pd.CategoricalDtype) for col in df.columns)
+    expected = {
+        "Zahl": ([9, 10], [1, 0, 1]),
+        "Text": (["x", "y"], [0, 1, 0]),
+        "Komma": ([1.5, 2.0, 300.0], [0, 1, 2]),
+        "Wahr": ([False, True], [1, 0, 1]),
+        "Lücke": ([1.0, 3.0], [0, -1, 1]),
+        "Leer": ([], [-1, -1, -1]),
+    }
+    for col, (categories, codes) in expected.items():
+        assert list(df[col].cat.categories) == categories, col
+        assert list(df[col].cat.codes) == codes, col
+    assert df["Zahl"].cat.categories.dtype == np.int64
+    assert df["Lücke"].cat.categories.dtype == np.float64
+    assert df["Leer"].cat.categories.dtype == np.float64
+
+def test_load_file_matches_read_csv_without_dtype(tmp_path):
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame({
+        "a": rng.choice(["rot", " grün", "blau "], 200),
+        "b": rng.integers(0, 30, 200),
+        "c": rng.choice(["1.25", "2", "NA"], 200),
+    })
+    path = write(tmp_path, frame.to_csv(sep="\t", index=False), encoding="utf-8-sig")
+    expected = pd.read_csv(path, sep="\t", encoding="utf-8-sig", skipinitialspace=True)
+    expected["a"] = expected["a"].str.strip()
+    df = load_file(path, verbose=False)
+    for col in expected.columns:
+        pd.testing.assert_series_equal(df[col].astype(expected[col].dtype), expected[col])
+
+SPACED = ("Farbe; Zahl ; Notiz\n"
+          "rot; 1; \"a;b\"\n"
+          " grün ; NA;x\n"
+          "rot;2 ; \"c\"\n")
+
+def read_whole_chunk(path):
+    chunks = list(read_csv_chunks(path, chunksize=100))
+    assert len(chunks) == 1
+    return chunks[0]
+
+@pytest.mark.parametrize("reader", [lambda path: load_file(path, verbose=False), read_csv_rows,
+                                    read_whole_chunk], ids=["load_file", "rows", "chunks"])
+def test_csv_readers_share_parse_options(tmp_path, reader):
+    # BOM, Semikolon, Leerzeichen nach dem Trennzeichen (auch vor "NA" und Anführungszeichen)
+    df = reader(write(tmp_path, SPACED, encoding="utf-8-sig"))
+    assert list(df.columns) == ["Farbe", "Zahl", "Notiz"]
+    assert list(df["Farbe"].astype(object)) == ["rot", "grün", "rot"]
+    assert list(df["Zahl"].cat.categories) == [1.0, 2.0]
+    assert list(df["Zahl"].cat.codes) == [0, -1, 1]
+    assert list(df["Notiz"].astype(object)) == ["a;b", "x", "c"]
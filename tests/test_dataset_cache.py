@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataset_cache
+from data_loader import load_file
+
+def _write_csv(path, values):
+    pd.DataFrame({"Wetter": values, "Spielen": ["ja", "nein"][:len(values)]}).to_csv(path, index=False)
+    return str(path)
+
+def test_read_entry_survives_failing_utime(tmp_path, monkeypatch):
+    path = tmp_path / "daten.csv"
+    pd.DataFrame({"Wetter": ["sonnig", "Regen"], "Spielen": ["ja", "nein"]}).to_csv(path, index=False)
+    monkeypatch.setenv("DM_CACHE_DIR", str(tmp_path / "cache"))
+    first = load_file(str(path), verbose=False, use_cache=True)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("schreibgeschützt")
+
+    monkeypatch.setattr(os, "utime", read_only)
+    cached = load_file(str(path), verbose=False, use_cache=True)
+    # Aus dem Cache (Codes im Memory-Mapping), nicht neu geparst
+    assert isinstance(cached["Wetter"].array.codes, np.memmap)
+    assert cached.to_dict("list") == first.to_dict("list")
+
+def test_index_has_one_file_per_source(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DM_CACHE_DIR", str(cache_dir))
+    first = _write_csv(tmp_path / "a.csv", ["sonnig", "Regen"])
+    second = _write_csv(tmp_path / "b.csv", ["Regen", "bewölkt"])
+    keys = {dataset_cache.source_key(name, str(cache_dir)) for name in (first, second)}
+    index = [dataset_cache._read_json(str(entry)) for entry in (cache_dir / "index").iterdir()]
+    assert sorted(known["path"] for known in index) == [first, second]
+    assert {f"v{dataset_cache.CACHE_VERSION}-{known['hash']}" for known in index} == keys
+
+def test_evict_prunes_index(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DM_CACHE_DIR", str(cache_dir))
+    kept = _write_csv(tmp_path / "a.csv", ["sonnig", "Regen"])
+    removed = _write_csv(tmp_path / "b.csv", ["Regen", "bewölkt"])
+    for name in (kept, removed):
+        load_file(name, verbose=False, use_cache=True)
+    assert len(list((cache_dir / "index").iterdir())) == 2
+
+    # Quelldatei gelöscht: ihr Index-Eintrag verschwindet beim nächsten Aufräumen
+    os.remove(removed)
+    dataset_cache.evict(str(cache_dir), dataset_cache.DEFAULT_MAX_BYTES)
+    assert [dataset_cache._read_json(str(entry))["path"]
+            for entry in (cache_dir / "index").iterdir()] == [kept]
+
+    # Eintrag verdrängt: auch der Index-Eintrag wird entfernt
+    dataset_cache.evict(str(cache_dir), 0)
+    assert list((cache_dir / "index").iterdir()) == []
+    assert [entry.name for entry in cache_dir.iterdir()] == ["index"]
+
+def test_cache_can_be_disabled_by_environment(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DM_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("DM_CACHE", "0")
+    name = _write_csv(tmp_path / "a.csv", ["sonnig", "Regen"])
+    df = load_file(name, verbose=False, use_cache=True)
+    assert df["Wetter"].tolist() == ["sonnig", "Regen"]
+    assert not cache_dir.exists()
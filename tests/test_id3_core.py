@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from ID3_core import best_threshold, encode_dataset
+from ID3_model import compile_tree
+from ID3_parallel import build_id3_tree_parallel
+
+def test_best_threshold_between_class_blocks():
+    values = np.array([1.0, 2.0, 3.0, 10.0, 11.0, 12.0])
+    threshold, matrix = best_threshold(values, np.array([0, 0, 0, 1, 1, 1]), 2)
+    assert threshold == 6.5
+    np.testing.assert_array_equal(matrix, [[3, 0], [0, 3]])
+
+def test_best_threshold_prefers_smallest_on_tie():
+    # Beide Schnitte trennen eine reine Gruppe von 1 Zeile ab
+    values = np.array([1.0, 2.0, 3.0])
+    threshold, matrix = best_threshold(values, np.array([0, 1, 0]), 2)
+    assert threshold == 1.5
+    np.testing.assert_array_equal(matrix, [[1, 0], [1, 1]])
+
+def test_best_threshold_of_adjacent_floats_is_lower_value():
+    low = 1.0
+    high = np.nextafter(low, 2.0)
+    threshold, _ = best_threshold(np.array([low, high]), np.array([0, 1]), 2)
+    assert threshold == low
+    assert low <= threshold < high
+
+def test_best_threshold_without_cut():
+    assert best_threshold(np.array([4.0, 4.0, 4.0]), np.array([0, 1, 0]), 2) is None
+
+def test_numeric_split_labels_and_prediction_on_threshold():
+    df = pd.DataFrame({
+        "Temperatur": [64, 65, 68, 69, 70, 72, 75, 80, 83, 85],
+        "Spielen": ["ja", "ja", "ja", "ja", "ja", "nein", "nein", "nein", "nein", "nein"],
+    })
+    tree = build_id3_tree_parallel(df, ["Temperatur"], "Spielen", processes=1,
+                                   numeric_attributes=["Temperatur"])
+    assert tree["attribute"] == "Temperatur"
+    assert tree["threshold"] == 71.0
+    assert list(tree["branches"]) == ["<= 71", "> 71"]
+    assert tree["branches"]["<= 71"] == {"leaf": True, "class": "ja", "num_samples": 5}
+    assert tree["branches"]["> 71"] == {"leaf": True, "class": "nein", "num_samples": 5}
+
+    # Werte genau auf der Schwelle gehören zum Zweig "<="
+    compiled = compile_tree(tree)
+    queries = pd.DataFrame({"Temperatur": [70, 71, 71.0, np.nextafter(71.0, 72.0), 72]})
+    assert list(compiled.predict(queries)) == ["ja", "ja", "ja", "nein", "nein"]
+
+def test_numeric_threshold_on_data_value():
+    # Direkt benachbarte float-Werte: die Schwelle ist der untere Wert selbst
+    low = 0.1
+    high = np.nextafter(low, 1.0)
+    df = pd.DataFrame({"x": [low, low, high, high], "y": ["a", "a", "b", "b"]})
+    tree = build_id3_tree_parallel(df, ["x"], "y", processes=1, numeric_attributes=["x"])
+    assert tree["threshold"] == low
+    assert list(compile_tree(tree).predict(df)) == ["a", "a", "b", "b"]
+
+def frame(counts):
+    """DataFrame mit Spalte "Wert" und Ziel "Klasse" aus {Wert: (Anzahl "ja", Anzahl "nein")}."""
+    rows = [(value, cls) for value, (yes, no) in counts.items()
+            for cls in ["ja"] * yes + ["nein"] * no]
+    return pd.DataFrame(rows, columns=["Wert", "Klasse"])
+
+def binned(df, max_bins, method, max_gain_loss=None):
+    encoded = encode_dataset(df, ["Wert"], "Klasse", max_bins=max_bins, bin_method=method,
+                             max_gain_loss=max_gain_loss)
+    codes = encoded.attr_codes[:, encoded.columns["Wert"]]
+    labels = [encoded.categories["Wert"][code] for code in codes]
+    return encoded, dict(zip(df["Wert"], labels))
+
+def test_frequency_bins_keep_most_frequent_values():
+    df = frame({"A": (5, 0), "B": (0, 4), "C": (3, 0), "D": (1, 1), "E": (1, 0), "F": (0, 1)})
+    encoded, label_of = binned(df, 3, "frequency")
+    assert encoded.categories["Wert"] == ["A", "B", "Sonstige (4 Werte)"]
+    assert encoded.groups["Wert"] == {"Sonstige (4 Werte)": ["C", "D", "E", "F"]}
+    assert label_of == {"A": "A", "B": "B", "C": "Sonstige (4 Werte)", "D": "Sonstige (4 Werte)",
+                        "E": "Sonstige (4 Werte)", "F": "Sonstige (4 Werte)"}
+
+def test_target_bins_cut_by_class_rate_into_equal_row_groups():
+    # Anteil der Mehrheitsklasse ("ja"): A 1.0, B 0.75, E 0.5, C 0.25, D 0.0, je 4 Zeilen
+    df = frame({"A": (4, 0), "B": (3, 1), "C": (1, 3), "D": (0, 4), "E": (2, 2)})
+    encoded, label_of = binned(df, 2, "target")
+    # Sortiert nach Anteil: D, C, E | B, A - Schnitt nach 10 von 20 Zeilen
+    assert encoded.categories["Wert"] == ["Gruppe 1 (3 Werte)", "Gruppe 2 (2 Werte)"]
+    assert encoded.groups["Wert"] == {"Gruppe 1 (3 Werte)": ["C", "D", "E"],
+                                      "Gruppe 2 (2 Werte)": ["A", "B"]}
+    assert label_of["E"] == "Gruppe 1 (3 Werte)" and label_of["B"] == "Gruppe 2 (2 Werte)"
+
+def test_max_gain_loss_doubles_bins_until_loss_is_small_enough():
+    # Mit 2 Gruppen mischt "Sonstige" beide Klassen, mit 4 Gruppen nur noch "nein"
+    df = frame({"A": (6, 0), "B": (0, 5), "C": (4, 0), "D": (0, 3), "E": (0, 2), "F": (0, 1)})
+    encoded, _ = binned(df, 2, "frequency", max_gain_loss=0.0)
+    assert encoded.categories["Wert"] == ["A", "B", "C", "Sonstige (3 Werte)"]
+    assert encoded.groups["Wert"] == {"Sonstige (3 Werte)": ["D", "E", "F"]}
+
+def test_max_gain_loss_leaves_attribute_ungrouped():
+    df = frame({"A": (2, 0), "B": (0, 2), "C": (2, 0), "D": (0, 2), "E": (2, 0)})
+    encoded, label_of = binned(df, 2, "frequency", max_gain_loss=0.0)
+    assert encoded.categories["Wert"] == ["A", "B", "C", "D", "E"]
+    assert "Wert" not in encoded.groups
+    assert all(value == label for value, label in label_of.items())
+    # Nach Klassenanteil genügen 4 Gruppen: B und D (nur "nein") verlustfrei zusammen
+    encoded, _ = binned(df, 2, "target", max_gain_loss=0.0)
+    assert encoded.categories["Wert"] == ["Gruppe 1 (2 Werte)", "A", "C", "E"]
+    assert encoded.groups["Wert"] == {"Gruppe 1 (2 Werte)": ["B", "D"]}
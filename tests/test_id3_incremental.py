@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import load_file
+from ID3_incremental import IncrementalID3
+from ID3_parallel import build_id3_tree_parallel
+
+@pytest.fixture
+def data():
+    df = pd.DataFrame({
+        "Wetter": ["sonnig", "Regen", "sonnig", "bewölkt", "Regen", "sonnig", "Regen", "bewölkt"],
+        "Code": ["A", "7", "8", "B", "7", "8", "7", "8"],
+        "Spielen": ["nein", "ja", "ja", "ja", "nein", "ja", "nein", "ja"],
+    })
+    return df, ["Wetter", "Code"]
+
+def test_update_from_csv_reads_like_load_file(tmp_path, data):
+    df, attributes = data
+    path = tmp_path / "daten.csv"
+    # Semikolon als Trennzeichen, BOM und Leerzeichen nach dem Trennzeichen
+    df.iloc[:4].to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+    model = IncrementalID3(attributes, "Spielen").update_from_csv(str(path))
+    with open(path, "a", encoding="utf-8") as f:
+        for row in df.iloc[4:].itertuples(index=False):
+            f.write("; ".join(row) + "\n")
+    # Die neuen Zeilen enthalten in "Code" nur Ziffern
+    model.update_from_csv(str(path))
+
+    full = load_file(str(path), verbose=False)
+    assert model.num_rows == len(df)
+    assert model.categories["Code"] == ["A", "7", "8", "B"]
+    assert model.tree() == build_id3_tree_parallel(full, attributes, "Spielen", processes=1)
+
+def test_update_from_csv_checks_source_of_rows(tmp_path, data):
+    df, attributes = data
+    path = tmp_path / "daten.csv"
+    df.to_csv(path, index=False)
+    model = IncrementalID3(attributes, "Spielen").update(load_file(str(path), verbose=False))
+    with pytest.raises(ValueError):
+        model.update_from_csv(str(path))
+    assert model.update_from_csv(str(path), skip_rows=len(df)).num_rows == len(df)
+
+def test_batches_with_new_values_equal_full_build():
+    rng = np.random.default_rng(3)
+    rows = 3000
+    df = pd.DataFrame({
+        "Farbe": rng.choice(["rot", "grün", "blau"], rows),
+        # Viele Werte, die erst in späteren Batches auftauchen
+        "Kunde": [f"K{value}" for value in rng.integers(0, 60 + np.arange(rows) // 5)],
+        "Größe": rng.choice(["S", "M", "L"], rows),
+    })
+    noise = rng.random(rows) < 0.2
+    df["Kauf"] = np.where((df["Farbe"] == "rot") ^ (df["Größe"] == "S") ^ noise, "ja", "nein")
+    attributes = ["Farbe", "Kunde", "Größe"]
+    model = IncrementalID3(attributes, "Kauf")
+    for start, end in [(0, 40), (40, 41), (41, 500), (500, 1700), (1700, rows)]:
+        model.update(df.iloc[start:end])
+        expected = build_id3_tree_parallel(df.iloc[:end].reset_index(drop=True), attributes,
+                                           "Kauf", processes=1)
+        assert model.tree() == expected
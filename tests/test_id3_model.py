@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ID3_model import ARRAY_NAMES, compile_tree, load_model, save_model
+from ID3_parallel import build_id3_tree_parallel
+
+def random_frame(rows=2000, seed=2):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Farbe": rng.choice(["rot", "grün", "blau"], rows),
+        "Stadt": rng.choice([f"S{i}" for i in range(30)], rows),
+        "Alter": rng.integers(18, 80, rows),
+    })
+    score = (df["Alter"] > 40).astype(int) + (df["Farbe"] == "rot") + df["Stadt"].isin(["S1", "S2"])
+    noise = rng.random(rows) < 0.1
+    df["Kauf"] = np.where((score >= 2) ^ noise, "ja", "nein")
+    return df
+
+def majority(node, classes):
+    """Nach Samples gewichtete Mehrheitsklasse der Blätter (bei Gleichstand die erste)."""
+    counts = dict.fromkeys(classes, 0)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current["leaf"]:
+            counts[current["class"]] += current["num_samples"]
+        else:
+            stack.extend(current["branches"].values())
+    return max(classes, key=lambda cls: counts[cls])
+
+def walk(tree, row, classes):
+    """Vorhersage durch Ablaufen des Baum-Dictionarys; ohne passenden Zweig Mehrheitsklasse."""
+    node = tree
+    while not node["leaf"]:
+        value = row.get(node["attribute"])
+        if "threshold" in node:
+            if value is None or pd.isna(value):
+                break
+            branch = list(node["branches"])[0 if value <= node["threshold"] else 1]
+        else:
+            branch = next((label for label, members in node.get("groups", {}).items()
+                           if value in members), value)
+        if branch not in node["branches"]:
+            break
+        node = node["branches"][branch]
+    return node["class"] if node["leaf"] else majority(node, classes)
+
+@pytest.fixture(params=[{}, {"max_bins": 6}], ids=["kategorisch", "gruppiert"])
+def model(request):
+    df = random_frame()
+    attributes = ["Farbe", "Stadt", "Alter"]
+    tree = build_id3_tree_parallel(df, attributes, "Kauf", processes=1,
+                                   numeric_attributes=["Alter"], **request.param)
+    return df, tree, compile_tree(tree)
+
+def test_compiled_predictions_match_tree_walk_on_training_rows(model):
+    df, tree, compiled = model
+    expected = [walk(tree, row, compiled.classes) for row in df.to_dict("records")]
+    assert list(compiled.predict(df)) == expected
+    codes = compiled.encode(df)
+    assert list(compiled.predict_codes(codes)) == [compiled.classes.index(cls) for cls in expected]
+
+def test_compiled_predictions_match_tree_walk_on_unseen_values(model):
+    df, tree, compiled = model
+    unseen = pd.DataFrame({
+        "Farbe": ["lila", "rot", "grün", "lila", "blau"],
+        "Stadt": ["S1", "Atlantis", "S99", "Atlantis", "S3"],
+        "Alter": [30, 55, np.nan, 40, 200],
+    })
+    expected = [walk(tree, row, compiled.classes) for row in unseen.to_dict("records")]
+    assert list(compiled.predict(unseen)) == expected
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_predict_round_trip(tmp_path, model, mmap):
+    df, tree, compiled = model
+    path = tmp_path / "baum.id3"
+    save_model(compiled, str(path))
+    loaded = load_model(str(path), mmap=mmap)
+    assert isinstance(loaded.child_table, np.memmap) == mmap
+    assert loaded.attributes == compiled.attributes
+    assert loaded.numeric_attributes == compiled.numeric_attributes
+    assert loaded.categories == compiled.categories
+    assert loaded.classes == compiled.classes
+    assert loaded.groups == compiled.groups
+    for name in ARRAY_NAMES:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(compiled, name))
+    np.testing.assert_array_equal(loaded.predict(df), compiled.predict(df))
+
+def test_save_load_keeps_value_types(tmp_path):
+    df = pd.DataFrame({"Stufe": [1, 2, 3, 1, 2, 3], "Code": ["1", "2", "1", "2", "1", "2"],
+                       "Klasse": [True, False, True, True, False, False]})
+    compiled = compile_tree(build_id3_tree_parallel(df, ["Stufe", "Code"], "Klasse", processes=1))
+    path = tmp_path / "baum.id3"
+    save_model(compiled, str(path))
+    loaded = load_model(str(path))
+    assert loaded.categories == compiled.categories
+    assert [type(cls) for cls in loaded.classes] == [type(cls) for cls in compiled.classes]
+    assert list(loaded.predict(df)) == list(compiled.predict(df))
+
+def test_to_dict_round_trip(tmp_path, model):
+    df, tree, compiled = model
+    assert compiled.to_dict() == tree
+    assert compile_tree(compiled.to_dict()).to_dict() == tree
+    path = tmp_path / "baum.id3"
+    save_model(compiled, str(path))
+    assert load_model(str(path)).to_dict() == tree
@@ -0,0 +1,21 @@
+import pytest
+
+nx = pytest.importorskip("networkx")
+
+from ID3_nxtree import build_nx_tree
+from ID3_render import edge_label, node_label
+
+def test_build_nx_tree_uses_shared_labels():
+    tree = {"leaf": False, "attribute": "Wind", "num_samples": 5,
+            "branch_info": {"Weak": 0.0},
+            "branches": {"Weak": {"leaf": True, "class": "Yes", "num_samples": 3},
+                         "Strong": {"leaf": True, "class": "No", "num_samples": 2}}}
+    G = nx.DiGraph()
+    build_nx_tree(tree, "Play", G)
+    assert [G.nodes[n]["label"] for n in G.nodes] == [
+        node_label(tree, "Play"),
+        node_label(tree["branches"]["Weak"], "Play"),
+        node_label(tree["branches"]["Strong"], "Play"),
+    ]
+    assert G.edges["node0", "node1"]["label"] == edge_label(tree, "Weak") == "Klasse: Weak\nEntropie: 0.0000"
+    assert G.edges["node0", "node2"]["label"] == edge_label(tree, "Strong") == "Klasse: Strong"
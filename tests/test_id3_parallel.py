@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import load_file
+from ID3_parallel import build_id3_tree_parallel
+from ID3_trace import BuildTrace
+
+PLAY_TENNIS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "ID3_play_tennis.csv")
+
+def random_frame(rows=3000, seed=1):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Farbe": rng.choice(["rot", "grün", "blau"], rows),
+        "Stadt": rng.choice([f"S{i}" for i in range(40)], rows),
+        "Größe": rng.choice(["S", "M", "L", "XL"], rows),
+        "Alter": rng.integers(18, 80, rows),
+        "Preis": rng.normal(50, 15, rows).round(1),
+    })
+    score = (df["Alter"] > 40).astype(int) + (df["Farbe"] == "rot") + (df["Preis"] > 55)
+    noise = rng.random(rows) < 0.1
+    df["Kauf"] = np.where((score >= 2) ^ noise, "ja", "nein")
+    return df
+
+def test_play_tennis_parallel_equals_serial():
+    df = load_file(PLAY_TENNIS, verbose=False, use_cache=False)
+    attributes = [col for col in df.columns if col != "Play"]
+    serial = build_id3_tree_parallel(df, attributes, "Play", processes=1)
+    parallel = build_id3_tree_parallel(df, attributes, "Play", processes=2, min_parallel_rows=1)
+    assert parallel == serial
+
+@pytest.mark.parametrize("bin_method", ["frequency", "target"])
+def test_random_frame_parallel_equals_serial(bin_method):
+    df = random_frame()
+    attributes = [col for col in df.columns if col != "Kauf"]
+    options = {"numeric_attributes": ["Alter", "Preis"], "max_bins": 8, "bin_method": bin_method}
+    serial = build_id3_tree_parallel(df, attributes, "Kauf", processes=1, **options)
+    parallel = build_id3_tree_parallel(df, attributes, "Kauf", processes=3,
+                                       min_parallel_rows=50, **options)
+    assert not serial["leaf"]
+    assert parallel == serial
+
+def _traced_nodes(trace):
+    return sorted((record["depth"], record["rows"], str(record["attribute"]), record["leaf"])
+                  for record in trace.nodes)
+
+def test_parallel_trace_includes_worker_nodes():
+    df = random_frame()
+    attributes = [col for col in df.columns if col != "Kauf"]
+    options = {"numeric_attributes": ["Alter", "Preis"], "max_bins": 8}
+    with BuildTrace() as serial:
+        build_id3_tree_parallel(df, attributes, "Kauf", processes=1, **options)
+    with BuildTrace() as parallel:
+        build_id3_tree_parallel(df, attributes, "Kauf", processes=2, min_parallel_rows=200,
+                                **options)
+    # Dieselben Knoten an denselben Stellen, auch die aus den Workern
+    assert _traced_nodes(parallel) == _traced_nodes(serial)
+    assert any(record["worker"] is not None for record in parallel.nodes)
+    nodes = parallel.nodes
+    for record in nodes:
+        assert record["id"] == nodes.index(record)
+        if record["parent"] is not None:
+            parent = nodes[record["parent"]]
+            assert record["depth"] == parent["depth"] + 1
+            # Ein Knoten umfasst die Zeit seiner Teilbäume, auch der in den Workern
+            assert parent["start_s"] <= record["start_s"]
+            assert (record["start_s"] + record["total_s"]
+                    <= parent["start_s"] + parent["total_s"] + 1e-9)
+    summary = parallel.summary()
+    assert summary["nodes"] == len(serial.nodes)
+    assert set(summary["score_s"]) == set(serial.summary()["score_s"])
+    tids = {event["tid"] for event in parallel.chrome_events()}
+    assert len(tids) > 1
@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+import pytest
+
+from data_loader import load_file
+from ID3_model import compile_tree
+from ID3_parallel import build_id3_tree_parallel
+from inference_server import (LARGE_PAYLOAD_BYTES, InferenceServer, ServedModel, _request, _same,
+                              encode_json)
+from NaiveBayes_model import fit_naive_bayes
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    "ID3_play_tennis.csv")
+HOST = "127.0.0.1"
+
+class FailingModel(ServedModel):
+    """Scheitert bei der Bewertung, sobald ein Fall den Wert "kaputt" enthält."""
+    def score(self, rows):
+        if any("kaputt" in row.values() for row in rows):
+            raise RuntimeError("kaputt")
+        return super().score(rows)
+
+@pytest.fixture(scope="module")
+def rows():
+    df = load_file(DATA, verbose=False, use_cache=False)
+    return [{k: v for k, v in row.items() if k != "Play"} for row in df.to_dict("records")]
+
+@pytest.fixture(scope="module")
+def models():
+    df = load_file(DATA, verbose=False, use_cache=False)
+    attributes = [col for col in df.columns if col != "Play"]
+    tree = build_id3_tree_parallel(df, attributes, "Play", processes=1)
+    return {
+        "id3": ServedModel("id3", "id3", compile_tree(tree), "Play"),
+        "nb": ServedModel("nb", "nb", fit_naive_bayes(df, "Play")),
+        "failing": FailingModel("failing", "nb", fit_naive_bayes(df, "Play")),
+    }
+
+def _run(models, scenario, max_wait=0.05, batch_processes=0):
+    """Startet den Dienst auf einem freien Port, führt scenario(port) aus und beendet ihn."""
+    async def main():
+        server = InferenceServer(models, workers=2, max_batch=256, max_wait=max_wait,
+                                 batch_processes=batch_processes)
+        port = await server.start(HOST, 0)
+        try:
+            return await scenario(server, port)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+def _predict(port, name, sample):
+    return _request(HOST, port, "POST", f"/models/{name}/predict", {"sample": sample})
+
+@pytest.mark.parametrize("name", ["id3", "nb"])
+def test_concurrent_requests_match_direct_scoring(models, rows, name):
+    expected = models[name].score(rows)
+
+    async def scenario(server, port):
+        single = await asyncio.gather(*(_predict(port, name, row) for row in rows))
+        batch = await _request(HOST, port, "POST", f"/models/{name}/predict_batch", {"rows": rows})
+        return single, batch, server.stats()
+
+    single, (status, batch), stats = _run(models, scenario)
+    assert [status for status, _ in single] == [200] * len(rows)
+    assert all(_same(e, actual) for e, (_, actual) in zip(expected, single))
+    assert status == 200 and all(_same(e, a) for e, a in zip(expected, batch["results"]))
+    # Die gleichzeitigen Einzelanfragen wurden gesammelt bewertet
+    assert stats["batching"][name]["batches"] <= len(rows) // 2
+
+def test_nested_value_is_rejected_before_batching(models, rows):
+    samples = rows[:3] + [dict(rows[3], Outlook=["Sunny"])] + rows[4:6]
+
+    async def scenario(server, port):
+        return await asyncio.gather(*(_predict(port, "nb", sample) for sample in samples))
+
+    statuses = [status for status, _ in _run(models, scenario)]
+    assert statuses == [200, 200, 200, 400, 200, 200]
+
+def test_failing_request_does_not_fail_the_batch(models, rows):
+    samples = rows[:3] + [dict(rows[3], Outlook="kaputt")] + rows[4:6]
+    expected = models["nb"].score(rows[:3] + rows[4:6])
+
+    async def scenario(server, port):
+        return await asyncio.gather(*(_predict(port, "failing", sample) for sample in samples))
+
+    responses = _run(models, scenario)
+    assert [status for status, _ in responses] == [200, 200, 200, 500, 200, 200]
+    ok = [result for status, result in responses if status == 200]
+    assert all(_same(e, actual) for e, actual in zip(expected, ok))
+
+def test_health_and_unknown_model(models):
+    async def scenario(server, port):
+        return (await _request(HOST, port, "GET", "/health"),
+                await _predict(port, "fehlt", {}))
+
+    (status, health), (missing, _) = _run(models, scenario)
+    assert status == 200 and health == {"status": "ok"}
+    assert missing == 404
+
+@pytest.mark.parametrize("batch_processes", [0, 1])
+def test_large_batch_matches_direct_scoring(models, rows, batch_processes):
+    large = rows * 500
+    assert len(encode_json({"rows": large})) > LARGE_PAYLOAD_BYTES
+    nested = large[:-1] + [dict(rows[0], Outlook=["Sunny"])]
+    served = {name: models[name] for name in ("id3", "nb")}
+    expected = {name: served[name].score(large) for name in served}
+
+    async def scenario(server, port):
+        batches = {name: await _request(HOST, port, "POST", f"/models/{name}/predict_batch",
+                                        {"rows": large}) for name in served}
+        rejected = await _request(HOST, port, "POST", "/models/nb/predict_batch", {"rows": nested})
+        return batches, rejected
+
+    batches, (status, _) = _run(served, scenario, batch_processes=batch_processes)
+    for name, (code, batch) in batches.items():
+        assert code == 200 and len(batch["results"]) == len(large)
+        assert all(_same(e, a) for e, a in zip(expected[name], batch["results"]))
+    assert status == 400
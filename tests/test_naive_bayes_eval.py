@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from NaiveBayes_eval import assign_folds, cross_validate
+from NaiveBayes_model import fit_naive_bayes
+
+FOLDS = 4
+SEED = 0
+
+def _dataset():
+    """40 Zeilen, die Klasse "C" kommt nur in Faltung 0 vor (fehlt also in deren Training)."""
+    rng = np.random.default_rng(7)
+    fold_of = assign_folds(40, FOLDS, SEED)
+    df = pd.DataFrame({
+        "Wetter": rng.choice(["sonnig", "bewölkt", "Regen"], 40),
+        "Wind": rng.choice(["schwach", "stark"], 40),
+        "Temperatur": rng.choice(["heiß", "mild", "kalt", "eisig"], 40),
+        "Spielen": rng.choice(["ja", "nein"], 40),
+    })
+    df.loc[np.flatnonzero(fold_of == 0)[:3], "Spielen"] = "C"
+    return df, fold_of
+
+def _refit_fold(df, fold_of, f, smoothing, classes):
+    """Neu-Zählen auf den Trainingszeilen einer Faltung und Bewertung der Testzeilen."""
+    train, test = df[fold_of != f], df[fold_of == f]
+    model = fit_naive_bayes(train, "Spielen")
+    proba = model.predict_proba(test, smoothing)
+    p_true = np.zeros(len(test))
+    for k, cls in enumerate(model.classes):
+        p_true[test["Spielen"].to_numpy() == cls] = proba[test["Spielen"].to_numpy() == cls, k]
+    predicted = model.predict(test, smoothing)
+    return {
+        "correct": int(np.sum(predicted == test["Spielen"].to_numpy())),
+        "log_loss": float(-np.mean(np.log(np.clip(p_true, 1e-15, 1.0)))),
+        "predicted": [classes.index(value) for value in predicted],
+    }
+
+@pytest.mark.parametrize("smoothing", [0, 0.5, 1])
+def test_count_subtraction_matches_refit_per_fold(smoothing):
+    df, fold_of = _dataset()
+    result = cross_validate(df, "Spielen", folds=FOLDS, smoothings=[smoothing], seed=SEED)
+    classes = result["classes"]
+    entry = result["results"][0]
+    correct = 0
+    for f, fold in enumerate(entry["folds"]):
+        expected = _refit_fold(df, fold_of, f, smoothing, classes)
+        correct += expected["correct"]
+        assert fold["accuracy"] == expected["correct"] / fold["rows"]
+        assert fold["log_loss"] == pytest.approx(expected["log_loss"])
+        confusion = np.array(fold["confusion"])
+        assert not np.isnan(fold["log_loss"])
+        # Spaltensummen: wie oft jede Klasse vorhergesagt wurde
+        assert confusion.sum(axis=0).tolist() == np.bincount(
+            expected["predicted"], minlength=len(classes)).tolist()
+    assert entry["accuracy"] == correct / len(df)
+
+def test_missing_class_is_never_predicted_with_smoothing_0():
+    df, _ = _dataset()
+    result = cross_validate(df, "Spielen", folds=FOLDS, smoothings=[0], seed=SEED)
+    fold = result["results"][0]["folds"][0]
+    assert np.array(fold["confusion"])[:, result["classes"].index("C")].sum() == 0
+    assert np.isfinite(fold["log_loss"])
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_file
+from NaiveBayes_model import (
+    fit_naive_bayes, fit_naive_bayes_csv, fit_naive_bayes_files, predict_csv,
+)
+
+def _write(path, df):
+    df.to_csv(path, index=False)
+    return str(path)
+
+def test_predict_csv_matches_digit_only_values_to_text_dictionary(tmp_path):
+    rng = np.random.default_rng(3)
+    codes = rng.choice(["A1", "B2", "7", "8"], 200)
+    train = pd.DataFrame({
+        "Code": codes,
+        "Wind": rng.choice(["schwach", "stark"], 200),
+        "Spielen": np.where(np.isin(codes, ["7", "A1"]), "ja", "nein"),
+    })
+    model = fit_naive_bayes(load_file(_write(tmp_path / "train.csv", train), verbose=False),
+                            "Spielen")
+    assert model.values["Code"] == ["7", "8", "A1", "B2"]
+
+    # Im Vorhersage-Block kommen nur Ziffern vor; pandas würde die Spalte als int64 lesen
+    new = pd.DataFrame({"Code": rng.choice(["7", "8"], 50), "Wind": rng.choice(["schwach", "stark"], 50)})
+    out = io.StringIO()
+    predict_csv(model, _write(tmp_path / "neu.csv", new), out, chunksize=20)
+    result = pd.read_csv(io.StringIO(out.getvalue()))
+
+    expected = model.predict_proba(new.astype(str))
+    for k, cls in enumerate(model.classes):
+        assert np.allclose(result[f"P({cls})"], expected[:, k])
+    assert (result["Vorhersage"] == np.where(new["Code"] == "7", "ja", "nein")).all()
+
+def test_encode_casts_to_dictionary_type():
+    model = fit_naive_bayes(pd.DataFrame({"Zahl": [1, 2, 3], "Text": ["1", "x", "2"],
+                                          "Klasse": ["a", "b", "a"]}), "Klasse")
+    codes = model.encode(pd.DataFrame({"Zahl": ["2", "007", "x"], "Text": [1, 2.0, None]}))
+    assert codes.tolist() == [[1, 0], [-1, 1], [-1, -1]]
+
+def _tables(model):
+    return (model.classes, model.class_counts.tolist(),
+            {attribute: (model.values[attribute], model.counts[attribute].tolist())
+             for attribute in model.attributes})
+
+def test_chunked_fit_with_mixed_chunk_types_matches_single_pass(tmp_path):
+    # Die ersten Blöcke enthalten in "Code" nur Ziffern, erst der letzte auch Text
+    df = pd.DataFrame({
+        "Code": ["1", "2", "3", "1", "2", "3", "x", "1", "y"],
+        "Menge": ["5", "7", "5", "7", "5", "7", "5", "7", "5"],
+        "Spielen": ["ja", "nein", "ja", "ja", "nein", "nein", "ja", "nein", "ja"],
+    })
+    filename = _write(tmp_path / "daten.csv", df)
+    expected = fit_naive_bayes(load_file(filename, verbose=False), "Spielen")
+    model = fit_naive_bayes_csv(filename, "Spielen", chunksize=3)
+    assert _tables(model) == _tables(expected)
+    assert model.values["Menge"] == [5, 7]
+
+def test_merge_of_files_with_different_column_types(tmp_path):
+    first = pd.DataFrame({"Code": ["1", "2", "1"], "Spielen": ["ja", "nein", "ja"]})
+    second = pd.DataFrame({"Code": ["2", "x"], "Spielen": ["nein", "ja"]})
+    names = [_write(tmp_path / "a.csv", first), _write(tmp_path / "b.csv", second)]
+    model = fit_naive_bayes_files(names, "Spielen", chunksize=2)
+    expected = fit_naive_bayes(load_file(_write(tmp_path / "alle.csv",
+                                                pd.concat([first, second])), verbose=False),
+                               "Spielen")
+    assert _tables(model) == _tables(expected)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from walkthrough_cache import ResultCache, naive_bayes_walkthrough, result_key
+
+def _data():
+    return pd.DataFrame({
+        "Wetter": ["sonnig", "Regen", "sonnig", "bewölkt", "Regen"],
+        "Wind": ["schwach", "stark", "stark", "schwach", "schwach"],
+        "Spielen": ["nein", "ja", "ja", "ja", "nein"],
+    })
+
+def test_sample_order_is_part_of_the_key():
+    df = _data()
+    cache = ResultCache(disk=False)
+    first = naive_bayes_walkthrough(df, "Spielen", {"Wetter": "sonnig", "Wind": "stark"},
+                                    cache=cache)
+    second = naive_bayes_walkthrough(df, "Spielen", {"Wind": "stark", "Wetter": "sonnig"},
+                                     cache=cache)
+    uncached = naive_bayes_walkthrough(df, "Spielen", {"Wind": "stark", "Wetter": "sonnig"},
+                                       cache=ResultCache(disk=False))
+    assert cache.stats["memory_hits"] == 0
+    assert [step.data for step in second["steps"]] == [step.data for step in uncached["steps"]]
+    assert [step.data for step in first["steps"]] != [step.data for step in second["steps"]]
+
+def test_key_keeps_value_types_apart():
+    keys = {result_key("naive_bayes", "f", "Spielen", {"sample": [("Zahl", value)]})
+            for value in (5, np.int64(5), "5", 5.0, None, "None")}
+    assert len(keys) == 6
+    assert (result_key("id3", "f", "Spielen", {"a": 1, "b": [1, 2]})
+            == result_key("id3", "f", "Spielen", {"b": [1, 2], "a": 1}))
@@ -0,0 +1,319 @@
+"""
+Schritt-für-Schritt-Erklärungen von ID3 und Naive Bayes als Ereignisstrom.
+
+Die Generatoren liefern die Rechenschritte lazy als Step(kind, data): data enthält die
+Werte des Schritts (Zähltabellen, Entropien, Gewinne, Likelihoods, ...), nicht fertigen
+Text. Gerechnet wird jeweils erst, wenn der nächste Schritt abgerufen wird; eine Web-
+Oberfläche kann so durch die Schritte blättern, während im Hintergrund weitergerechnet
+wird. Die Terminal-Ausgabe in ID3.py, ID3_nxtree.py und NaiveBayes.py ist nur einer der
+Verbraucher: step_lines(step) liefert den bisherigen Text eines Schritts als Zeilen
+(hervorgehoben, Text), nach Schritten aus PAUSE_STEPS wartet das Terminal auf Enter.
+
+ID3 (id3_steps):
+  groups       Attribut zu Gruppen zusammengefasst (attribute, num_groups)
+  entropy      Entropie der Zielvariable an der Wurzel (explanation)
+  gain         Gewinn eines Attributs (attribute, threshold, branches, gain, ...)
+  leaf         Blatt (reason: "pure", "no_attributes" oder "no_split", class)
+  split        gewähltes Attribut (attribute, threshold, gain, values)
+  branch_table Teiltabelle eines Zweigs (attribute, value, table, explanation)
+  subtree      Beginn eines Unterbaums (attribute, threshold, value)
+  tree         letzter Schritt, fertiges Baum-Dictionary (tree)
+
+Naive Bayes (naive_bayes_steps, frequency_steps, likelihood_steps, posterior_steps):
+  frequencies  relative Häufigkeiten aller Attribute (classes, totals, rows)
+  likelihoods  Beginn der Likelihood-Berechnung (laplace, num_values)
+  likelihood   Likelihood einer Klasse (class, details, value, laplace)
+  posteriors   normalisierte Wahrscheinlichkeiten (likelihoods, normalized, total)
+  result       Ergebnis (posteriors, laplace)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from ID3_core import (
+    branch_codes, branch_values, build_tree, choose_best, encode_dataset, entropy_details,
+    entropy_of_counts, format_threshold, inner_node, partition_rows, presort,
+    remaining_attributes, score_attributes, split_sorted,
+)
+from ID3_trace import active_trace
+from NaiveBayes_model import fit_naive_bayes
+
+Step = namedtuple("Step", "kind data")
+
+# Nach diesen Schritten wartet die Terminal-Ausgabe (wie bisher) auf Enter
+PAUSE_STEPS = frozenset({"entropy", "gain", "leaf", "split", "branch_table"})
+
+# --- ID3 ------------------------------------------------------------------------
+
+def id3_steps(data, attributes, target_var, verbosity=2, print_entropy=True,
+              numeric_attributes=(), max_bins=None, bin_method="frequency", max_gain_loss=None):
+    """
+    Rechenschritte des ID3-Baumaufbaus. verbosity wie bei build_id3_tree:
+    0 = nur der Baum, 1 = gewählte Attribute und Blätter, 2 = alle Schritte.
+    Der letzte Schritt ist immer "tree".
+    """
+    encoded = encode_dataset(data, attributes, target_var, numeric_attributes,
+                             max_bins, bin_method, max_gain_loss)
+    if verbosity >= 1:
+        for attribute in encoded.groups:
+            yield Step("groups", {"attribute": attribute,
+                                  "num_groups": len(encoded.categories[attribute])})
+    rows = np.arange(len(data))
+    sorted_rows = presort(encoded, rows)
+    if verbosity == 0:
+        tree = build_tree(encoded, rows, attributes, sorted_rows)
+    else:
+        tree = yield from _id3_node_steps(data, encoded, rows, attributes, sorted_rows,
+                                          verbosity >= 2, print_entropy)
+    yield Step("tree", {"tree": tree})
+
+def _id3_node_steps(data, encoded, rows, attributes, sorted_rows, detail, print_entropy):
+    """Schritte eines Knotens samt Unterbäumen; liefert (return) das Knoten-Dictionary."""
+    profile = active_trace()
+    if profile is None:
+        return (yield from _id3_split_steps(data, encoded, rows, attributes, sorted_rows,
+                                            detail, print_entropy))
+    record = profile.begin_node(len(rows))
+    node = yield from _id3_split_steps(data, encoded, rows, attributes, sorted_rows,
+                                       detail, print_entropy)
+    profile.end_node(record, node)
+    return node
+
+def _id3_split_steps(data, encoded, rows, attributes, sorted_rows, detail, print_entropy):
+    classes = encoded.classes
+    target_codes = encoded.target_codes[rows]
+
+    # Nur die im Knoten vorkommenden Klassen werden erklärt
+    class_counts = np.bincount(target_codes, minlength=len(classes))
+    present = class_counts > 0
+    node_classes = [cls for cls, is_present in zip(classes, present) if is_present]
+    current_entropy = entropy_of_counts(class_counts)
+    if print_entropy and detail:
+        yield Step("entropy", {"explanation": entropy_details(class_counts[present], node_classes)})
+
+    # Blatt: wenn Knoten rein ist
+    if abs(current_entropy) < 1e-6:
+        leaf = {"leaf": True, "class": classes[target_codes[0]], "num_samples": len(rows)}
+        yield Step("leaf", {"reason": "pure", "class": leaf["class"], "num_samples": len(rows)})
+        return leaf
+
+    # Blatt: wenn keine Attribute mehr vorhanden sind
+    if not attributes:
+        majority = classes[int(np.argmax(class_counts))]
+        yield Step("leaf", {"reason": "no_attributes", "class": majority, "num_samples": len(rows)})
+        return {"leaf": True, "class": majority, "num_samples": len(rows)}
+
+    total_samples = len(rows)
+
+    # Informationsgewinn für jedes verbleibende Attribut aus seiner Zähltabelle
+    scores = score_attributes(encoded, rows, target_codes, attributes, current_entropy, sorted_rows)
+    if detail:
+        for score in scores:
+            branches = []
+            for k, value in enumerate(branch_values(encoded, score)):
+                branches.append({
+                    "value": value,
+                    "total": int(score.matrix[k].sum()),
+                    "explanation": entropy_details(score.matrix[k, present], node_classes),
+                    "weight": score.weights[k],
+                    "entropy": score.branch_entropies[k],
+                    "weighted": score.weighted_components[k],
+                })
+            yield Step("gain", {"attribute": score.attribute, "threshold": score.threshold,
+                                "num_samples": total_samples, "parent_entropy": current_entropy,
+                                "branches": branches, "gain": score.gain})
+    best = choose_best(scores)
+    # Blatt: nur noch numerische Attribute mit einem einzigen Wert
+    if best is None:
+        majority = classes[int(np.argmax(class_counts))]
+        yield Step("leaf", {"reason": "no_split", "class": majority, "num_samples": len(rows)})
+        return {"leaf": True, "class": majority, "num_samples": len(rows)}
+
+    values = branch_values(encoded, best)
+    yield Step("split", {"attribute": best.attribute, "threshold": best.threshold,
+                         "gain": best.gain, "values": values})
+    branch_rows = partition_rows(rows, branch_codes(encoded, rows, best), best.order)
+
+    # Teiltabellen der Zweige (werden nur für die Erklärung aus den Zeilenindizes erzeugt)
+    if detail:
+        for k, value in enumerate(values):
+            table = data.iloc[branch_rows[k]]
+            profile = active_trace()
+            if profile is not None:
+                profile.materialised(table.memory_usage(index=True).sum())
+            yield Step("branch_table", {
+                "attribute": best.attribute, "threshold": best.threshold, "value": value,
+                "rows": branch_rows[k], "table": table,
+                "explanation": entropy_details(best.matrix[k, present], node_classes),
+                "entropy": best.branch_entropies[k],
+            })
+
+    node = inner_node(best, values, total_samples, encoded.groups.get(best.attribute))
+    new_attributes = remaining_attributes(attributes, best)
+    branch_sorted = split_sorted(encoded, sorted_rows, best)
+    for k, value in enumerate(values):
+        yield Step("subtree", {"attribute": best.attribute, "threshold": best.threshold,
+                               "value": value})
+        node["branches"][value] = yield from _id3_node_steps(
+            data, encoded, branch_rows[k], new_attributes, branch_sorted[k], detail, False)
+    return node
+
+# --- Naive Bayes ------------------------------------------------------------------
+
+def frequency_steps(df, target_var, model=None):
+    """
+    Relative Häufigkeiten aller Attribute je Zielklasse (ein Schritt), abgelesen aus den
+    Zähltabellen von model (fehlt es, wird es aus df gezählt, siehe NaiveBayes_model).
+    """
+    if model is None:
+        model = fit_naive_bayes(df, target_var)
+    classes = model.classes
+    total_counts = {cls: int(count) for cls, count in zip(classes, model.class_counts)}
+    rows = []
+    for attribute in model.attributes:
+        for val, counts in zip(model.values[attribute], model.counts[attribute].tolist()):
+            rows.append((attribute, val, counts))
+    yield Step("frequencies", {"target": target_var, "classes": classes, "totals": total_counts,
+                               "rows": rows})
+
+def likelihood_steps(df, target_var, sample, laplace=False, smoothing=1, model=None):
+    """
+    Likelihood je Zielklasse als Produkt der bedingten Wahrscheinlichkeiten und des
+    Priors; mit laplace=True mit LaPlace-Korrektur (smoothing). Die Werte stammen aus
+    den Zähltabellen von model (fehlt es, wird es aus df gezählt, siehe NaiveBayes_model).
+    """
+    if model is None:
+        model = fit_naive_bayes(df, target_var)
+    num_values = {attribute: model.num_values(attribute) for attribute in sample} if laplace else {}
+    yield Step("likelihoods", {"target": target_var, "laplace": laplace, "num_values": num_values})
+    for k, cls in enumerate(model.classes):
+        likelihood, cls_details = model.likelihood(sample, k, laplace=laplace, smoothing=smoothing)
+        yield Step("likelihood", {"target": target_var, "class": cls, "details": cls_details,
+                                  "value": likelihood, "laplace": laplace})
+
+def posterior_steps(likelihoods, target_var):
+    """Normalisierte Wahrscheinlichkeiten aus den Likelihoods (ein Schritt)."""
+    total = sum(likelihoods.values())
+    normalized = {}
+    for cls in sorted(likelihoods.keys()):
+        normalized[cls] = likelihoods[cls] / total if total != 0 else 0
+    yield Step("posteriors", {"target": target_var, "likelihoods": likelihoods,
+                              "normalized": normalized, "total": total})
+
+def naive_bayes_steps(df, target_var, sample, laplace="auto", model=None):
+    """
+    Likelihoods, normalisierte Wahrscheinlichkeiten und Ergebnis für ein Sample; bei
+    laplace="auto" nur bei 0% oder 100% (bzw. "always"/"never") danach dasselbe mit
+    LaPlace-Korrektur. Die Zähltabellen werden dafür nur einmal erstellt.
+    """
+    if model is None:
+        model = fit_naive_bayes(df, target_var)
+    posteriors = yield from _posterior_result_steps(df, target_var, sample, False, model)
+    if laplace == "always" or (laplace == "auto" and any(p == 0 or p == 1 for p in posteriors.values())):
+        yield from _posterior_result_steps(df, target_var, sample, True, model)
+
+def _posterior_result_steps(df, target_var, sample, laplace, model):
+    likelihoods = {}
+    for step in likelihood_steps(df, target_var, sample, laplace=laplace, model=model):
+        if step.kind == "likelihood":
+            likelihoods[step.data["class"]] = step.data["value"]
+        yield step
+    for step in posterior_steps(likelihoods, target_var):
+        posteriors = step.data["normalized"]
+        yield step
+    yield Step("result", {"target": target_var, "posteriors": posteriors, "laplace": laplace})
+    return posteriors
+
+# --- Text ---------------------------------------------------------------------------
+
+def step_lines(step):
+    """
+    Text eines Schritts wie in der Terminal-Ausgabe, als Liste von (hervorgehoben, Zeile).
+    """
+    kind, data = step
+    if kind == "groups":
+        return [(False, f"Attribut {data['attribute']}: Werte zu {data['num_groups']} Gruppen zusammengefasst")]
+    if kind == "entropy":
+        explanation = data["explanation"]
+        return [(False, "Gesamte Entropie der Zielvariable:"),
+                (False, explanation[0]), (False, explanation[1])]
+    if kind == "gain":
+        attribute, total = data["attribute"], data["num_samples"]
+        lines = [(True, f"\nID3 - Berechne Gewinn für Attribut: {attribute}")]
+        if data["threshold"] is not None:
+            lines.append((False, f"Beste Schwelle: {format_threshold(data['threshold'])}"))
+        for branch in data["branches"]:
+            lines += [
+                (False, f"\nAttribut {attribute}, Wert {branch['value']}:"),
+                (False, branch["explanation"][0]),
+                (False, branch["explanation"][1]),
+                (False, f"Gewicht: ({branch['total']}/{total}) = {branch['weight']:.4f}"),
+                (False, f"Gewichteter Entropieanteil: ({branch['total']}/{total}) * "
+                        f"{branch['entropy']:.4f} = {branch['weighted']:.4f}"),
+            ]
+        addition = " + ".join(f"{branch['weighted']:.4f}" for branch in data["branches"])
+        lines.append((False, f"\nGewinn für Attribut {attribute}: {data['parent_entropy']:.4f} - "
+                             f"({addition}) = {data['gain']:.4f}"))
+        return lines
+    if kind == "leaf":
+        if data["reason"] == "pure":
+            return [(False, f"Knoten ist rein (Entropie 0). Eindeutiger Wert: {data['class']}")]
+        if data["reason"] == "no_attributes":
+            return [(False, f"Keine Attribute mehr vorhanden. Knoten als Blatt mit Mehrheit: {data['class']}")]
+        return [(False, f"Keine teilbaren Attribute mehr vorhanden. Knoten als Blatt mit Mehrheit: {data['class']}")]
+    if kind == "split":
+        return [(False, f"\nBestes Attribut gewählt: {data['attribute']} (Gewinn = {data['gain']:.4f})")]
+    if kind == "branch_table":
+        explanation = data["explanation"]
+        return [(True, f"\nResultierende Tabelle für {_condition(data)}:\n"),
+                (False, data["table"].to_string(index=False)),
+                (False, "\nBerechnung der Entropie für diesen Teilbaum:"),
+                (False, explanation[0]), (False, explanation[1]),
+                (False, "Gesamtentropie für diesen Teilbaum: {:.4f}".format(data["entropy"]))]
+    if kind == "subtree":
+        return [(True, f"\nID3 - Erstelle Unterbaum für {_condition(data)}\n")]
+    if kind == "frequencies":
+        classes, totals = data["classes"], data["totals"]
+        header = f"{data['target']}: " + " | ".join(f"{cls}({totals[cls]})" for cls in classes)
+        lines = [(True, "\nRelative Häufigkeiten für alle Attribute:\n"), (False, header),
+                 (False, "-" * len(header))]
+        for attribute, val, counts in data["rows"]:
+            row_label = f"{attribute}({val})"
+            row_values = [f"{count}/{totals[cls]}" for count, cls in zip(counts, classes)]
+            lines.append((False, f"{row_label:<20} | " + " | ".join(row_values)))
+        return lines
+    if kind == "likelihoods":
+        if not data["laplace"]:
+            return [(True, "\nBerechnung der Likelihoods:\n")]
+        lines = [(True, "\nBerechnung der Likelihoods mit LaPlace:\n")]
+        for attribute, V in data["num_values"].items():
+            lines.append((True, f"{attribute}: {V} Ausprägungen - addiere 1/{V}"))
+        lines.append((False, "\n"))
+        return lines
+    if kind == "likelihood":
+        detail_str = " * ".join(data["details"])
+        if data["laplace"]:
+            return [(False, f"Likelihood: {data['target']}({data['class']}) mit LaPlace: "
+                            f"{detail_str} = {data['value']:.4f}")]
+        return [(False, f"Likelihood: {data['target']}({data['class']}) = {detail_str} = {data['value']:.4f}")]
+    if kind == "posteriors":
+        target_var, likelihoods, normalized = data["target"], data["likelihoods"], data["normalized"]
+        parts = " + ".join(f"{likelihoods[cls]:.4f}" for cls in sorted(likelihoods.keys()))
+        lines = [(True, "\nBerechnung der normalisierten Wahrscheinlichkeiten:\n")]
+        for cls in sorted(likelihoods.keys()):
+            if data["total"] == 0:
+                lines.append((False, f"Wahrscheinlichkeit: {target_var}({cls}) = 0 (keine Wahrscheinlichkeit berechenbar)"))
+            else:
+                lines.append((False, f"Wahrscheinlichkeit: {target_var}({cls}) = {likelihoods[cls]:.4f} / ({parts}) = {normalized[cls]:.2f} entspricht {normalized[cls]*100:.0f}%"))
+        return lines
+    if kind == "result":
+        heading = "\nErgebnis mit LaPlace-Korrektur:\n" if data["laplace"] else "\nErgebnis:\n"
+        posteriors = data["posteriors"]
+        return [(True, heading)] + [(False, f"{data['target']}({cls}): {posteriors[cls]*100:.0f}%")
+                                    for cls in sorted(posteriors.keys())]
+    return []
+
+def _condition(data):
+    # Bei Schwellen lautet die Bedingung "Temperatur <= 20" statt "Temperatur = 20"
+    relation = " " if data["threshold"] is not None else " = "
+    return f"{data['attribute']}{relation}{data['value']}"
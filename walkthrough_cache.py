@@ -0,0 +1,229 @@
+"""
+Ergebnis-Cache für wiederholte Schritt-für-Schritt-Läufe (walkthrough).
+
+Wird derselbe Datensatz mit derselben Zielvariable und denselben Optionen erneut
+durchgerechnet (z. B. ID3_play_tennis.csv in der Web-Version), liefert der Cache den
+fertigen Baum, alle Rechenschritte und gerenderte Grafiken, statt sie neu zu berechnen.
+
+- Schlüssel: Hash aus dem Fingerabdruck der Daten (dataset_fingerprint: Spalten,
+  Datentypen und Inhalt, unabhängig von Dateiname und Kategorien-Reihenfolge), der Art
+  des Laufs, der Zielvariable und den Optionen.
+- Speicher: die Ergebnisse werden gepickelt in einem LRU-Cache im Speicher gehalten
+  (begrenzt über die Größe in Bytes) und zusätzlich auf der Festplatte abgelegt
+  (gleiches Verzeichnis und gleiche Größenbegrenzung wie dataset_cache). Ein Treffer
+  liefert jeweils eine neue Kopie, Änderungen am Ergebnis verändern den Cache nicht.
+
+    result = id3_walkthrough(df, attributes, "Play", image_formats=("svg",))
+    tree, steps, svg = result["tree"], result["steps"], result["images"]["svg"]
+
+Der Cache enthält Pickle-Daten und ist nur für das lokale Cache-Verzeichnis gedacht.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from dataset_cache import default_cache_dir, default_max_bytes, evict
+from NaiveBayes_model import fit_naive_bayes
+from walkthrough import frequency_steps, id3_steps, naive_bayes_steps
+
+RESULT_VERSION = 2
+RESULT_PREFIX = "walk-"
+RESULT_FILE = "result.pkl"
+META_FILE = "meta.json"
+DEFAULT_MEMORY_BYTES = 256 * 1024 ** 2
+
+def dataset_fingerprint(df):
+    """Inhalts-Hash eines DataFrames (Spaltennamen, Datentypen und Werte je Zeile)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for col in df.columns:
+        dtype = df[col].dtype
+        kind = str(dtype.categories.dtype) if isinstance(dtype, pd.CategoricalDtype) else str(dtype)
+        digest.update(json.dumps([str(col), kind]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _typed(value):
+    """
+    JSON-Form eines Werts mit seinem Typ, damit z. B. np.int64(5) und "5" verschiedene
+    Schlüssel ergeben. Dictionaries werden nach Schlüssel sortiert, Listen und Tupel
+    behalten ihre Reihenfolge.
+    """
+    if isinstance(value, dict):
+        items = sorted(([_typed(k), _typed(v)] for k, v in value.items()), key=json.dumps)
+        return ["dict", items]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_typed(item) for item in value]]
+    return [type(value).__name__, repr(value)]
+
+def result_key(kind, fingerprint, target_var, options):
+    """Cache-Schlüssel aus Art des Laufs, Fingerabdruck, Zielvariable und Optionen."""
+    payload = json.dumps(_typed([RESULT_VERSION, kind, fingerprint, target_var, options]))
+    return RESULT_PREFIX + hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+class ResultCache:
+    """
+    Zweistufiger Cache (Speicher, Festplatte) für gepickelte Ergebnisse.
+    max_memory_bytes: Größe des Speicher-Caches; cache_dir, max_disk_bytes: wie bei
+    dataset_cache; disk=False schaltet die Festplatte ab.
+    """
+    def __init__(self, max_memory_bytes=DEFAULT_MEMORY_BYTES, cache_dir=None, max_disk_bytes=None,
+                 disk=True):
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = (cache_dir or default_cache_dir()) if disk else None
+        self.max_disk_bytes = default_max_bytes() if max_disk_bytes is None else max_disk_bytes
+        self.memory_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+
+    def get(self, key):
+        """Ergebnis zu key oder None."""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return pickle.loads(data)
+        data = self._read_disk(key)
+        if data is None:
+            self.stats["misses"] += 1
+            return None
+        try:
+            value = pickle.loads(data)
+        except Exception:
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk_hits"] += 1
+        self._remember(key, data)
+        return value
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        self._write_disk(key, data)
+
+    def get_or_compute(self, key, compute):
+        """Ergebnis aus dem Cache oder compute() (wird danach abgelegt)."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear_memory(self):
+        self._memory.clear()
+        self.memory_bytes = 0
+
+    def _remember(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        self._memory[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, dropped = self._memory.popitem(last=False)
+            self.memory_bytes -= len(dropped)
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, RESULT_FILE), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # Zugriffszeit für die LRU-Verdrängung festhalten
+        now = time.time()
+        try:
+            os.utime(os.path.join(entry_dir, META_FILE), (now, now))
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key, data):
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry_dir = os.path.join(self.cache_dir, key)
+            tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+            try:
+                with open(os.path.join(tmp_dir, RESULT_FILE), "wb") as f:
+                    f.write(data)
+                with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+                    json.dump({"version": RESULT_VERSION, "bytes": len(data)}, f)
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            evict(self.cache_dir, self.max_disk_bytes)
+        except OSError:
+            pass
+
+_default_cache = None
+
+def default_result_cache():
+    """Gemeinsamer ResultCache des Prozesses (wird beim ersten Aufruf angelegt)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+def id3_walkthrough(data, attributes, target_var, verbosity=2, print_entropy=True,
+                    numeric_attributes=(), max_bins=None, bin_method="frequency",
+                    max_gain_loss=None, image_formats=(), render_options=None, cache=None):
+    """
+    Rechenschritte (id3_steps) und Baum, optional mit gerenderten Grafiken je Format in
+    image_formats (render_options: max_depth, min_samples, dpi wie bei render_tree).
+    Liefert {"steps": [Step, ...], "tree": Baum, "images": {Format: Bytes}}.
+    """
+    cache = cache or default_result_cache()
+    render_options = dict(render_options or {})
+    options = {"attributes": list(attributes), "verbosity": verbosity,
+               "print_entropy": print_entropy, "numeric_attributes": sorted(numeric_attributes),
+               "max_bins": max_bins, "bin_method": bin_method, "max_gain_loss": max_gain_loss,
+               "image_formats": sorted(image_formats), "render_options": render_options}
+    key = result_key("id3", dataset_fingerprint(data), target_var, options)
+
+    def compute():
+        steps = list(id3_steps(data, attributes, target_var, verbosity=verbosity,
+                               print_entropy=print_entropy, numeric_attributes=numeric_attributes,
+                               max_bins=max_bins, bin_method=bin_method,
+                               max_gain_loss=max_gain_loss))
+        tree = steps[-1].data["tree"]
+        images = {}
+        if image_formats:
+            # Graphviz wird nur für Grafiken benötigt
+            from ID3_render import render_tree
+            for fmt in image_formats:
+                images[fmt] = render_tree(tree, target_var, fmt=fmt, use_cache=False,
+                                          **render_options)
+        return {"steps": steps, "tree": tree, "images": images}
+
+    return cache.get_or_compute(key, compute)
+
+def naive_bayes_walkthrough(df, target_var, sample, laplace="auto", cache=None):
+    """
+    Häufigkeitstabelle (frequency_steps) und Rechenschritte (naive_bayes_steps) für ein
+    Sample. Liefert {"steps": [Step, ...], "results": [Daten der "result"-Schritte]}.
+    """
+    cache = cache or default_result_cache()
+    # Reihenfolge wie beim Sample, die Rechenschritte folgen ihr
+    options = {"sample": list(sample.items()), "laplace": laplace}
+    key = result_key("naive_bayes", dataset_fingerprint(df), target_var, options)
+
+    def compute():
+        # Zähltabellen einmal für beide Teile
+        model = fit_naive_bayes(df, target_var)
+        steps = list(frequency_steps(df, target_var, model=model))
+        steps += naive_bayes_steps(df, target_var, sample, laplace=laplace, model=model)
+        return {"steps": steps, "results": [step.data for step in steps if step.kind == "result"]}
+
+    return cache.get_or_compute(key, compute)